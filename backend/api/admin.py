@@ -0,0 +1,63 @@
+import asyncio
+
+from fastapi import APIRouter
+from starlette.concurrency import run_in_threadpool
+
+from backend.api.errors import ValidationError
+from backend.data.point_charts import ChartCatalog, open_chart_catalog, publish_chart_catalog
+from backend.data.resorts import (
+    ResortRegistry,
+    build_resort_registry,
+    publish_resort_registry,
+    read_resorts,
+)
+from backend.engine.eligibility import clear_eligibility_cache
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+# One reload at a time
+_reload_lock = asyncio.Lock()
+
+
+def _build_reference_data() -> tuple[ResortRegistry, ChartCatalog]:
+    """Read, index and compile resorts.json and every point chart (runs in a worker thread)."""
+    return build_resort_registry(read_resorts()), open_chart_catalog()
+
+
+@router.post("/charts/reload")
+async def reload_charts():
+    """
+    Re-read data/resorts.json and data/point_charts/*.json without a restart.
+
+    Parsing, compiling and coverage checks run in a worker thread. The new
+    resort registry and chart catalog are then swapped in together on the
+    event loop, between any request's awaits, and the caches derived from
+    them are cleared. So lookups made without awaiting in between all see
+    one snapshot. A running request finishes on the old snapshot only if it
+    captured the catalog once and passes it on (as the simulation does);
+    lookups after one of its awaits may see the new data. If resorts.json
+    can't be read, nothing changes.
+    """
+    async with _reload_lock:
+        try:
+            registry, catalog = await run_in_threadpool(_build_reference_data)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise ValidationError(
+                "Validation failed",
+                fields=[{"field": "resorts.json", "issue": f"Could not load resorts: {exc}"}],
+            ) from exc
+
+        publish_resort_registry(registry)
+        publish_chart_catalog(catalog)
+        clear_eligibility_cache()
+
+    return {
+        "version": catalog.version,
+        "resorts": len(registry.slugs),
+        "charts": list(catalog.entries),
+        "problems": {
+            f"{resort}_{year}": list(problems)
+            for (resort, year), problems in catalog.problems.items()
+        },
+        "skipped": dict(catalog.skipped),
+    }
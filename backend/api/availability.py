@@ -1,18 +1,21 @@
-from datetime import date
+from datetime import date, timedelta
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.api.errors import ValidationError
+from backend.api.responses import FastJSONResponse
 from backend.db.database import get_db
-from backend.engine.availability import get_all_contracts_availability
-from backend.models.contract import Contract
-from backend.models.point_balance import PointBalance
-from backend.models.reservation import Reservation
+from backend.db.portfolio import load_portfolio
+from backend.engine.availability import (
+    get_all_contracts_availability,
+    get_availability_for_dates,
+)
 
 router = APIRouter(tags=["availability"])
 
+MAX_BATCH_DATES = 366
+
 
 @router.get("/api/availability")
 async def get_availability(
@@ -45,54 +48,83 @@ async def get_availability(
             ],
         )
 
-    # Load all contracts
-    result = await db.execute(select(Contract))
-    contracts = result.scalars().all()
-
-    # Load all point balances
-    result = await db.execute(select(PointBalance))
-    all_balances = result.scalars().all()
-
-    # Load all non-cancelled reservations
-    result = await db.execute(select(Reservation).where(Reservation.status != "cancelled"))
-    all_reservations = result.scalars().all()
-
-    # Convert ORM objects to dicts for the pure-function engine
-    contracts_data = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "home_resort": c.home_resort,
-            "use_year_month": c.use_year_month,
-            "annual_points": c.annual_points,
-            "purchase_type": c.purchase_type,
-        }
-        for c in contracts
-    ]
-
-    balances_data = [
-        {
-            "contract_id": b.contract_id,
-            "use_year": b.use_year,
-            "allocation_type": b.allocation_type,
-            "points": b.points,
-        }
-        for b in all_balances
-    ]
-
-    reservations_data = [
-        {
-            "contract_id": r.contract_id,
-            "check_in": r.check_in,
-            "points_cost": r.points_cost,
-            "status": r.status,
-        }
-        for r in all_reservations
-    ]
-
-    return get_all_contracts_availability(
-        contracts=contracts_data,
-        point_balances=balances_data,
-        reservations=reservations_data,
-        target_date=target_date,
+    portfolio = await load_portfolio(db)
+
+    return FastJSONResponse(
+        get_all_contracts_availability(
+            contracts=portfolio["contracts"],
+            point_balances=portfolio["balances"],
+            reservations=portfolio["reservations"],
+            target_date=target_date,
+        )
+    )
+
+
+@router.get("/api/availability/batch")
+async def get_availability_batch(
+    dates: list[date] | None = Query(None, description="Target dates (YYYY-MM-DD), repeatable"),
+    start: date | None = Query(None, description="First date of a range (YYYY-MM-DD)"),
+    end: date | None = Query(None, description="Last date of a range, inclusive (YYYY-MM-DD)"),
+    step_days: int = Query(1, ge=1, le=366, description="Days between dates in a range"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Calculate point availability across all contracts for many target dates.
+
+    Accepts either an explicit list of `dates` or a `start`/`end` range with
+    `step_days`. Data is loaded once and every date is evaluated in a single
+    pass, so a year-long chart costs one request.
+    """
+    if dates and (start is not None or end is not None):
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "dates", "issue": "Provide either dates or start/end, not both"}],
+        )
+
+    if dates:
+        target_dates = dates
+    elif start is not None and end is not None:
+        if end < start:
+            raise ValidationError(
+                "Validation failed",
+                fields=[{"field": "end", "issue": "end must be on or after start"}],
+            )
+        num_dates = (end - start).days // step_days + 1
+        if num_dates > MAX_BATCH_DATES:
+            raise ValidationError(
+                "Validation failed",
+                fields=[
+                    {
+                        "field": "end",
+                        "issue": f"Range produces {num_dates} dates; maximum is {MAX_BATCH_DATES}",
+                    }
+                ],
+            )
+        target_dates = [start + timedelta(days=i * step_days) for i in range(num_dates)]
+    else:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "dates", "issue": "Provide dates or both start and end"}],
+        )
+
+    if len(target_dates) > MAX_BATCH_DATES:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "dates", "issue": f"Maximum {MAX_BATCH_DATES} dates per request"}],
+        )
+    if any(d.year < 2020 or d.year > 2040 for d in target_dates):
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "dates", "issue": "Year must be between 2020 and 2040"}],
+        )
+
+    portfolio = await load_portfolio(db)
+
+    return FastJSONResponse(
+        get_availability_for_dates(
+            contracts=portfolio["contracts"],
+            point_balances=portfolio["balances"],
+            reservations=portfolio["reservations"],
+            target_dates=target_dates,
+        )
     )
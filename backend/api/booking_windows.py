@@ -1,14 +1,18 @@
-from datetime import date
+from datetime import date, timedelta
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.data.resorts import get_resort_by_slug
+from backend.api.errors import ValidationError
+from backend.api.responses import FastJSONResponse
+from backend.data.resorts import get_resort_by_slug, get_resorts_by_slug
 from backend.db.database import get_db
-from backend.engine.booking_windows import compute_booking_windows
-from backend.models.contract import Contract
-from backend.models.reservation import Reservation
+from backend.db.portfolio import load_portfolio
+from backend.engine.booking_windows import (
+    build_booking_window_calendar,
+    compute_booking_windows,
+    find_stays_opening_on,
+)
 
 router = APIRouter(tags=["booking-windows"])
 
@@ -27,29 +31,21 @@ async def get_upcoming_booking_windows(
     """
     today = date.today()
 
-    # Load all contracts
-    result = await db.execute(select(Contract))
-    contracts = result.scalars().all()
-    contracts_by_id = {c.id: c for c in contracts}
+    portfolio = await load_portfolio(db)
+    contracts_by_id = {c["id"]: c for c in portfolio["contracts"]}
 
-    # Load all non-cancelled reservations with future check-in
-    result = await db.execute(
-        select(Reservation).where(
-            Reservation.status != "cancelled",
-            Reservation.check_in >= today,
-        )
-    )
-    reservations = result.scalars().all()
+    # Only reservations with a future check-in have windows still to open
+    reservations = [r for r in portfolio["reservations"] if r["check_in"] >= today]
 
     alerts = []
 
     for res in reservations:
-        contract = contracts_by_id.get(res.contract_id)
+        contract = contracts_by_id.get(res["contract_id"])
         if contract is None:
             continue
 
-        is_home_resort = contract.home_resort == res.resort
-        window_data = compute_booking_windows(res.check_in, is_home_resort)
+        is_home_resort = contract["home_resort"] == res["resort"]
+        window_data = compute_booking_windows(res["check_in"], is_home_resort)
 
         # Home resort window (11-month): include if not yet open, within look-ahead, and is home resort
         if (
@@ -57,14 +53,14 @@ async def get_upcoming_booking_windows(
             and not window_data["home_resort_window_open"]
             and 0 < window_data["days_until_home_window"] <= days
         ):
-            resort_info = get_resort_by_slug(res.resort)
-            resort_name = resort_info["name"] if resort_info else res.resort
+            resort_info = get_resort_by_slug(res["resort"])
+            resort_name = resort_info["name"] if resort_info else res["resort"]
             alerts.append(
                 {
-                    "contract_name": contract.name or f"Contract #{contract.id}",
-                    "resort": res.resort,
+                    "contract_name": contract["name"] or f"Contract #{contract['id']}",
+                    "resort": res["resort"],
                     "resort_name": resort_name,
-                    "check_in": res.check_in.isoformat(),
+                    "check_in": res["check_in"].isoformat(),
                     "window_type": "home_resort",
                     "window_date": window_data["home_resort_window"],
                     "days_until_open": window_data["days_until_home_window"],
@@ -76,14 +72,14 @@ async def get_upcoming_booking_windows(
             not window_data["any_resort_window_open"]
             and 0 < window_data["days_until_any_window"] <= days
         ):
-            resort_info = get_resort_by_slug(res.resort)
-            resort_name = resort_info["name"] if resort_info else res.resort
+            resort_info = get_resort_by_slug(res["resort"])
+            resort_name = resort_info["name"] if resort_info else res["resort"]
             alerts.append(
                 {
-                    "contract_name": contract.name or f"Contract #{contract.id}",
-                    "resort": res.resort,
+                    "contract_name": contract["name"] or f"Contract #{contract['id']}",
+                    "resort": res["resort"],
                     "resort_name": resort_name,
-                    "check_in": res.check_in.isoformat(),
+                    "check_in": res["check_in"].isoformat(),
                     "window_type": "any_resort",
                     "window_date": window_data["any_resort_window"],
                     "days_until_open": window_data["days_until_any_window"],
@@ -94,4 +90,78 @@ async def get_upcoming_booking_windows(
     alerts.sort(key=lambda a: a["days_until_open"])
 
     # Cap at 5
-    return alerts[:5]
+    return FastJSONResponse(alerts[:5])
+
+
+@router.get("/api/booking-windows/calendar")
+async def get_booking_window_calendar(
+    start: date | None = Query(None, description="First window date (YYYY-MM-DD), default today"),
+    days: int = Query(365, ge=1, le=731, description="Horizon length in days"),
+    offset: int = Query(0, ge=0, description="Windows to skip"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of windows"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Return every booking window opening for existing reservations over a horizon.
+
+    Lists the 11-month (home resort) and 7-month (any resort) windows that
+    open between `start` and `start + days - 1`, sorted by window date, one
+    page at a time.
+    """
+    today = date.today()
+    start = start or today
+    if start.year < 2020 or start.year > 2040:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "start", "issue": "Year must be between 2020 and 2040"}],
+        )
+    end = start + timedelta(days=days - 1)
+
+    portfolio = await load_portfolio(db)
+
+    windows = build_booking_window_calendar(
+        contracts=portfolio["contracts"],
+        reservations=portfolio["reservations"],
+        resorts_by_slug=get_resorts_by_slug(),
+        start=start,
+        end=end,
+        today=today,
+    )
+
+    return FastJSONResponse(
+        {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "total": len(windows),
+            "offset": offset,
+            "limit": limit,
+            "windows": windows[offset : offset + limit],
+        }
+    )
+
+
+@router.get("/api/booking-windows/opening")
+async def get_stays_opening(
+    open_date: date | None = Query(
+        None, alias="date", description="Window open date (YYYY-MM-DD), default today"
+    ),
+    nights: int = Query(1, ge=1, le=14, description="Length of stay in nights"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Return the stays whose booking windows open on a date.
+
+    Lists the check-in dates whose 11-month (home resort) or 7-month (any
+    resort) window opens that day and prices a `nights`-night stay from each
+    at every resort the contracts can book in that window.
+    """
+    open_date = open_date or date.today()
+    if open_date.year < 2020 or open_date.year > 2040:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "date", "issue": "Year must be between 2020 and 2040"}],
+        )
+
+    portfolio = await load_portfolio(db)
+
+    return FastJSONResponse(find_stays_opening_on(portfolio["contracts"], open_date, nights))
@@ -1,75 +1,115 @@
+from datetime import date
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from backend.api.errors import NotFoundError
+from backend.api.responses import FastJSONResponse
 from backend.api.schemas import (
     ContractCreate,
     ContractResponse,
     ContractUpdate,
     ContractWithDetails,
-    PointBalanceResponse,
 )
 from backend.db.database import get_db
+from backend.db.portfolio import invalidate_portfolio
 from backend.engine.eligibility import get_eligible_resorts
 from backend.engine.use_year import (
     build_use_year_timeline,
     get_current_use_year,
 )
 from backend.models.contract import Contract
+from backend.models.point_balance import PointBalance
 
 router = APIRouter(prefix="/api/contracts", tags=["contracts"])
 
 
-def _build_timeline_summary(use_year_month: int) -> dict:
-    """Build a use year timeline summary for the current use year."""
-    current_uy = get_current_use_year(use_year_month)
-    return build_use_year_timeline(use_year_month, current_uy)
-
-
-def _enrich_contract(contract: Contract) -> dict:
-    """Convert a Contract ORM object to a ContractWithDetails dict."""
-    eligible = get_eligible_resorts(contract.home_resort, contract.purchase_type)
-    timeline = _build_timeline_summary(contract.use_year_month)
-
-    balances = [PointBalanceResponse.model_validate(pb) for pb in (contract.point_balances or [])]
-
-    return ContractWithDetails(
-        id=contract.id,
-        name=contract.name,
-        home_resort=contract.home_resort,
-        use_year_month=contract.use_year_month,
-        annual_points=contract.annual_points,
-        purchase_type=contract.purchase_type,
-        created_at=contract.created_at,
-        updated_at=contract.updated_at,
-        point_balances=balances,
-        eligible_resorts=eligible,
-        use_year_timeline=timeline,
-    ).model_dump()
+@lru_cache(maxsize=64)
+def _timeline_for_day(use_year_month: int, today: date) -> dict:
+    """Current use year timeline, shared by every contract with this use year month today."""
+    current_uy = get_current_use_year(use_year_month, as_of=today)
+    return build_use_year_timeline(use_year_month, current_uy, as_of=today)
+
+
+async def _contracts_with_details(db: AsyncSession, contract_id: int | None = None) -> list[dict]:
+    """
+    Contracts as ContractWithDetails-shaped, JSON-ready dicts.
+
+    One query joins contracts to their point balances; rows are grouped here.
+    Eligible resorts are memoized per (home resort, purchase type) and the
+    timeline per (use year month, day), so the work per contract is flat.
+    """
+    query = (
+        select(
+            Contract.id,
+            Contract.name,
+            Contract.home_resort,
+            Contract.use_year_month,
+            Contract.annual_points,
+            Contract.purchase_type,
+            Contract.created_at,
+            Contract.updated_at,
+            PointBalance.id.label("balance_id"),
+            PointBalance.use_year,
+            PointBalance.allocation_type,
+            PointBalance.points,
+            PointBalance.updated_at.label("balance_updated_at"),
+        )
+        .outerjoin(PointBalance, PointBalance.contract_id == Contract.id)
+        .order_by(Contract.id, PointBalance.id)
+    )
+    if contract_id is not None:
+        query = query.where(Contract.id == contract_id)
+
+    today = date.today()
+    contracts: dict[int, dict] = {}
+    for row in await db.execute(query):
+        contract = contracts.get(row.id)
+        if contract is None:
+            contract = contracts[row.id] = {
+                "id": row.id,
+                "name": row.name,
+                "home_resort": row.home_resort,
+                "use_year_month": row.use_year_month,
+                "annual_points": row.annual_points,
+                "purchase_type": row.purchase_type,
+                "created_at": row.created_at.isoformat(),
+                "updated_at": row.updated_at.isoformat(),
+                "point_balances": [],
+                "eligible_resorts": get_eligible_resorts(row.home_resort, row.purchase_type),
+                "use_year_timeline": _timeline_for_day(row.use_year_month, today),
+            }
+        if row.balance_id is not None:
+            contract["point_balances"].append(
+                {
+                    "id": row.balance_id,
+                    "contract_id": row.id,
+                    "use_year": row.use_year,
+                    "allocation_type": row.allocation_type,
+                    "points": row.points,
+                    "updated_at": row.balance_updated_at.isoformat(),
+                }
+            )
+    return list(contracts.values())
 
 
 @router.get("/", response_model=list[ContractWithDetails])
 async def list_contracts(db: AsyncSession = Depends(get_db)):
     """List all contracts with point balances, eligible resorts, and timeline."""
-    result = await db.execute(select(Contract).options(selectinload(Contract.point_balances)))
-    contracts = result.scalars().all()
-    return [_enrich_contract(c) for c in contracts]
+    # Already JSON-ready; returning the response directly skips re-validation
+    return FastJSONResponse(await _contracts_with_details(db))
 
 
 @router.get("/{contract_id}", response_model=ContractWithDetails)
 async def get_contract(contract_id: int, db: AsyncSession = Depends(get_db)):
     """Get a single contract with full details."""
-    result = await db.execute(
-        select(Contract)
-        .options(selectinload(Contract.point_balances))
-        .where(Contract.id == contract_id)
-    )
-    contract = result.scalar_one_or_none()
-    if not contract:
+    contracts = await _contracts_with_details(db, contract_id)
+    if not contracts:
         raise NotFoundError("Contract not found")
-    return _enrich_contract(contract)
+    return FastJSONResponse(contracts[0])
 
 
 @router.post("/", response_model=ContractResponse, status_code=status.HTTP_201_CREATED)
@@ -84,6 +124,7 @@ async def create_contract(data: ContractCreate, db: AsyncSession = Depends(get_d
     )
     db.add(contract)
     await db.commit()
+    invalidate_portfolio()
     await db.refresh(contract)
     return contract
 
@@ -103,6 +144,7 @@ async def update_contract(
         setattr(contract, field, value)
 
     await db.commit()
+    invalidate_portfolio()
     await db.refresh(contract)
     return contract
 
@@ -121,3 +163,4 @@ async def delete_contract(contract_id: int, db: AsyncSession = Depends(get_db)):
 
     await db.delete(contract)
     await db.commit()
+    invalidate_portfolio()
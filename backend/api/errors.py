@@ -3,7 +3,7 @@
 All API errors return a consistent JSON structure:
     {"error": {"type": "...", "message": "...", "fields": [...]}}
 
-Error types: VALIDATION_ERROR, NOT_FOUND, CONFLICT, SERVER_ERROR
+Error types: VALIDATION_ERROR, NOT_FOUND, CONFLICT, SERVICE_UNAVAILABLE, SERVER_ERROR
 """
 
 import logging
@@ -73,6 +73,13 @@ class ConflictError(AppError):
     error_type = "CONFLICT"
 
 
+class ServiceUnavailableError(AppError):
+    """503 -- a backing service failed; the request may succeed if retried."""
+
+    status_code = 503
+    error_type = "SERVICE_UNAVAILABLE"
+
+
 class ServerError(AppError):
     """500 -- internal server error.
 
@@ -0,0 +1,206 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterable
+from datetime import date, datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.errors import ValidationError
+from backend.db.database import get_db
+from backend.db.portfolio import load_portfolio
+from backend.engine.availability import iter_availability_for_dates
+from backend.models.point_balance import PointAllocationType, PointBalance
+from backend.models.reservation import Reservation
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows fetched from the cursor and encoded per response chunk
+EXPORT_BATCH_SIZE = 500
+
+RESERVATION_COLUMNS = (
+    Reservation.id,
+    Reservation.contract_id,
+    Reservation.resort,
+    Reservation.room_key,
+    Reservation.check_in,
+    Reservation.check_out,
+    Reservation.points_cost,
+    Reservation.status,
+    Reservation.confirmation_number,
+    Reservation.notes,
+    Reservation.created_at,
+    Reservation.updated_at,
+)
+BALANCE_COLUMNS = (
+    PointBalance.id,
+    PointBalance.contract_id,
+    PointBalance.use_year,
+    PointBalance.allocation_type,
+    PointBalance.points,
+    PointBalance.updated_at,
+)
+ALLOCATION_TYPES = tuple(t.value for t in PointAllocationType)
+AVAILABILITY_FIELDS = (
+    "date",
+    "contract_id",
+    "contract_name",
+    "use_year",
+    "use_year_status",
+    *ALLOCATION_TYPES,
+    "total_points",
+    "committed_points",
+    "available_points",
+)
+
+# The session from get_db stays open until the response body has been sent
+# (request-scoped dependency), which the streamed cursors rely on.
+_db = Depends(get_db, scope="request")
+
+
+def _encode(rows: list[dict], fmt: str) -> str:
+    """One response chunk: NDJSON lines or CSV rows (dates in ISO format)."""
+    rows = [
+        {k: v.isoformat() if isinstance(v, date | datetime) else v for k, v in row.items()}
+        for row in rows
+    ]
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows)
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerows(row.values() for row in rows)
+    return out.getvalue()
+
+
+def _csv_header(fields: Iterable[str]) -> str:
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(fields)
+    return out.getvalue()
+
+
+async def _stream_query(db: AsyncSession, query: Select, fmt: str) -> AsyncIterator[str]:
+    """Run query on a server-side cursor and encode it a batch of rows at a time."""
+    if fmt == "csv":
+        yield _csv_header(column.name for column in query.selected_columns)
+    result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield _encode([row._asdict() for row in partition], fmt)
+
+
+def _export_response(body: AsyncIterator[str], name: str, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/reservations")
+async def export_reservations(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    contract_id: int | None = Query(None),
+    status_filter: str | None = Query(None, alias="status"),
+    db: AsyncSession = _db,
+):
+    """
+    Stream every reservation (including cancelled) as NDJSON or CSV.
+
+    Rows are read from a server-side cursor in batches, ordered by check-in,
+    so memory use doesn't grow with the number of reservations.
+    """
+    query = select(*RESERVATION_COLUMNS)
+    if contract_id is not None:
+        query = query.where(Reservation.contract_id == contract_id)
+    if status_filter is not None:
+        query = query.where(Reservation.status == status_filter)
+    query = query.order_by(Reservation.check_in, Reservation.id)
+    return _export_response(_stream_query(db, query, fmt), "reservations", fmt)
+
+
+@router.get("/points")
+async def export_point_balances(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    contract_id: int | None = Query(None),
+    db: AsyncSession = _db,
+):
+    """Stream every point balance row as NDJSON or CSV, by contract and use year."""
+    query = select(*BALANCE_COLUMNS)
+    if contract_id is not None:
+        query = query.where(PointBalance.contract_id == contract_id)
+    query = query.order_by(
+        PointBalance.contract_id, PointBalance.use_year, PointBalance.allocation_type
+    )
+    return _export_response(_stream_query(db, query, fmt), "points", fmt)
+
+
+@router.get("/availability")
+async def export_availability(
+    start: date = Query(..., description="First date (YYYY-MM-DD)"),
+    end: date = Query(..., description="Last date, inclusive (YYYY-MM-DD)"),
+    step_days: int = Query(1, ge=1, le=366, description="Days between dates"),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = _db,
+):
+    """
+    Stream availability for every contract on every date of a range.
+
+    One row per (date, contract) with the active use year, its balances by
+    allocation type, committed and available points. Dates are evaluated one
+    at a time as the response is written, so there is no limit on the range
+    beyond the supported years.
+    """
+    if end < start:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "end", "issue": "end must be on or after start"}],
+        )
+    if start.year < 2020 or end.year > 2040:
+        raise ValidationError(
+            "Validation failed",
+            fields=[
+                {
+                    "field": "start" if start.year < 2020 else "end",
+                    "issue": "Year must be between 2020 and 2040",
+                }
+            ],
+        )
+
+    portfolio = await load_portfolio(db)
+    num_dates = (end - start).days // step_days + 1
+    results = iter_availability_for_dates(
+        contracts=portfolio["contracts"],
+        point_balances=portfolio["balances"],
+        reservations=portfolio["reservations"],
+        target_dates=(start + timedelta(days=i * step_days) for i in range(num_dates)),
+    )
+
+    async def body() -> AsyncIterator[str]:
+        if fmt == "csv":
+            yield _csv_header(AVAILABILITY_FIELDS)
+        batch = []
+        for result in results:
+            for c in result["contracts"]:
+                batch.append(
+                    {
+                        "date": result["target_date"],
+                        "contract_id": c["contract_id"],
+                        "contract_name": c["contract_name"],
+                        "use_year": c["use_year"],
+                        "use_year_status": c["use_year_status"],
+                        **{t: c["balances"].get(t, 0) for t in ALLOCATION_TYPES},
+                        "total_points": c["total_points"],
+                        "committed_points": c["committed_points"],
+                        "available_points": c["available_points"],
+                    }
+                )
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                yield _encode(batch, fmt)
+                batch = []
+        if batch:
+            yield _encode(batch, fmt)
+
+    return _export_response(body(), "availability", fmt)
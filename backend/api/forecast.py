@@ -0,0 +1,122 @@
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.api.errors import ServiceUnavailableError, ValidationError
+from backend.api.points import get_borrowing_limit_pct
+from backend.api.responses import FastJSONResponse
+from backend.api.schemas import TripSimulationRequest
+from backend.config import get_settings
+from backend.data.point_charts import get_chart_catalog
+from backend.data.resorts import get_resort_by_slug
+from backend.db.database import get_db
+from backend.db.portfolio import load_portfolio
+from backend.engine.forecast import forecast_points
+from backend.engine.simulation import load_simulation_charts, simulate_trip_plans, trip_resorts
+
+router = APIRouter(tags=["forecast"])
+
+
+@router.get("/api/forecast")
+async def get_forecast(
+    years: int = Query(5, ge=1, le=10, description="Number of use years to forecast"),
+    as_of: date | None = Query(None, description="Start date (YYYY-MM-DD), default today"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Forecast where each contract's points go over the next N use years.
+
+    Simulates annual allocation, reservations, banking at each banking deadline,
+    borrowing within the borrowing limit and expiration, and returns
+    month-by-month balances and flows per contract plus a summary.
+    """
+    as_of = as_of or date.today()
+    if as_of.year < 2020 or as_of.year > 2040:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "as_of", "issue": "Year must be between 2020 and 2040"}],
+        )
+
+    portfolio = await load_portfolio(db)
+
+    return FastJSONResponse(
+        forecast_points(
+            contracts=portfolio["contracts"],
+            point_balances=portfolio["balances"],
+            reservations=portfolio["reservations"],
+            as_of=as_of,
+            years=years,
+            borrowing_limit_pct=await get_borrowing_limit_pct(db),
+        )
+    )
+
+
+@router.post("/api/forecast/simulate")
+async def simulate_forecast(data: TripSimulationRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Monte Carlo simulation of a recurring trip pattern.
+
+    Draws `samples` random plans (check-in day, resort) of the trips over the
+    horizon, prices them from the point charts, assigns them to eligible
+    contracts and forecasts each plan. Returns the distribution of expired and
+    shortfall points per contract and for the whole portfolio.
+    """
+    as_of = data.as_of or date.today()
+    if as_of.year < 2020 or as_of.year > 2040:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "as_of", "issue": "Year must be between 2020 and 2040"}],
+        )
+
+    portfolio = await load_portfolio(db)
+    contract_ids = {c["id"] for c in portfolio["contracts"]}
+    catalog = get_chart_catalog()
+    charts = load_simulation_charts(catalog)
+
+    trips = [trip.model_dump() for trip in data.trips]
+    errors = []
+    for idx, trip in enumerate(trips):
+        prefix = f"trips[{idx}]."
+        if trip["contract_id"] is not None and trip["contract_id"] not in contract_ids:
+            errors.append(
+                {
+                    "field": f"{prefix}contract_id",
+                    "issue": f"Contract {trip['contract_id']} not found",
+                }
+            )
+        unknown = [slug for slug in trip["resorts"] or [] if get_resort_by_slug(slug) is None]
+        if unknown:
+            errors.append({"field": f"{prefix}resorts", "issue": f"Unknown resorts: {unknown}"})
+        elif not trip_resorts(trip, charts):
+            errors.append(
+                {
+                    "field": f"{prefix}room_key",
+                    "issue": f"No point chart lists room '{trip['room_key']}' at these resorts",
+                }
+            )
+    if errors:
+        raise ValidationError("Validation failed", fields=errors)
+
+    borrowing_limit_pct = await get_borrowing_limit_pct(db)
+    # CPU-bound; keep the event loop free while the pool works
+    try:
+        result = await run_in_threadpool(
+            simulate_trip_plans,
+            contracts=portfolio["contracts"],
+            point_balances=portfolio["balances"],
+            reservations=portfolio["reservations"],
+            trips=trips,
+            as_of=as_of,
+            years=data.years,
+            samples=data.samples,
+            seed=data.seed,
+            borrowing_limit_pct=borrowing_limit_pct,
+            workers=get_settings().simulation_workers or None,
+            catalog=catalog,
+        )
+    except BrokenProcessPool as err:
+        raise ServiceUnavailableError("Simulation workers are unavailable; try again") from err
+    return FastJSONResponse(result)
@@ -1,12 +1,14 @@
 import logging
 
 from fastapi import APIRouter, Depends, status
-from sqlalchemy import and_, select
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.api.errors import ConflictError, NotFoundError, ValidationError
 from backend.api.schemas import PointBalanceCreate, PointBalanceResponse, PointBalanceUpdate
 from backend.db.database import get_db
+from backend.db.portfolio import invalidate_portfolio
 from backend.engine.use_year import build_use_year_timeline, get_current_use_year
 from backend.models.app_setting import AppSetting
 from backend.models.contract import Contract
@@ -84,24 +86,6 @@ async def create_point_balance(
     if not contract:
         raise NotFoundError("Contract not found")
 
-    # Check for duplicate (same contract + use_year + allocation_type)
-    result = await db.execute(
-        select(PointBalance).where(
-            and_(
-                PointBalance.contract_id == contract_id,
-                PointBalance.use_year == data.use_year,
-                PointBalance.allocation_type == data.allocation_type,
-            )
-        )
-    )
-    existing = result.scalar_one_or_none()
-    if existing:
-        raise ConflictError(
-            f"Point balance already exists for contract {contract_id}, "
-            f"use year {data.use_year}, type '{data.allocation_type}'. "
-            "Use PUT to update it."
-        )
-
     # Validate: banked points cannot exceed annual_points
     if data.allocation_type == "banked" and data.points > contract.annual_points:
         raise ValidationError(
@@ -139,7 +123,17 @@ async def create_point_balance(
         points=data.points,
     )
     db.add(balance)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        # Unique index on (contract_id, use_year, allocation_type)
+        await db.rollback()
+        raise ConflictError(
+            f"Point balance already exists for contract {contract_id}, "
+            f"use year {data.use_year}, type '{data.allocation_type}'. "
+            "Use PUT to update it."
+        ) from exc
+    invalidate_portfolio()
     await db.refresh(balance)
     return balance
 
@@ -179,6 +173,7 @@ async def update_point_balance(
 
     balance.points = data.points
     await db.commit()
+    invalidate_portfolio()
     await db.refresh(balance)
     return balance
 
@@ -193,6 +188,7 @@ async def delete_point_balance(balance_id: int, db: AsyncSession = Depends(get_d
 
     await db.delete(balance)
     await db.commit()
+    invalidate_portfolio()
 
 
 @router.get("/api/contracts/{contract_id}/timeline")
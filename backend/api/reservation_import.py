@@ -0,0 +1,298 @@
+"""Bulk reservation import from CSV or NDJSON.
+
+The file is read one line at a time, so it never has to fit in memory; CSV
+lines go through csv.reader (in a worker thread), so quoted values may hold
+newlines and stray quotes.
+Contracts are loaded once. Rows are validated in chunks with the same rules
+as POST /api/contracts/{id}/reservations (ReservationCreate plus resort
+eligibility), and each chunk's valid rows are inserted with a single
+executemany INSERT and committed. A bad row is reported with its line number
+and skipped; it never aborts the rest of the file. Only the first MAX_ERRORS
+problems are listed; the rest are counted.
+
+CSV files need a header row naming the columns. NDJSON files hold one JSON
+object per line. Either way a row has contract_id plus the reservation
+fields; points_cost may be left out when pricing from the point charts.
+"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+
+from anyio import from_thread
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.api.schemas import ReservationCreate
+from backend.data.point_charts import calculate_stay_total
+from backend.db.reservations import insert_reservations
+from backend.engine.eligibility import get_eligible_resort_set
+from backend.models.contract import Contract
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Rows validated and inserted per transaction
+CHUNK_SIZE = 500
+
+# CSV lines fetched from the event loop per trip by the parsing thread
+_LINE_BATCH = 256
+
+# Errors kept in the report; the rest are only counted
+MAX_ERRORS = 100
+
+REQUIRED_COLUMNS = ("contract_id", "resort", "room_key", "check_in", "check_out")
+_FIELDS = tuple(ReservationCreate.model_fields)
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a stream of UTF-8 byte chunks into lines, without line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def _next_lines(lines: AsyncIterator[str], count: int) -> list[str]:
+    """Up to count more lines, each with its newline back for csv.reader."""
+    batch = []
+    async for line in lines:
+        batch.append(line + "\n")
+        if len(batch) >= count:
+            break
+    return batch
+
+
+async def _iter_csv_records(
+    lines: AsyncIterable[str],
+) -> AsyncIterator[tuple[int, list[str] | None, str | None]]:
+    """
+    Run csv.reader over lines in a worker thread, a chunk of records at a time.
+
+    The reader pulls lines from the event loop as it needs them, so a quoted
+    value may span lines without reading the file ahead. Yields (first line
+    number, values, None) per record, or (line number, None, issue).
+    """
+    source = aiter(lines)
+
+    def pull() -> Iterator[str]:
+        while batch := from_thread.run(_next_lines, source, _LINE_BATCH):
+            yield from batch
+
+    reader = csv.reader(pull(), strict=True)
+
+    def read_chunk() -> list[tuple[int, list[str] | None, str | None]]:
+        records = []
+        while len(records) < CHUNK_SIZE:
+            start = reader.line_num + 1
+            try:
+                values = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as exc:
+                records.append((start, None, f"Invalid CSV: {exc}"))
+                continue
+            records.append((start, values, None))
+        return records
+
+    while records := await run_in_threadpool(read_chunk):
+        for record in records:
+            yield record
+
+
+async def iter_import_rows(
+    lines: AsyncIterable[str], fmt: str
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """
+    Parse lines of a CSV or NDJSON file into rows.
+
+    Yields (line number, row, None) per record, or (line number, None, issue)
+    for a record that can't be parsed. Blank lines are skipped. A CSV record
+    may span lines inside quotes; it is numbered by its first line. Empty CSV
+    values are left out of the row.
+
+    Raises:
+        ValueError: the CSV header is missing or lacks a required column
+    """
+    if fmt == "ndjson":
+        number = 0
+        async for line in lines:
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield number, None, f"Invalid JSON: {exc}"
+                continue
+            if isinstance(row, dict):
+                yield number, row, None
+            else:
+                yield number, None, "Expected a JSON object"
+        return
+
+    header = None
+    async for number, values, issue in _iter_csv_records(lines):
+        if values is not None and not "".join(values).strip():
+            continue
+        if header is None:
+            if issue is not None:
+                raise ValueError(f"Invalid CSV header: {issue}")
+            header = [name.strip() for name in values]
+            missing = [name for name in REQUIRED_COLUMNS if name not in header]
+            if missing:
+                raise ValueError(f"CSV header is missing columns: {missing}")
+            continue
+        if issue is not None:
+            yield number, None, issue
+        elif len(values) != len(header):
+            yield number, None, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield number, {k: v for k, v in zip(header, values, strict=True) if v != ""}, None
+    if header is None:
+        raise ValueError("CSV file has no header row")
+
+
+def _validate_row(
+    row: dict, contracts: dict[int, tuple[str, str]], price: bool
+) -> tuple[dict | None, list[dict[str, str]]]:
+    """Check one row. Returns (values to insert, []) or (None, field issues)."""
+    errors = []
+    try:
+        contract_id = int(row.get("contract_id"))
+    except (TypeError, ValueError):
+        contract_id = None
+    if contract_id not in contracts:
+        errors.append(
+            {"field": "contract_id", "issue": f"Contract {row.get('contract_id')} not found"}
+        )
+
+    fields = {key: row[key] for key in _FIELDS if row.get(key) is not None}
+    priced = price and "points_cost" not in fields
+    if priced:
+        # Placeholder so the remaining fields validate; replaced by the chart price
+        fields["points_cost"] = 1
+    try:
+        data = ReservationCreate.model_validate(fields)
+    except PydanticValidationError as exc:
+        for err in exc.errors():
+            loc = err.get("loc", ())
+            errors.append(
+                {
+                    "field": str(loc[-1]) if loc else "unknown",
+                    "issue": err.get("msg", "Invalid value"),
+                }
+            )
+        return None, errors
+    if errors:
+        return None, errors
+
+    home_resort, purchase_type = contracts[contract_id]
+    if data.resort not in get_eligible_resort_set(home_resort, purchase_type):
+        return None, [
+            {
+                "field": "resort",
+                "issue": f"Resort '{data.resort}' is not eligible for this {purchase_type} contract at {home_resort}",
+            }
+        ]
+
+    values = {"contract_id": contract_id, **data.model_dump()}
+    if priced:
+        total = calculate_stay_total(data.resort, data.room_key, data.check_in, data.check_out)
+        if total is None:
+            return None, [{"field": "points_cost", "issue": "No point chart price for this stay"}]
+        values["points_cost"] = total
+    return values, []
+
+
+async def import_reservations(
+    db: AsyncSession,
+    rows: AsyncIterable[tuple[int, dict | None, str | None]],
+    price: bool = False,
+    dry_run: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    max_errors: int = MAX_ERRORS,
+) -> dict:
+    """
+    Validate and insert reservation rows from iter_import_rows().
+
+    Args:
+        db: session; each chunk of valid rows is committed on it
+        rows: (line number, row, parse issue) tuples
+        price: price rows without a points_cost from the point charts
+        dry_run: validate only, insert nothing
+        chunk_size: rows per validation chunk and transaction
+        max_errors: problems listed in the report; the rest are only counted
+
+    Returns:
+        Dict with rows (records read), imported (rows inserted, or that would
+        be on a dry run), priced (points_cost taken from the charts), dry_run,
+        errors: one {line, field, issue} per problem, in file order, for the
+        first max_errors problems, error_count (all problems) and truncated
+        (whether errors left any out).
+
+    Raises:
+        ValueError: from iter_import_rows() when the CSV header is missing or
+            incomplete (nothing has been inserted then)
+    """
+    result = await db.execute(select(Contract.id, Contract.home_resort, Contract.purchase_type))
+    contracts = {cid: (home_resort, purchase_type) for cid, home_resort, purchase_type in result}
+
+    report = {
+        "rows": 0,
+        "imported": 0,
+        "priced": 0,
+        "dry_run": dry_run,
+        "errors": [],
+        "error_count": 0,
+        "truncated": False,
+    }
+
+    def add_errors(line: int, errors: list[dict[str, str]]) -> None:
+        report["error_count"] += len(errors)
+        report["errors"].extend({"line": line, **error} for error in errors)
+
+    def trim_errors() -> None:
+        # Errors are appended chunk by chunk; parse errors may have jumped ahead
+        errors = report["errors"]
+        errors.sort(key=lambda e: e["line"])
+        if len(errors) > max_errors:
+            del errors[max_errors:]
+            report["truncated"] = True
+
+    async def flush(chunk: list[tuple[int, dict]]) -> None:
+        valid = []
+        for line, row in chunk:
+            values, errors = _validate_row(row, contracts, price)
+            if errors:
+                add_errors(line, errors)
+                continue
+            report["priced"] += price and row.get("points_cost") is None
+            valid.append(values)
+        if valid and not dry_run:
+            await insert_reservations(db, valid)
+        report["imported"] += len(valid)
+        trim_errors()
+
+    chunk: list[tuple[int, dict]] = []
+    async for line, row, issue in rows:
+        report["rows"] += 1
+        if issue is not None:
+            add_errors(line, [{"field": "row", "issue": issue}])
+            continue
+        chunk.append((line, row))
+        if len(chunk) >= chunk_size:
+            await flush(chunk)
+            chunk = []
+    if chunk:
+        await flush(chunk)
+    trim_errors()
+    return report
@@ -1,10 +1,13 @@
+import base64
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.api.errors import NotFoundError, ValidationError
+from backend.api.reservation_import import import_reservations, iter_import_rows, iter_lines
+from backend.api.responses import FastJSONResponse
 from backend.api.schemas import (
     AvailabilitySnapshot,
     BookingWindowInfo,
@@ -15,9 +18,10 @@ from backend.api.schemas import (
     ReservationUpdate,
 )
 from backend.db.database import get_db
+from backend.db.portfolio import invalidate_portfolio
 from backend.engine.booking_impact import compute_banking_warning, compute_booking_impact
 from backend.engine.booking_windows import compute_booking_windows
-from backend.engine.eligibility import get_eligible_resorts
+from backend.engine.eligibility import get_eligible_resort_set, get_eligible_resorts
 from backend.models.contract import Contract
 from backend.models.point_balance import PointBalance
 from backend.models.reservation import Reservation
@@ -25,44 +29,158 @@ from backend.models.reservation import Reservation
 router = APIRouter(tags=["reservations"])
 
 
+RESERVATION_FIELDS = tuple(ReservationResponse.model_fields)
+
+
+def _encode_cursor(check_in: date, reservation_id: int) -> str:
+    """Opaque keyset cursor for the row after (check_in, id)."""
+    raw = f"{check_in.isoformat()}:{reservation_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        check_in, reservation_id = raw.split(":")
+        return date.fromisoformat(check_in), int(reservation_id)
+    except ValueError as exc:
+        raise ValidationError(
+            "Validation failed", fields=[{"field": "cursor", "issue": "Invalid cursor"}]
+        ) from exc
+
+
+def _parse_fields(fields: str | None) -> list[str] | None:
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if not names:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "fields", "issue": "fields must name at least one column"}],
+        )
+    unknown = [name for name in names if name not in RESERVATION_FIELDS]
+    if unknown:
+        raise ValidationError(
+            "Validation failed",
+            fields=[
+                {
+                    "field": "fields",
+                    "issue": f"Unknown fields: {unknown}. Allowed: {list(RESERVATION_FIELDS)}",
+                }
+            ],
+        )
+    return names
+
+
+async def _reservation_page(
+    db: AsyncSession,
+    conditions: list,
+    response: Response,
+    check_in_from: date | None,
+    check_in_to: date | None,
+    fields: str | None,
+    limit: int | None,
+    cursor: str | None,
+):
+    """
+    One page of reservations ordered by (check_in, id).
+
+    With limit, fetches one extra row to tell whether another page follows
+    and, if so, sets its cursor in the X-Next-Cursor header. With fields,
+    selects only those columns (no ORM objects) and returns a FastJSONResponse
+    directly, skipping response_model validation.
+    """
+    names = _parse_fields(fields)
+    if check_in_from is not None:
+        conditions.append(Reservation.check_in >= check_in_from)
+    if check_in_to is not None:
+        conditions.append(Reservation.check_in <= check_in_to)
+    if cursor is not None:
+        # Keyset: strictly after the last row of the previous page
+        conditions.append(tuple_(Reservation.check_in, Reservation.id) > _decode_cursor(cursor))
+
+    if names is None:
+        query = select(Reservation)
+    else:
+        # check_in and id are needed for the next cursor even if not requested
+        columns = dict.fromkeys([*names, "check_in", "id"])
+        query = select(*(getattr(Reservation, name) for name in columns))
+    query = query.where(*conditions).order_by(Reservation.check_in.asc(), Reservation.id.asc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = list(result.scalars() if names is None else result)
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].check_in, rows[-1].id)
+
+    if names is None:
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return rows
+    content = [{name: getattr(row, name) for name in names} for row in rows]
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return FastJSONResponse(content, headers=headers)
+
+
 @router.get("/api/reservations", response_model=list[ReservationResponse])
 async def list_reservations(
+    response: Response,
     contract_id: int | None = Query(None),
     status_filter: str | None = Query(None, alias="status"),
     upcoming: bool = Query(False),
+    check_in_from: date | None = Query(None, description="Earliest check-in (YYYY-MM-DD)"),
+    check_in_to: date | None = Query(None, description="Latest check-in, inclusive"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
+    limit: int | None = Query(None, ge=1, le=500, description="Page size (default: all)"),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all reservations with optional filters."""
-    query = select(Reservation)
-
+    """List reservations with optional filters, keyset pagination and field projection."""
+    conditions = []
     if contract_id is not None:
-        query = query.where(Reservation.contract_id == contract_id)
+        conditions.append(Reservation.contract_id == contract_id)
     if status_filter is not None:
-        query = query.where(Reservation.status == status_filter)
+        conditions.append(Reservation.status == status_filter)
     if upcoming:
-        query = query.where(Reservation.check_in >= date.today())
+        conditions.append(Reservation.check_in >= date.today())
 
-    query = query.order_by(Reservation.check_in.asc())
-    result = await db.execute(query)
-    return result.scalars().all()
+    return await _reservation_page(
+        db, conditions, response, check_in_from, check_in_to, fields, limit, cursor
+    )
 
 
 @router.get(
     "/api/contracts/{contract_id}/reservations",
     response_model=list[ReservationResponse],
 )
-async def list_contract_reservations(contract_id: int, db: AsyncSession = Depends(get_db)):
-    """List reservations for a specific contract."""
-    result = await db.execute(select(Contract).where(Contract.id == contract_id))
-    if not result.scalar_one_or_none():
+async def list_contract_reservations(
+    contract_id: int,
+    response: Response,
+    check_in_from: date | None = Query(None, description="Earliest check-in (YYYY-MM-DD)"),
+    check_in_to: date | None = Query(None, description="Latest check-in, inclusive"),
+    fields: str | None = Query(None, description="Comma-separated fields to return"),
+    limit: int | None = Query(None, ge=1, le=500, description="Page size (default: all)"),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    db: AsyncSession = Depends(get_db),
+):
+    """List a contract's reservations, with the date filters, paging and fields of /api/reservations."""
+    result = await db.execute(select(Contract.id).where(Contract.id == contract_id))
+    if result.scalar_one_or_none() is None:
         raise NotFoundError("Contract not found")
 
-    result = await db.execute(
-        select(Reservation)
-        .where(Reservation.contract_id == contract_id)
-        .order_by(Reservation.check_in.asc())
+    return await _reservation_page(
+        db,
+        [Reservation.contract_id == contract_id],
+        response,
+        check_in_from,
+        check_in_to,
+        fields,
+        limit,
+        cursor,
     )
-    return result.scalars().all()
 
 
 @router.post(
@@ -172,6 +290,34 @@ async def preview_reservation(
     )
 
 
+@router.post("/api/reservations/import")
+async def import_reservation_file(
+    request: Request,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    price: bool = Query(False, description="Price rows without points_cost from the charts"),
+    dry_run: bool = Query(False, description="Validate only, insert nothing"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Bulk-import reservations from a CSV or NDJSON request body.
+
+    The body is streamed and validated in chunks with the same rules as
+    creating one reservation; each chunk's valid rows are inserted in one
+    transaction. Rows with problems are skipped and reported by line number.
+    """
+    try:
+        return await import_reservations(
+            db,
+            iter_import_rows(iter_lines(request.stream()), fmt),
+            price=price,
+            dry_run=dry_run,
+        )
+    except ValueError as exc:
+        raise ValidationError(
+            "Validation failed", fields=[{"field": "file", "issue": str(exc)}]
+        ) from exc
+
+
 @router.get("/api/reservations/{reservation_id}", response_model=ReservationResponse)
 async def get_reservation(reservation_id: int, db: AsyncSession = Depends(get_db)):
     """Get a single reservation."""
@@ -197,8 +343,8 @@ async def create_reservation(
         raise NotFoundError("Contract not found")
 
     # Validate resort eligibility
-    eligible = get_eligible_resorts(contract.home_resort, contract.purchase_type)
-    if data.resort not in eligible:
+    if data.resort not in get_eligible_resort_set(contract.home_resort, contract.purchase_type):
+        eligible = get_eligible_resorts(contract.home_resort, contract.purchase_type)
         raise ValidationError(
             "Validation failed",
             fields=[
@@ -222,6 +368,7 @@ async def create_reservation(
     )
     db.add(reservation)
     await db.commit()
+    invalidate_portfolio()
     await db.refresh(reservation)
     return reservation
 
@@ -241,6 +388,7 @@ async def update_reservation(
         setattr(reservation, field, value)
 
     await db.commit()
+    invalidate_portfolio()
     await db.refresh(reservation)
     return reservation
 
@@ -255,3 +403,4 @@ async def delete_reservation(reservation_id: int, db: AsyncSession = Depends(get
 
     await db.delete(reservation)
     await db.commit()
+    invalidate_portfolio()
@@ -0,0 +1,48 @@
+"""Fast JSON responses for endpoints that return the engine's plain dicts.
+
+A dict returned from an endpoint goes through jsonable_encoder, plus
+response_model validation where one is set, before JSONResponse serializes
+it. Engine results are already plain dicts, lists, strings, numbers and
+dates. Returning FastJSONResponse(result) directly skips both steps and
+serializes in a single pass, using orjson when it is installed (an optional
+dependency) and the stdlib encoder otherwise; both decode to the same values.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the non-JSON types engine results contain (the stdlib path)."""
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    if isinstance(value, set | frozenset):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize plain engine output to compact UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # sets and other types only the stdlib default handles
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes with dumps(): no jsonable_encoder, no re-validation."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,25 +1,107 @@
+import uuid
+from collections import OrderedDict
 from datetime import date
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.api.errors import ValidationError
+from backend.api.errors import NotFoundError, ValidationError
 from backend.api.schemas import (
     ContractScenarioResult,
+    HypotheticalBooking,
     ResolvedBooking,
     ScenarioEvaluateRequest,
     ScenarioEvaluateResponse,
+    ScenarioOptimizeRequest,
+    ScenarioOptimizeResponse,
+    ScenarioSessionCreateRequest,
+    ScenarioSessionResponse,
+    SessionBooking,
 )
+from backend.data.point_charts import get_chart_catalog
 from backend.db.database import get_db
-from backend.engine.eligibility import get_eligible_resorts
+from backend.db.portfolio import load_portfolio
+from backend.engine.eligibility import get_eligible_resort_set, get_eligible_resorts
+from backend.engine.optimizer import optimize_stay_assignments
 from backend.engine.scenario import compute_scenario_impact
-from backend.models.contract import Contract
-from backend.models.point_balance import PointBalance
-from backend.models.reservation import Reservation
+from backend.engine.scenario_session import (
+    add_booking,
+    create_session,
+    rebase_session,
+    remove_booking,
+    reprice_session,
+    session_result,
+    update_booking,
+)
 
 router = APIRouter(tags=["scenarios"])
 
+# Scenario sessions live in this process only, least recently used first
+MAX_SCENARIO_SESSIONS = 50
+MAX_SESSION_BOOKINGS = 50
+_sessions: OrderedDict[str, dict] = OrderedDict()
+
+
+def _validate_booking(
+    contract_map: dict[int, dict], hb: HypotheticalBooking, prefix: str = ""
+) -> None:
+    """Raise ValidationError unless the booking's contract exists and can book its resort."""
+    contract = contract_map.get(hb.contract_id)
+    if not contract:
+        raise ValidationError(
+            "Validation failed",
+            fields=[
+                {
+                    "field": f"{prefix}contract_id",
+                    "issue": f"Contract {hb.contract_id} not found",
+                }
+            ],
+        )
+    if hb.resort not in get_eligible_resort_set(contract["home_resort"], contract["purchase_type"]):
+        eligible = get_eligible_resorts(contract["home_resort"], contract["purchase_type"])
+        raise ValidationError(
+            "Validation failed",
+            fields=[
+                {
+                    "field": f"{prefix}resort",
+                    "issue": (
+                        f"Resort '{hb.resort}' is not eligible for contract {hb.contract_id} "
+                        f"({contract['purchase_type']} at {contract['home_resort']}). "
+                        f"Eligible resorts: {eligible}"
+                    ),
+                }
+            ],
+        )
+
+
+def _booking_dict(hb: HypotheticalBooking) -> dict:
+    return {
+        "contract_id": hb.contract_id,
+        "resort": hb.resort,
+        "room_key": hb.room_key,
+        "check_in": hb.check_in,
+        "check_out": hb.check_out,
+    }
+
+
+def _contract_responses(contract_results: list[dict]) -> list[ContractScenarioResult]:
+    """Map per-contract engine results to the response schema."""
+    return [
+        ContractScenarioResult(
+            contract_id=cr["contract_id"],
+            contract_name=cr["contract_name"],
+            home_resort=cr["home_resort"],
+            baseline_available=cr["baseline"]["available_points"],
+            baseline_total=cr["baseline"]["total_points"],
+            baseline_committed=cr["baseline"]["committed_points"],
+            scenario_available=cr["scenario"]["available_points"],
+            scenario_total=cr["scenario"]["total_points"],
+            scenario_committed=cr["scenario"]["committed_points"],
+            impact=cr["baseline"]["available_points"] - cr["scenario"]["available_points"],
+        )
+        for cr in contract_results
+    ]
+
 
 @router.post("/api/scenarios/evaluate", response_model=ScenarioEvaluateResponse)
 async def evaluate_scenario(
@@ -31,9 +113,9 @@ async def evaluate_scenario(
     Returns baseline vs scenario availability per contract, grand totals,
     resolved booking costs, and any errors from unresolvable bookings.
     """
-    # 1. Load all contracts
-    result = await db.execute(select(Contract))
-    all_contracts = result.scalars().all()
+    # 1. Load the portfolio
+    portfolio = await load_portfolio(db)
+    all_contracts = portfolio["contracts"]
 
     if not all_contracts:
         return ScenarioEvaluateResponse(
@@ -48,116 +130,23 @@ async def evaluate_scenario(
             errors=[],
         )
 
-    # 2. Build contract lookup for eligibility validation
-    contract_map = {c.id: c for c in all_contracts}
-
-    # 3. Validate resort eligibility for each hypothetical booking
+    # 2. Validate contract and resort eligibility for each hypothetical booking
+    contract_map = {c["id"]: c for c in all_contracts}
     for idx, hb in enumerate(data.hypothetical_bookings):
-        contract = contract_map.get(hb.contract_id)
-        if not contract:
-            raise ValidationError(
-                "Validation failed",
-                fields=[
-                    {
-                        "field": f"hypothetical_bookings[{idx}].contract_id",
-                        "issue": f"Contract {hb.contract_id} not found",
-                    }
-                ],
-            )
-        eligible = get_eligible_resorts(contract.home_resort, contract.purchase_type)
-        if hb.resort not in eligible:
-            raise ValidationError(
-                "Validation failed",
-                fields=[
-                    {
-                        "field": f"hypothetical_bookings[{idx}].resort",
-                        "issue": (
-                            f"Resort '{hb.resort}' is not eligible for contract {hb.contract_id} "
-                            f"({contract.purchase_type} at {contract.home_resort}). "
-                            f"Eligible resorts: {eligible}"
-                        ),
-                    }
-                ],
-            )
-
-    # 4. Load all point balances
-    result = await db.execute(select(PointBalance))
-    all_balances = result.scalars().all()
-
-    # 5. Load all non-cancelled reservations
-    result = await db.execute(select(Reservation).where(Reservation.status != "cancelled"))
-    all_reservations = result.scalars().all()
-
-    # 6. Convert ORM objects to dicts (same pattern as reservations.py)
-    contracts_data = [
-        {
-            "id": c.id,
-            "use_year_month": c.use_year_month,
-            "annual_points": c.annual_points,
-            "home_resort": c.home_resort,
-            "name": c.name,
-        }
-        for c in all_contracts
-    ]
-
-    balances_data = [
-        {
-            "contract_id": b.contract_id,
-            "use_year": b.use_year,
-            "allocation_type": b.allocation_type,
-            "points": b.points,
-        }
-        for b in all_balances
-    ]
-
-    reservations_data = [
-        {
-            "contract_id": r.contract_id,
-            "check_in": r.check_in,
-            "points_cost": r.points_cost,
-            "status": r.status,
-        }
-        for r in all_reservations
-    ]
+        _validate_booking(contract_map, hb, f"hypothetical_bookings[{idx}].")
 
-    hypotheticals_data = [
-        {
-            "contract_id": hb.contract_id,
-            "resort": hb.resort,
-            "room_key": hb.room_key,
-            "check_in": hb.check_in,
-            "check_out": hb.check_out,
-        }
-        for hb in data.hypothetical_bookings
-    ]
+    hypotheticals_data = [_booking_dict(hb) for hb in data.hypothetical_bookings]
 
-    # 7. Call engine
+    # 3. Call engine
     engine_result = compute_scenario_impact(
-        contracts=contracts_data,
-        point_balances=balances_data,
-        reservations=reservations_data,
+        contracts=all_contracts,
+        point_balances=portfolio["balances"],
+        reservations=portfolio["reservations"],
         hypothetical_bookings=hypotheticals_data,
         target_date=date.today(),
     )
 
-    # 8. Map engine result to response schema
-    contract_responses = []
-    for cr in engine_result["contracts"]:
-        contract_responses.append(
-            ContractScenarioResult(
-                contract_id=cr["contract_id"],
-                contract_name=cr["contract_name"],
-                home_resort=cr["home_resort"],
-                baseline_available=cr["baseline"]["available_points"],
-                baseline_total=cr["baseline"]["total_points"],
-                baseline_committed=cr["baseline"]["committed_points"],
-                scenario_available=cr["scenario"]["available_points"],
-                scenario_total=cr["scenario"]["total_points"],
-                scenario_committed=cr["scenario"]["committed_points"],
-                impact=cr["baseline"]["available_points"] - cr["scenario"]["available_points"],
-            )
-        )
-
+    # 4. Map engine result to response schema
     resolved_responses = [
         ResolvedBooking(
             contract_id=rb["contract_id"],
@@ -172,8 +161,217 @@ async def evaluate_scenario(
     ]
 
     return ScenarioEvaluateResponse(
-        contracts=contract_responses,
+        contracts=_contract_responses(engine_result["contracts"]),
         summary=engine_result["summary"],
         resolved_bookings=resolved_responses,
         errors=engine_result["errors"],
     )
+
+
+@router.post("/api/scenarios/optimize", response_model=ScenarioOptimizeResponse)
+async def optimize_scenario(
+    data: ScenarioOptimizeRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Choose which contract should pay for each wanted stay.
+
+    Assigns every stay to an eligible contract (or, with allow_splits,
+    several) so that as many stays as possible are placed and as few points
+    as possible are left to expire.
+    """
+    portfolio = await load_portfolio(db)
+
+    stays_data = [
+        {
+            "resort": stay.resort,
+            "room_key": stay.room_key,
+            "check_in": stay.check_in,
+            "check_out": stay.check_out,
+        }
+        for stay in data.stays
+    ]
+
+    engine_result = optimize_stay_assignments(
+        contracts=portfolio["contracts"],
+        point_balances=portfolio["balances"],
+        reservations=portfolio["reservations"],
+        stays=stays_data,
+        today=date.today(),
+        allow_splits=data.allow_splits,
+    )
+
+    return ScenarioOptimizeResponse(**engine_result)
+
+
+# --- Scenario sessions: keep a scenario on the server and edit it one booking at a time ---
+
+
+def _get_session(scenario_id: str) -> dict:
+    session = _sessions.get(scenario_id)
+    if session is None:
+        raise NotFoundError("Scenario not found")
+    _sessions.move_to_end(scenario_id)
+    return session
+
+
+async def _current_session(scenario_id: str, db: AsyncSession) -> tuple[dict, dict]:
+    """
+    Return (session, portfolio), rebasing the session if a write or a new day made it
+    stale and re-pricing its bookings if the point charts were reloaded.
+    """
+    session = _get_session(scenario_id)
+    portfolio = await load_portfolio(db)
+    today = date.today()
+    if session["portfolio_version"] != portfolio["version"] or session["target_date"] != today:
+        rebase_session(
+            session,
+            portfolio["contracts"],
+            portfolio["balances"],
+            portfolio["reservations"],
+            today,
+            portfolio["version"],
+        )
+    # Bookings were priced from the charts of that time; re-price after a chart reload
+    chart_version = get_chart_catalog().version
+    if session["chart_version"] != chart_version:
+        reprice_session(session)
+        session["chart_version"] = chart_version
+    return session, portfolio
+
+
+def _session_response(scenario_id: str, session: dict) -> ScenarioSessionResponse:
+    result = session_result(session)
+    return ScenarioSessionResponse(
+        scenario_id=scenario_id,
+        contracts=_contract_responses(result["contracts"]),
+        summary=result["summary"],
+        resolved_bookings=[
+            SessionBooking(
+                booking_id=rb["booking_id"],
+                contract_id=rb["contract_id"],
+                resort=rb["resort"],
+                room_key=rb["room_key"],
+                check_in=rb["check_in"],
+                check_out=rb["check_out"],
+                points_cost=rb["points_cost"],
+                num_nights=rb["num_nights"],
+            )
+            for rb in result["resolved_bookings"]
+        ],
+        errors=result["errors"],
+    )
+
+
+@router.post(
+    "/api/scenarios/sessions",
+    response_model=ScenarioSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_scenario_session(
+    data: ScenarioSessionCreateRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Start a scenario session, optionally seeded with hypothetical bookings.
+
+    Baselines and booking costs are kept on the server, so later edits only
+    recompute the contracts they touch. The oldest sessions are dropped
+    beyond MAX_SCENARIO_SESSIONS.
+    """
+    portfolio = await load_portfolio(db)
+    contract_map = {c["id"]: c for c in portfolio["contracts"]}
+    for idx, hb in enumerate(data.hypothetical_bookings):
+        _validate_booking(contract_map, hb, f"hypothetical_bookings[{idx}].")
+
+    session = create_session(
+        portfolio["contracts"],
+        portfolio["balances"],
+        portfolio["reservations"],
+        date.today(),
+        portfolio["version"],
+    )
+    session["chart_version"] = get_chart_catalog().version
+    for hb in data.hypothetical_bookings:
+        add_booking(session, _booking_dict(hb))
+
+    scenario_id = uuid.uuid4().hex
+    _sessions[scenario_id] = session
+    while len(_sessions) > MAX_SCENARIO_SESSIONS:
+        _sessions.popitem(last=False)
+    return _session_response(scenario_id, session)
+
+
+@router.get("/api/scenarios/sessions/{scenario_id}", response_model=ScenarioSessionResponse)
+async def get_scenario_session(scenario_id: str, db: AsyncSession = Depends(get_db)):
+    """Current baseline vs scenario for a session."""
+    session, _ = await _current_session(scenario_id, db)
+    return _session_response(scenario_id, session)
+
+
+@router.post(
+    "/api/scenarios/sessions/{scenario_id}/bookings",
+    response_model=ScenarioSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_session_booking(
+    scenario_id: str,
+    data: HypotheticalBooking,
+    db: AsyncSession = Depends(get_db),
+):
+    """Add one hypothetical booking to a session."""
+    session, portfolio = await _current_session(scenario_id, db)
+    if len(session["bookings"]) >= MAX_SESSION_BOOKINGS:
+        raise ValidationError(
+            "Validation failed",
+            fields=[
+                {
+                    "field": "hypothetical_bookings",
+                    "issue": f"Maximum {MAX_SESSION_BOOKINGS} hypothetical bookings",
+                }
+            ],
+        )
+    _validate_booking({c["id"]: c for c in portfolio["contracts"]}, data)
+    add_booking(session, _booking_dict(data))
+    return _session_response(scenario_id, session)
+
+
+@router.put(
+    "/api/scenarios/sessions/{scenario_id}/bookings/{booking_id}",
+    response_model=ScenarioSessionResponse,
+)
+async def update_session_booking(
+    scenario_id: str,
+    booking_id: int,
+    data: HypotheticalBooking,
+    db: AsyncSession = Depends(get_db),
+):
+    """Replace one hypothetical booking in a session."""
+    session, portfolio = await _current_session(scenario_id, db)
+    if booking_id not in session["bookings"]:
+        raise NotFoundError("Booking not found")
+    _validate_booking({c["id"]: c for c in portfolio["contracts"]}, data)
+    update_booking(session, booking_id, _booking_dict(data))
+    return _session_response(scenario_id, session)
+
+
+@router.delete(
+    "/api/scenarios/sessions/{scenario_id}/bookings/{booking_id}",
+    response_model=ScenarioSessionResponse,
+)
+async def remove_session_booking(
+    scenario_id: str,
+    booking_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Remove one hypothetical booking from a session."""
+    session, _ = await _current_session(scenario_id, db)
+    if booking_id not in session["bookings"]:
+        raise NotFoundError("Booking not found")
+    remove_booking(session, booking_id)
+    return _session_response(scenario_id, session)
+
+
+@router.delete("/api/scenarios/sessions/{scenario_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_scenario_session(scenario_id: str):
+    """Discard a scenario session."""
+    _get_session(scenario_id)
+    del _sessions[scenario_id]
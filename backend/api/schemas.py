@@ -45,9 +45,9 @@ class ContractCreate(BaseModel):
     @field_validator("home_resort")
     @classmethod
     def validate_home_resort(cls, v):
-        from backend.data.resorts import get_resort_slugs
+        from backend.data.resorts import get_resort_slugs, is_resort_slug
 
-        if v not in get_resort_slugs():
+        if not is_resort_slug(v):
             raise ValueError(f"Invalid resort slug. Must be one of: {get_resort_slugs()}")
         return v
 
@@ -85,9 +85,9 @@ class ContractUpdate(BaseModel):
     @classmethod
     def validate_home_resort(cls, v):
         if v is not None:
-            from backend.data.resorts import get_resort_slugs
+            from backend.data.resorts import is_resort_slug
 
-            if v not in get_resort_slugs():
+            if not is_resort_slug(v):
                 raise ValueError("Invalid resort slug.")
         return v
 
@@ -217,9 +217,9 @@ class ReservationCreate(BaseModel):
     @field_validator("resort")
     @classmethod
     def validate_resort(cls, v):
-        from backend.data.resorts import get_resort_slugs
+        from backend.data.resorts import is_resort_slug
 
-        if v not in get_resort_slugs():
+        if not is_resort_slug(v):
             raise ValueError("Invalid resort slug.")
         return v
 
@@ -269,9 +269,9 @@ class ReservationUpdate(BaseModel):
     @classmethod
     def validate_resort(cls, v):
         if v is not None:
-            from backend.data.resorts import get_resort_slugs
+            from backend.data.resorts import is_resort_slug
 
-            if v not in get_resort_slugs():
+            if not is_resort_slug(v):
                 raise ValueError("Invalid resort slug.")
         return v
 
@@ -452,8 +452,7 @@ class BookingWindowAlert(BaseModel):
 # Scenario Evaluation schemas
 
 
-class HypotheticalBooking(BaseModel):
-    contract_id: int
+class WantedStay(BaseModel):
     resort: str = Field(..., min_length=1)
     room_key: str = Field(..., min_length=1)
     check_in: date_type
@@ -475,6 +474,10 @@ class HypotheticalBooking(BaseModel):
         return v
 
 
+class HypotheticalBooking(WantedStay):
+    contract_id: int
+
+
 class ScenarioEvaluateRequest(BaseModel):
     hypothetical_bookings: list[HypotheticalBooking]
 
@@ -514,3 +517,111 @@ class ScenarioEvaluateResponse(BaseModel):
     summary: dict
     resolved_bookings: list[ResolvedBooking]
     errors: list[dict]
+
+
+# Scenario Session schemas
+
+
+class ScenarioSessionCreateRequest(BaseModel):
+    hypothetical_bookings: list[HypotheticalBooking] = []
+
+    @field_validator("hypothetical_bookings")
+    @classmethod
+    def validate_max_bookings(cls, v):
+        if len(v) > 50:
+            raise ValueError("Maximum 50 hypothetical bookings")
+        return v
+
+
+class SessionBooking(ResolvedBooking):
+    booking_id: int
+
+
+class ScenarioSessionResponse(BaseModel):
+    scenario_id: str
+    contracts: list[ContractScenarioResult]
+    summary: dict
+    resolved_bookings: list[SessionBooking]
+    errors: list[dict]
+
+
+# Scenario Optimizer schemas
+
+
+class ScenarioOptimizeRequest(BaseModel):
+    stays: list[WantedStay]
+    allow_splits: bool = False
+
+    @field_validator("stays")
+    @classmethod
+    def validate_max_stays(cls, v):
+        if len(v) > 12:
+            raise ValueError("Maximum 12 stays")
+        return v
+
+
+class StayAllocation(BaseModel):
+    contract_id: int
+    contract_name: str
+    use_year: int
+    points: int
+
+
+class OptimizedStay(BaseModel):
+    stay_index: int
+    resort: str
+    room_key: str
+    check_in: date_type
+    check_out: date_type
+    points_cost: int
+    num_nights: int
+    assigned: bool
+    allocations: list[StayAllocation]
+
+
+class ContractUseYearResult(BaseModel):
+    contract_id: int
+    contract_name: str
+    use_year: int
+    available_points: int
+    points_at_risk: int
+    points_used: int
+    points_expiring: int
+
+
+class ScenarioOptimizeResponse(BaseModel):
+    assignments: list[OptimizedStay]
+    use_years: list[ContractUseYearResult]
+    summary: dict
+    errors: list[dict]
+
+
+# Trip-plan simulation schemas
+
+
+class SimulatedTrip(BaseModel):
+    month: int = Field(..., ge=1, le=12)
+    nights: int = Field(..., ge=1, le=14)
+    room_key: str = Field(..., min_length=1)
+    resorts: list[str] | None = None
+    contract_id: int | None = None
+
+    @field_validator("room_key", mode="before")
+    @classmethod
+    def strip_room_key(cls, v):
+        return _strip_str(v)
+
+
+class TripSimulationRequest(BaseModel):
+    trips: list[SimulatedTrip] = Field(..., min_length=1)
+    years: int = Field(5, ge=1, le=10)
+    samples: int = Field(1000, ge=100, le=10000)
+    seed: int | None = None
+    as_of: date_type | None = None
+
+    @field_validator("trips")
+    @classmethod
+    def validate_max_trips(cls, v):
+        if len(v) > 12:
+            raise ValueError("Maximum 12 trips")
+        return v
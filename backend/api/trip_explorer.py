@@ -1,15 +1,13 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.api.errors import ValidationError
+from backend.api.responses import FastJSONResponse
 from backend.db.database import get_db
-from backend.engine.trip_explorer import find_affordable_options
-from backend.models.contract import Contract
-from backend.models.point_balance import PointBalance
-from backend.models.reservation import Reservation
+from backend.db.portfolio import load_portfolio
+from backend.engine.trip_explorer import find_affordable_options, find_flexible_options
 
 router = APIRouter(tags=["trip-explorer"])
 
@@ -39,55 +37,61 @@ async def trip_explorer(
             fields=[{"field": "check_out", "issue": "Stay cannot exceed 14 nights"}],
         )
 
-    # Load all contracts
-    result = await db.execute(select(Contract))
-    contracts = result.scalars().all()
+    portfolio = await load_portfolio(db)
 
-    # Load all point balances
-    result = await db.execute(select(PointBalance))
-    all_balances = result.scalars().all()
+    return FastJSONResponse(
+        find_affordable_options(
+            contracts=portfolio["contracts"],
+            point_balances=portfolio["balances"],
+            reservations=portfolio["reservations"],
+            check_in=check_in,
+            check_out=check_out,
+        )
+    )
 
-    # Load all non-cancelled reservations
-    result = await db.execute(select(Reservation).where(Reservation.status != "cancelled"))
-    all_reservations = result.scalars().all()
 
-    # Convert ORM objects to dicts for the pure-function engine
-    contracts_data = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "home_resort": c.home_resort,
-            "use_year_month": c.use_year_month,
-            "annual_points": c.annual_points,
-            "purchase_type": c.purchase_type,
-        }
-        for c in contracts
-    ]
+@router.get("/api/trip-explorer/flexible")
+async def trip_explorer_flexible(
+    earliest_check_in: date = Query(..., description="Earliest check-in date (YYYY-MM-DD)"),
+    latest_check_out: date = Query(..., description="Latest check-out date (YYYY-MM-DD)"),
+    num_nights: int = Query(..., ge=1, le=14, description="Length of stay in nights"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of options"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Find the cheapest affordable stays of a given length anywhere in a date window.
 
-    balances_data = [
-        {
-            "contract_id": b.contract_id,
-            "use_year": b.use_year,
-            "allocation_type": b.allocation_type,
-            "points": b.points,
-        }
-        for b in all_balances
-    ]
+    Returns the best start date for each contract/resort/room combination,
+    cheapest first.
+    """
+    # Validation
+    window_days = (latest_check_out - earliest_check_in).days
+    if window_days < num_nights:
+        raise ValidationError(
+            "Validation failed",
+            fields=[
+                {
+                    "field": "latest_check_out",
+                    "issue": "Date window must be at least num_nights long",
+                }
+            ],
+        )
+    if window_days > 90:
+        raise ValidationError(
+            "Validation failed",
+            fields=[{"field": "latest_check_out", "issue": "Date window cannot exceed 90 days"}],
+        )
 
-    reservations_data = [
-        {
-            "contract_id": r.contract_id,
-            "check_in": r.check_in,
-            "points_cost": r.points_cost,
-            "status": r.status,
-        }
-        for r in all_reservations
-    ]
+    portfolio = await load_portfolio(db)
 
-    return find_affordable_options(
-        contracts=contracts_data,
-        point_balances=balances_data,
-        reservations=reservations_data,
-        check_in=check_in,
-        check_out=check_out,
+    return FastJSONResponse(
+        find_flexible_options(
+            contracts=portfolio["contracts"],
+            point_balances=portfolio["balances"],
+            reservations=portfolio["reservations"],
+            earliest_check_in=earliest_check_in,
+            latest_check_out=latest_check_out,
+            num_nights=num_nights,
+            limit=limit,
+        )
     )
@@ -0,0 +1,79 @@
+"""Command-line maintenance tasks that work on the app database.
+
+Usage:
+    python -m backend.cli import-reservations FILE [--format csv|ndjson] [--price] [--dry-run]
+
+The format defaults to ndjson for .ndjson/.jsonl files and csv otherwise.
+Uses DATABASE_URL like the server. A running server caches the portfolio
+per process, so restart it after importing into its database.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from backend.api.reservation_import import (
+    CHUNK_SIZE,
+    IMPORT_FORMATS,
+    import_reservations,
+    iter_import_rows,
+    iter_lines,
+)
+from backend.db.database import async_session
+
+
+async def _read_chunks(path: Path, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+async def _import_reservations(args: argparse.Namespace) -> int:
+    fmt = args.format or ("ndjson" if args.file.suffix in (".ndjson", ".jsonl") else "csv")
+    async with async_session() as db:
+        try:
+            report = await import_reservations(
+                db,
+                iter_import_rows(iter_lines(_read_chunks(args.file)), fmt),
+                price=args.price,
+                dry_run=args.dry_run,
+                chunk_size=args.chunk_size,
+            )
+        except ValueError as exc:
+            print(f"{args.file}: {exc}", file=sys.stderr)
+            return 2
+
+    for error in report["errors"]:
+        print(f"{args.file}:{error['line']}: {error['field']}: {error['issue']}", file=sys.stderr)
+    if report["truncated"]:
+        hidden = report["error_count"] - len(report["errors"])
+        print(f"{args.file}: {hidden} more errors not shown", file=sys.stderr)
+    summary = {key: value for key, value in report.items() if key != "errors"}
+    print(json.dumps(summary))
+    return 1 if report["error_count"] else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    imports = commands.add_parser(
+        "import-reservations", help="bulk-import reservations from a CSV or NDJSON file"
+    )
+    imports.add_argument("file", type=Path)
+    imports.add_argument("--format", choices=IMPORT_FORMATS)
+    imports.add_argument(
+        "--price", action="store_true", help="price rows without points_cost from the charts"
+    )
+    imports.add_argument("--dry-run", action="store_true", help="validate only, insert nothing")
+    imports.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    args = parser.parse_args(argv)
+    return asyncio.run(_import_reservations(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
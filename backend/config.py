@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +9,20 @@ class Settings(BaseSettings):
     cors_origins: str = "http://localhost:5173"
     port: int = 8000
     host: str = "0.0.0.0"
+    portfolio_cache_enabled: bool = True
+
+    # SQLite connection profile, applied as PRAGMAs on every new connection
+    sqlite_journal_mode: Literal["wal", "delete", "truncate", "persist"] = "wal"
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_mb: int = 256
+    sqlite_temp_store: Literal["default", "file", "memory"] = "memory"
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+
+    # Processes for the trip-plan simulator; 0 means one per CPU
+    simulation_workers: int = 0
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
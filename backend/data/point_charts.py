@@ -1,34 +1,456 @@
+import itertools
 import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 from datetime import date, timedelta
-from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
 
 CHARTS_DIR = Path(__file__).parent.parent.parent / "data" / "point_charts"
 
+# Compiled binary form of every chart in a directory, written there by
+# scripts/build_chart_artifact.py
+ARTIFACT_NAME = "charts.bin"
+_ARTIFACT_MAGIC = b"DVCCHRT1"
+_ARTIFACT_FORMAT = 2
+
+
+@dataclass(frozen=True)
+class ChartCatalog:
+    """Every point chart file, parsed and compiled once.
+
+    charts and compiled are keyed by (resort, year). entries is the
+    get_available_charts() listing; problems holds coverage issues found by
+    check_chart_coverage(), for charts that have any, and skipped the files
+    left out with the reason. version increases with every catalog built.
+
+    artifact is the compiled chart file the catalog was mapped from (None when
+    built from chart JSON). Its compiled charts then hold read-only views of
+    the mapped file instead of lists; charts come from the same file.
+    """
+
+    version: int
+    charts: Mapping[tuple[str, int], dict]
+    compiled: Mapping[tuple[str, int], dict]
+    entries: tuple[dict, ...]
+    problems: Mapping[tuple[str, int], tuple[str, ...]]
+    skipped: Mapping[str, str]
+    artifact: Path | None = None
+
+
+# Published by load_chart_catalog(); read through get_chart_catalog()
+_catalog: ChartCatalog | None = None
+_catalog_versions = itertools.count(1)
+
 
-@lru_cache
 def load_point_chart(resort_slug: str, year: int) -> dict | None:
-    """Load a point chart from JSON file. Returns None if not found."""
-    file_path = CHARTS_DIR / f"{resort_slug}_{year}.json"
-    if not file_path.exists():
-        return None
-    with open(file_path) as f:
-        return json.load(f)
+    """Get a point chart from the catalog. Returns None if not found."""
+    return get_chart_catalog().charts.get((resort_slug, year))
+
+
+def compile_point_chart(chart: dict) -> dict:
+    """Compile a chart dict into dense day-of-year lookup tables.
+
+    The compiled form maps each day of the chart year straight to a season
+    index and holds room x season cost matrices, so nightly lookups need no
+    date parsing or season scanning. Where date ranges overlap, the first
+    season in chart order wins (same as get_season_for_date).
+
+    Returns dict with keys:
+        resort, year: copied from the chart
+        start_ordinal: date.toordinal() of January 1st of the chart year
+        season_names: season names in chart order
+        room_keys: sorted room keys
+        room_index: room_key -> row in the cost matrices
+        day_season: season index per day of the year (-1 if uncovered)
+        weekday_costs, weekend_costs: [room][season] -> points (None if the
+            season does not list the room)
+        cumulative_points: per room, running total of nightly points where
+            entry d is the cost of all nights before day d
+        cumulative_missing: per room, running count of nights with no cost
+    """
+    year = chart["year"]
+    start_ordinal = date(year, 1, 1).toordinal()
+    num_days = date(year, 12, 31).toordinal() - start_ordinal + 1
+
+    seasons = chart["seasons"]
+    room_keys = sorted({key for season in seasons for key in season["rooms"]})
+    room_index = {key: i for i, key in enumerate(room_keys)}
+
+    day_season = [-1] * num_days
+    weekday_costs = [[None] * len(seasons) for _ in room_keys]
+    weekend_costs = [[None] * len(seasons) for _ in room_keys]
+
+    for season_idx, season in enumerate(seasons):
+        for start_str, end_str in season["date_ranges"]:
+            first = max(date.fromisoformat(start_str).toordinal() - start_ordinal, 0)
+            last = min(date.fromisoformat(end_str).toordinal() - start_ordinal, num_days - 1)
+            for day in range(first, last + 1):
+                if day_season[day] == -1:
+                    day_season[day] = season_idx
+        for room_key, room in season["rooms"].items():
+            weekday_costs[room_index[room_key]][season_idx] = room["weekday"]
+            weekend_costs[room_index[room_key]][season_idx] = room["weekend"]
+
+    # Prefix sums over the calendar year so any stay total is two lookups
+    weekend_days = [
+        date.fromordinal(start_ordinal + day).weekday() in (4, 5) for day in range(num_days)
+    ]
+    cumulative_points = []
+    cumulative_missing = []
+    for room_idx in range(len(room_keys)):
+        points = [0] * (num_days + 1)
+        missing = [0] * (num_days + 1)
+        for day, season_idx in enumerate(day_season):
+            costs = weekend_costs if weekend_days[day] else weekday_costs
+            cost = costs[room_idx][season_idx] if season_idx != -1 else None
+            points[day + 1] = points[day] + (cost or 0)
+            missing[day + 1] = missing[day] + (cost is None)
+        cumulative_points.append(points)
+        cumulative_missing.append(missing)
+
+    return {
+        "resort": chart["resort"],
+        "year": year,
+        "start_ordinal": start_ordinal,
+        "season_names": [season["name"] for season in seasons],
+        "room_keys": room_keys,
+        "room_index": room_index,
+        "day_season": day_season,
+        "weekday_costs": weekday_costs,
+        "weekend_costs": weekend_costs,
+        "cumulative_points": cumulative_points,
+        "cumulative_missing": cumulative_missing,
+    }
+
+
+def load_compiled_chart(resort_slug: str, year: int) -> dict | None:
+    """Get a compiled chart from the catalog. Returns None if not found."""
+    return get_chart_catalog().compiled.get((resort_slug, year))
 
 
 def get_available_charts() -> list[dict]:
-    """List all available point chart files with resort and year."""
-    charts = []
-    for f in CHARTS_DIR.glob("*.json"):
-        if f.name == "schema.json":
+    """List all available point charts with resort, year and file name."""
+    return [dict(entry) for entry in get_chart_catalog().entries]
+
+
+def check_chart_coverage(chart: dict) -> list[str]:
+    """Check that every day of the chart year is in exactly one season.
+
+    Returns one message per run of consecutive days with no season (gap) or
+    more than one (overlap); an empty list means full coverage. Date ranges
+    outside the chart year are reported too.
+    """
+    year = chart["year"]
+    first = date(year, 1, 1)
+    num_days = (date(year, 12, 31) - first).days + 1
+    seasons_by_day: list[list[str]] = [[] for _ in range(num_days)]
+    problems = []
+
+    for season in chart["seasons"]:
+        for start_str, end_str in season["date_ranges"]:
+            start = date.fromisoformat(start_str)
+            end = date.fromisoformat(end_str)
+            if start.year != year or end.year != year:
+                problems.append(f"{season['name']} range {start_str}..{end_str} is outside {year}")
+            for day in range(
+                max((start - first).days, 0), min((end - first).days, num_days - 1) + 1
+            ):
+                seasons_by_day[day].append(season["name"])
+
+    day = 0
+    while day < num_days:
+        names = seasons_by_day[day]
+        if len(names) == 1:
+            day += 1
+            continue
+        run_end = day
+        while run_end + 1 < num_days and seasons_by_day[run_end + 1] == names:
+            run_end += 1
+        span = f"{first + timedelta(days=day)}..{first + timedelta(days=run_end)}"
+        if names:
+            problems.append(f"overlap {span} ({', '.join(names)})")
+        else:
+            problems.append(f"gap {span}")
+        day = run_end + 1
+    return problems
+
+
+def build_chart_catalog(charts_dir: Path | None = None) -> ChartCatalog:
+    """Load, compile and check every `{resort}_{year}.json` chart in charts_dir.
+
+    charts_dir defaults to CHARTS_DIR, read at call time.
+
+    Files that can't be read, or whose resort/year don't match the file name,
+    are logged and left out. Coverage problems are logged as warnings; those
+    charts are still published (uncovered nights simply can't be priced).
+    """
+    charts = {}
+    compiled = {}
+    entries = []
+    problems = {}
+    skipped = {}
+    for path in sorted((charts_dir or CHARTS_DIR).glob("*.json")):
+        if path.name == "schema.json":
             continue
-        parts = f.stem.rsplit("_", 1)  # split on last underscore to get year
-        if len(parts) == 2:
-            try:
-                charts.append({"resort": parts[0], "year": int(parts[1]), "file": f.name})
-            except ValueError:
-                continue
-    return sorted(charts, key=lambda c: (c["resort"], c["year"]))
+        parts = path.stem.rsplit("_", 1)  # split on last underscore to get year
+        if len(parts) != 2 or not parts[1].isdigit():
+            continue
+        key = (parts[0], int(parts[1]))
+        try:
+            with open(path) as f:
+                chart = json.load(f)
+            if (chart.get("resort"), chart.get("year")) != key:
+                raise ValueError(f"resort/year {chart.get('resort')}/{chart.get('year')}")
+            compiled_chart = compile_point_chart(chart)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.error("Skipping point chart %s: %s", path.name, exc)
+            skipped[path.name] = str(exc)
+            continue
+
+        chart_problems = check_chart_coverage(chart)
+        for problem in chart_problems:
+            logger.warning("Point chart %s: %s", path.name, problem)
+        if chart_problems:
+            problems[key] = tuple(chart_problems)
+        charts[key] = chart
+        compiled[key] = compiled_chart
+        entries.append({"resort": key[0], "year": key[1], "file": path.name})
+
+    entries.sort(key=lambda c: (c["resort"], c["year"]))
+    return ChartCatalog(
+        version=next(_catalog_versions),
+        charts=MappingProxyType(charts),
+        compiled=MappingProxyType(compiled),
+        entries=tuple(entries),
+        problems=MappingProxyType(problems),
+        skipped=MappingProxyType(skipped),
+    )
+
+
+def _chart_sources(charts_dir: Path) -> dict[str, list[int]]:
+    """Size and mtime (ns) of every chart JSON file, to tell whether an artifact is current."""
+    sources = {}
+    for path in sorted(charts_dir.glob("*.json")):
+        if path.name != "schema.json":
+            stat = path.stat()
+            sources[path.name] = [stat.st_size, stat.st_mtime_ns]
+    return sources
+
+
+def write_chart_artifact(
+    catalog: ChartCatalog, charts_dir: Path | None = None, path: Path | None = None
+) -> Path:
+    """Write a catalog built from charts_dir as one binary file for read_chart_artifact().
+
+    Layout: magic, metadata length (8 bytes, little-endian), JSON metadata
+    (the raw charts, season/room keys, problems, skipped files, source file
+    stats and array offsets), then 8-byte aligned native-order arrays per
+    chart: day_season (int16 per day), weekday and weekend cost matrices
+    (int32 room x season, -1 where the season doesn't list the room) and the
+    cumulative points and missing-night sums (int32 room x day).
+
+    The file is written next to path and renamed into place, so servers that
+    have the old one mapped keep reading it intact.
+    """
+    charts_dir = charts_dir or CHARTS_DIR
+    path = path or charts_dir / ARTIFACT_NAME
+    data = bytearray()
+
+    def put(values: Iterable[int], typecode: str) -> int:
+        data.extend(bytes(-len(data) % 8))
+        offset = len(data)
+        data.extend(array(typecode, values).tobytes())
+        return offset
+
+    charts_meta = []
+    for entry in catalog.entries:
+        key = (entry["resort"], entry["year"])
+        compiled = catalog.compiled[key]
+        charts_meta.append(
+            {
+                **entry,
+                "chart": catalog.charts[key],
+                "start_ordinal": compiled["start_ordinal"],
+                "season_names": list(compiled["season_names"]),
+                "room_keys": list(compiled["room_keys"]),
+                "num_days": len(compiled["day_season"]),
+                "problems": list(catalog.problems.get(key, ())),
+                "day_season": put(compiled["day_season"], "h"),
+                "weekday_costs": put(
+                    (-1 if c is None else c for row in compiled["weekday_costs"] for c in row), "i"
+                ),
+                "weekend_costs": put(
+                    (-1 if c is None else c for row in compiled["weekend_costs"] for c in row), "i"
+                ),
+                "cumulative_points": put(itertools.chain(*compiled["cumulative_points"]), "i"),
+                "cumulative_missing": put(itertools.chain(*compiled["cumulative_missing"]), "i"),
+            }
+        )
+
+    meta = json.dumps(
+        {
+            "format": _ARTIFACT_FORMAT,
+            "byteorder": sys.byteorder,
+            "sources": _chart_sources(charts_dir),
+            "skipped": dict(catalog.skipped),
+            "charts": charts_meta,
+        }
+    ).encode()
+    header = _ARTIFACT_MAGIC + len(meta).to_bytes(8, "little") + meta
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header + bytes(-len(header) % 8))
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _map_array(data: memoryview, offset: int, count: int, typecode: str) -> memoryview:
+    """Zero-copy view of count typecode items at offset."""
+    view = data[offset : offset + count * struct.calcsize(typecode)].cast(typecode)
+    if len(view) != count:
+        raise ValueError("truncated")
+    return view
+
+
+def _map_compiled_chart(data: memoryview, chart: dict) -> dict:
+    """A compile_point_chart()-shaped dict over the arrays of one artifact chart.
+
+    The cost matrices are small and decoded to lists (None for -1); the
+    per-day arrays stay views of the mapped file.
+    """
+    rooms = len(chart["room_keys"])
+    seasons = len(chart["season_names"])
+    days = chart["num_days"] + 1
+
+    def costs(name: str) -> list[list[int | None]]:
+        flat = _map_array(data, chart[name], rooms * seasons, "i").tolist()
+        return [
+            [None if c < 0 else c for c in flat[r * seasons : (r + 1) * seasons]]
+            for r in range(rooms)
+        ]
+
+    def per_room(name: str) -> list[memoryview]:
+        flat = _map_array(data, chart[name], rooms * days, "i")
+        return [flat[r * days : (r + 1) * days] for r in range(rooms)]
+
+    return {
+        "resort": chart["resort"],
+        "year": chart["year"],
+        "start_ordinal": chart["start_ordinal"],
+        "season_names": chart["season_names"],
+        "room_keys": chart["room_keys"],
+        "room_index": {key: i for i, key in enumerate(chart["room_keys"])},
+        "day_season": _map_array(data, chart["day_season"], chart["num_days"], "h"),
+        "weekday_costs": costs("weekday_costs"),
+        "weekend_costs": costs("weekend_costs"),
+        "cumulative_points": per_room("cumulative_points"),
+        "cumulative_missing": per_room("cumulative_missing"),
+    }
+
+
+def read_chart_artifact(
+    charts_dir: Path | None = None, path: Path | None = None
+) -> ChartCatalog | None:
+    """Map the chart artifact of charts_dir into a catalog without parsing chart JSON.
+
+    The file is mapped read-only, so every server process shares its pages.
+    The raw charts are read from its metadata, so charts and compiled always
+    describe the same build even if a chart file is edited afterwards.
+    Returns None (callers then build from JSON) if there is no artifact, or it
+    can't be read, was written on another platform or is stale: a chart file
+    was added, removed or changed since it was written.
+    """
+    charts_dir = charts_dir or CHARTS_DIR
+    path = path or charts_dir / ARTIFACT_NAME
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:8] != _ARTIFACT_MAGIC:
+            raise ValueError("not a chart artifact")
+        meta_end = 16 + int.from_bytes(buffer[8:16], "little")
+        meta = json.loads(buffer[16:meta_end])
+        if meta["format"] != _ARTIFACT_FORMAT or meta["byteorder"] != sys.byteorder:
+            raise ValueError("written by another version or platform")
+        if meta["sources"] != _chart_sources(charts_dir):
+            logger.info("Point chart artifact %s is out of date; loading chart JSON", path.name)
+            return None
+
+        data = memoryview(buffer)[meta_end + (-meta_end % 8) :]
+        charts = {}
+        compiled = {}
+        entries = []
+        problems = {}
+        for chart in meta["charts"]:
+            key = (chart["resort"], chart["year"])
+            charts[key] = chart["chart"]
+            compiled[key] = _map_compiled_chart(data, chart)
+            entries.append({"resort": key[0], "year": key[1], "file": chart["file"]})
+            if chart["problems"]:
+                problems[key] = tuple(chart["problems"])
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Ignoring point chart artifact %s: %s", path.name, exc)
+        return None
+
+    return ChartCatalog(
+        version=next(_catalog_versions),
+        charts=MappingProxyType(charts),
+        compiled=MappingProxyType(compiled),
+        entries=tuple(entries),
+        problems=MappingProxyType(problems),
+        skipped=MappingProxyType(meta["skipped"]),
+        artifact=path,
+    )
+
+
+def open_chart_catalog(charts_dir: Path | None = None) -> ChartCatalog:
+    """Map charts_dir's chart artifact if it is current, else build the catalog from JSON."""
+    return read_chart_artifact(charts_dir) or build_chart_catalog(charts_dir)
+
+
+def publish_chart_catalog(catalog: ChartCatalog) -> None:
+    """Make catalog the one every chart lookup uses (a single reference swap)."""
+    global _catalog
+    _catalog = catalog
+
+
+def load_chart_catalog(
+    charts_dir: Path | None = None, write_artifact: bool = False
+) -> ChartCatalog:
+    """Open the chart catalog and publish it. Called from the app lifespan.
+
+    With write_artifact, a missing or stale artifact is written from the JSON
+    build and mapped, so other processes (simulation workers) can map it too
+    instead of each parsing the chart JSON.
+    """
+    catalog = open_chart_catalog(charts_dir)
+    if write_artifact and catalog.artifact is None:
+        try:
+            write_chart_artifact(catalog, charts_dir)
+        except OSError as exc:
+            logger.warning("Could not write point chart artifact: %s", exc)
+        else:
+            catalog = read_chart_artifact(charts_dir) or catalog
+    publish_chart_catalog(catalog)
+    return catalog
+
+
+def get_chart_catalog() -> ChartCatalog:
+    """The published chart catalog, built on first use if the app hasn't loaded it yet."""
+    if _catalog is None:
+        return load_chart_catalog()
+    return _catalog
 
 
 def get_season_for_date(chart: dict, target_date: date) -> dict | None:
@@ -64,6 +486,39 @@ def get_point_cost(chart: dict, room_key: str, target_date: date) -> int | None:
     return room["weekend"] if is_weekend else room["weekday"]
 
 
+def _lookup_night(
+    compiled: dict, room_key: str, target_date: date, weekend: bool | None = None
+) -> tuple[int, int] | None:
+    """Return (season index, point cost) for one night from a compiled chart."""
+    day = target_date.toordinal() - compiled["start_ordinal"]
+    if day < 0 or day >= len(compiled["day_season"]):
+        return None
+    season_idx = compiled["day_season"][day]
+    room_idx = compiled["room_index"].get(room_key)
+    if season_idx == -1 or room_idx is None:
+        return None
+    if weekend is None:
+        weekend = target_date.weekday() in (4, 5)
+    costs = compiled["weekend_costs"] if weekend else compiled["weekday_costs"]
+    cost = costs[room_idx][season_idx]
+    if cost is None:
+        return None
+    return season_idx, cost
+
+
+def get_compiled_point_cost(
+    compiled: dict, room_key: str, target_date: date, weekend: bool | None = None
+) -> int | None:
+    """Get the point cost for a room on a date from a compiled chart in O(1).
+
+    Same result as get_point_cost() on the source chart dict. weekend picks
+    the weekend or weekday rate instead of target_date's own weekday (used to
+    price a date of another year with that chart's seasons).
+    """
+    night = _lookup_night(compiled, room_key, target_date, weekend)
+    return night[1] if night else None
+
+
 def calculate_stay_cost(
     resort_slug: str, room_key: str, check_in: date, check_out: date
 ) -> dict | None:
@@ -72,8 +527,8 @@ def calculate_stay_cost(
     Returns dict with per-night breakdown and total, or None if chart not found.
     """
     year = check_in.year
-    chart = load_point_chart(resort_slug, year)
-    if chart is None:
+    compiled = load_compiled_chart(resort_slug, year)
+    if compiled is None:
         return None
 
     nights = []
@@ -81,20 +536,20 @@ def calculate_stay_cost(
     current = check_in
     while current < check_out:
         # Try current year's chart first
-        current_chart = load_point_chart(resort_slug, current.year)
-        if current_chart is None:
-            current_chart = chart
+        current_compiled = load_compiled_chart(resort_slug, current.year)
+        if current_compiled is None:
+            current_compiled = compiled
 
-        cost = get_point_cost(current_chart, room_key, current)
-        if cost is None:
+        night = _lookup_night(current_compiled, room_key, current)
+        if night is None:
             return None  # missing data
 
-        season = get_season_for_date(current_chart, current)
+        season_idx, cost = night
         nights.append(
             {
                 "date": current.isoformat(),
                 "day_of_week": current.strftime("%A"),
-                "season": season["name"] if season else "Unknown",
+                "season": current_compiled["season_names"][season_idx],
                 "is_weekend": current.weekday() in (4, 5),
                 "points": cost,
             }
@@ -111,3 +566,54 @@ def calculate_stay_cost(
         "total_points": total,
         "nightly_breakdown": nights,
     }
+
+
+def calculate_stay_total(
+    resort_slug: str, room_key: str, check_in: date, check_out: date
+) -> int | None:
+    """Calculate total point cost for a stay without a nightly breakdown.
+
+    Uses the compiled per-room cumulative sums, so each calendar year the
+    stay touches costs two array lookups. Returns None wherever
+    calculate_stay_cost would (missing chart, room, or night).
+    """
+    if load_compiled_chart(resort_slug, check_in.year) is None:
+        return None
+
+    total = 0
+    start = check_in
+    while start < check_out:
+        compiled = load_compiled_chart(resort_slug, start.year)
+        if compiled is None:
+            return None
+        room_idx = compiled["room_index"].get(room_key)
+        if room_idx is None:
+            return None
+
+        # Price the part of the stay that falls in this chart's year
+        end = min(check_out, date(start.year + 1, 1, 1))
+        first = start.toordinal() - compiled["start_ordinal"]
+        last = end.toordinal() - compiled["start_ordinal"]
+        missing = compiled["cumulative_missing"][room_idx]
+        if missing[last] != missing[first]:
+            return None
+        points = compiled["cumulative_points"][room_idx]
+        total += points[last] - points[first]
+        start = end
+
+    return total
+
+
+def get_nightly_costs(resort_slug: str, room_key: str, start: date, end: date) -> list[int | None]:
+    """Return the point cost of each night from start up to (not including) end.
+
+    Nights without chart data (missing year, room, or season) are None.
+    """
+    costs: list[int | None] = []
+    current = start
+    while current < end:
+        compiled = load_compiled_chart(resort_slug, current.year)
+        night = _lookup_night(compiled, room_key, current) if compiled else None
+        costs.append(night[1] if night else None)
+        current += timedelta(days=1)
+    return costs
@@ -1,27 +1,97 @@
 import json
-from functools import lru_cache
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 
 RESORTS_FILE = Path(__file__).parent.parent.parent / "data" / "resorts.json"
 
 
-@lru_cache
-def load_resorts() -> list[dict]:
-    with open(RESORTS_FILE) as f:
+@dataclass(frozen=True)
+class ResortRegistry:
+    """Resort data indexed once, so lookups and membership checks are O(1).
+
+    Slug tuples keep resorts.json order; the frozensets are for membership.
+    """
+
+    resorts: tuple[dict, ...]
+    by_slug: Mapping[str, dict]
+    slugs: tuple[str, ...]
+    restricted_slugs: tuple[str, ...]
+    original_slugs: tuple[str, ...]
+    slug_set: frozenset[str]
+    restricted: frozenset[str]
+    original: frozenset[str]
+
+
+# Published by load_resort_registry(); read through get_resort_registry()
+_registry: ResortRegistry | None = None
+
+
+def read_resorts(path: Path | None = None) -> list[dict]:
+    with open(path or RESORTS_FILE) as f:
         return json.load(f)
 
 
+def load_resorts() -> list[dict]:
+    return list(get_resort_registry().resorts)
+
+
+def build_resort_registry(resorts: list[dict]) -> ResortRegistry:
+    slugs = tuple(r["slug"] for r in resorts)
+    restricted_slugs = tuple(r["slug"] for r in resorts if r["restricted"])
+    original_slugs = tuple(r["slug"] for r in resorts if not r["restricted"])
+    return ResortRegistry(
+        resorts=tuple(resorts),
+        by_slug=MappingProxyType({r["slug"]: r for r in resorts}),
+        slugs=slugs,
+        restricted_slugs=restricted_slugs,
+        original_slugs=original_slugs,
+        slug_set=frozenset(slugs),
+        restricted=frozenset(restricted_slugs),
+        original=frozenset(original_slugs),
+    )
+
+
+def publish_resort_registry(registry: ResortRegistry) -> None:
+    """Make registry the one every lookup uses (a single reference swap)."""
+    global _registry
+    _registry = registry
+
+
+def load_resort_registry(path: Path | None = None) -> ResortRegistry:
+    """Read resorts.json, index it and publish the registry. Called from the app lifespan."""
+    registry = build_resort_registry(read_resorts(path))
+    publish_resort_registry(registry)
+    return registry
+
+
+def get_resort_registry() -> ResortRegistry:
+    """The published registry, built on first use if the app hasn't loaded it yet."""
+    if _registry is None:
+        return load_resort_registry()
+    return _registry
+
+
+def get_resorts_by_slug() -> Mapping[str, dict]:
+    return get_resort_registry().by_slug
+
+
 def get_resort_by_slug(slug: str) -> dict | None:
-    return next((r for r in load_resorts() if r["slug"] == slug), None)
+    return get_resort_registry().by_slug.get(slug)
+
+
+def is_resort_slug(slug: str) -> bool:
+    return slug in get_resort_registry().slug_set
 
 
 def get_resort_slugs() -> list[str]:
-    return [r["slug"] for r in load_resorts()]
+    return list(get_resort_registry().slugs)
 
 
 def get_restricted_resort_slugs() -> list[str]:
-    return [r["slug"] for r in load_resorts() if r["restricted"]]
+    return list(get_resort_registry().restricted_slugs)
 
 
 def get_original_resort_slugs() -> list[str]:
-    return [r["slug"] for r in load_resorts() if not r["restricted"]]
+    return list(get_resort_registry().original_slugs)
@@ -1,11 +1,64 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
-from backend.config import get_settings
+from backend.config import Settings, get_settings
 
 DATABASE_URL = get_settings().database_url
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+
+def sqlite_pragmas(settings: Settings) -> list[tuple[str, str | int]]:
+    """PRAGMAs for the SQLite performance profile, in the order they are applied."""
+    return [
+        ("journal_mode", settings.sqlite_journal_mode),
+        ("synchronous", settings.sqlite_synchronous),
+        ("busy_timeout", settings.sqlite_busy_timeout_ms),
+        # Negative cache_size is in KiB rather than pages
+        ("cache_size", -settings.sqlite_cache_size_kib),
+        ("mmap_size", settings.sqlite_mmap_size_mb * 1024 * 1024),
+        ("temp_store", settings.sqlite_temp_store),
+    ]
+
+
+def create_engine(database_url: str, settings: Settings) -> AsyncEngine:
+    """
+    Create the async engine, applying the SQLite profile from settings.
+
+    File-backed SQLite databases get WAL journaling so readers don't block
+    on a writer, plus cache/mmap tuning and a bounded connection pool.
+    In-memory databases use a single shared connection and get no pool args.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(database_url, echo=False)
+
+    is_file_db = url.database not in (None, "", ":memory:")
+    pool_args = (
+        {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow}
+        if is_file_db
+        else {}
+    )
+    new_engine = create_async_engine(database_url, echo=False, **pool_args)
+
+    pragmas = sqlite_pragmas(settings)
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return new_engine
+
+
+engine = create_engine(DATABASE_URL, get_settings())
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
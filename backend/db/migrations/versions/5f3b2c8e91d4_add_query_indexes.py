@@ -0,0 +1,44 @@
+"""add_query_indexes
+
+Revision ID: 5f3b2c8e91d4
+Revises: ac1df6fa81e8
+Create Date: 2026-10-17 10:12:40.118204
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f3b2c8e91d4"
+down_revision: str | None = "ac1df6fa81e8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "uq_point_balances_contract_use_year_type",
+        "point_balances",
+        ["contract_id", "use_year", "allocation_type"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_reservations_contract_id_check_in",
+        "reservations",
+        ["contract_id", "check_in"],
+    )
+    op.create_index(
+        "ix_reservations_status_check_in",
+        "reservations",
+        ["status", "check_in"],
+    )
+    op.create_index("ix_reservations_check_in", "reservations", ["check_in"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reservations_check_in", table_name="reservations")
+    op.drop_index("ix_reservations_status_check_in", table_name="reservations")
+    op.drop_index("ix_reservations_contract_id_check_in", table_name="reservations")
+    op.drop_index("uq_point_balances_contract_use_year_type", table_name="point_balances")
@@ -0,0 +1,99 @@
+"""In-process snapshot of the portfolio: contracts, point balances and active reservations.
+
+Read-heavy routers (availability, trip explorer, scenarios, booking windows)
+all need the same three tables as plain dicts for the engine. The snapshot
+is loaded once and reused until a router commits a write to one of those
+tables and calls invalidate_portfolio().
+
+The cache lives in this process only. Run a single server process (the
+default), or set PORTFOLIO_CACHE_ENABLED=false when running several workers.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.models.contract import Contract
+from backend.models.point_balance import PointBalance
+from backend.models.reservation import Reservation
+
+_cache: dict = {"version": 0, "snapshot": None}
+
+
+def invalidate_portfolio() -> None:
+    """Drop the cached snapshot. Call after committing a portfolio write."""
+    _cache["version"] += 1
+    _cache["snapshot"] = None
+
+
+async def load_portfolio(db: AsyncSession) -> dict:
+    """
+    Return the portfolio snapshot, loading it from the database if stale.
+
+    Returns:
+        Dict with keys:
+            version: invalidation counter the snapshot was loaded at
+            contracts: tuple of dicts (id, name, home_resort, use_year_month,
+                annual_points, purchase_type)
+            balances: tuple of dicts (contract_id, use_year, allocation_type, points)
+            reservations: tuple of non-cancelled reservation dicts (id, contract_id,
+                resort, room_key, check_in, check_out, points_cost, status)
+        The dicts are shared between requests and must not be mutated.
+    """
+    snapshot = _cache["snapshot"]
+    # A snapshot is tied to the engine it was read from (tests swap engines)
+    if snapshot is not None and snapshot["bind"] is db.bind:
+        return snapshot
+
+    version = _cache["version"]
+
+    result = await db.execute(select(Contract))
+    contracts = tuple(
+        {
+            "id": c.id,
+            "name": c.name,
+            "home_resort": c.home_resort,
+            "use_year_month": c.use_year_month,
+            "annual_points": c.annual_points,
+            "purchase_type": c.purchase_type,
+        }
+        for c in result.scalars()
+    )
+
+    result = await db.execute(select(PointBalance))
+    balances = tuple(
+        {
+            "contract_id": b.contract_id,
+            "use_year": b.use_year,
+            "allocation_type": b.allocation_type,
+            "points": b.points,
+        }
+        for b in result.scalars()
+    )
+
+    result = await db.execute(select(Reservation).where(Reservation.status != "cancelled"))
+    reservations = tuple(
+        {
+            "id": r.id,
+            "contract_id": r.contract_id,
+            "resort": r.resort,
+            "room_key": r.room_key,
+            "check_in": r.check_in,
+            "check_out": r.check_out,
+            "points_cost": r.points_cost,
+            "status": r.status,
+        }
+        for r in result.scalars()
+    )
+
+    snapshot = {
+        "version": version,
+        "bind": db.bind,
+        "contracts": contracts,
+        "balances": balances,
+        "reservations": reservations,
+    }
+    # Only publish if no write landed while we were reading
+    if get_settings().portfolio_cache_enabled and _cache["version"] == version:
+        _cache["snapshot"] = snapshot
+    return snapshot
@@ -0,0 +1,19 @@
+"""Bulk reservation writes."""
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.portfolio import invalidate_portfolio
+from backend.models.reservation import Reservation
+
+
+async def insert_reservations(db: AsyncSession, rows: list[dict]) -> None:
+    """
+    Insert already-validated reservation rows with one executemany INSERT.
+
+    Commits the session and drops the cached portfolio so the next read
+    sees the new reservations.
+    """
+    await db.execute(insert(Reservation), rows)
+    await db.commit()
+    invalidate_portfolio()
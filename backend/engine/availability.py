@@ -1,5 +1,11 @@
+from collections.abc import Iterable, Iterator
 from datetime import date
 
+from backend.engine.contract_index import (
+    build_contract_index,
+    get_committed_points,
+    get_contract_entry,
+)
 from backend.engine.use_year import (
     get_banking_deadline,
     get_current_use_year,
@@ -16,6 +22,7 @@ def get_contract_availability(
     point_balances: list[dict],
     reservations: list[dict],
     target_date: date,
+    contract_entry: dict | None = None,
 ) -> dict:
     """
     Calculate point availability for a single contract on a target date.
@@ -27,6 +34,9 @@ def get_contract_availability(
         point_balances: List of dicts with keys: use_year, allocation_type, points
         reservations: List of dicts with keys: check_in (date), points_cost (int), status (str)
         target_date: The date to calculate availability for
+        contract_entry: Optional entry from build_contract_index() for this contract's
+            reservations. When given, committed points are found by bisecting its
+            sorted check-in ordinals instead of scanning `reservations`.
 
     Returns:
         Dict with per-use-year breakdown, committed points, and available total.
@@ -50,17 +60,22 @@ def get_contract_availability(
 
     # Sum reservations committed against this use year
     # A reservation deducts from a use year if its check_in falls within the UY range
-    committed_points = 0
-    committed_reservations = []
-    for r in reservations:
-        check_in = (
-            r["check_in"] if isinstance(r["check_in"], date) else date.fromisoformat(r["check_in"])
-        )
-        if r.get("status", "confirmed") == "cancelled":
-            continue
-        if uy_start <= check_in <= uy_end:
-            committed_points += r["points_cost"]
-            committed_reservations.append(r)
+    if contract_entry is not None:
+        committed_points, committed_count = get_committed_points(contract_entry, uy_start, uy_end)
+    else:
+        committed_points = 0
+        committed_count = 0
+        for r in reservations:
+            check_in = (
+                r["check_in"]
+                if isinstance(r["check_in"], date)
+                else date.fromisoformat(r["check_in"])
+            )
+            if r.get("status", "confirmed") == "cancelled":
+                continue
+            if uy_start <= check_in <= uy_end:
+                committed_points += r["points_cost"]
+                committed_count += 1
 
     available_points = max(0, total_points - committed_points)
 
@@ -77,7 +92,7 @@ def get_contract_availability(
         "balances": balances_by_type,
         "total_points": total_points,
         "committed_points": committed_points,
-        "committed_reservation_count": len(committed_reservations),
+        "committed_reservation_count": committed_count,
         "available_points": available_points,
     }
 
@@ -100,23 +115,70 @@ def get_all_contracts_availability(
     Returns:
         Dict with per-contract breakdowns and grand total.
     """
+    index = build_contract_index(point_balances, reservations)
+    return _availability_from_index(contracts, index, target_date)
+
+
+def get_availability_for_dates(
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    target_dates: list[date],
+) -> dict:
+    """
+    Calculate availability across all contracts for many target dates in one pass.
+
+    The per-contract index is built once and shared by every date, so the
+    cost per extra date is just the per-contract use year lookups.
+
+    Returns:
+        Dict with the requested dates and one get_all_contracts_availability()
+        result per date, in the same order.
+    """
+    index = build_contract_index(point_balances, reservations)
+    return {
+        "dates": [d.isoformat() for d in target_dates],
+        "results": [_availability_from_index(contracts, index, d) for d in target_dates],
+    }
+
+
+def iter_availability_for_dates(
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    target_dates: Iterable[date],
+) -> Iterator[dict]:
+    """
+    Yield get_all_contracts_availability() for each target date, one at a time.
+
+    Same results as get_availability_for_dates(), but nothing is kept between
+    dates, so a range of any length takes constant memory.
+    """
+    index = build_contract_index(point_balances, reservations)
+    for target_date in target_dates:
+        yield _availability_from_index(contracts, index, target_date)
+
+
+def _availability_from_index(
+    contracts: list[dict], index: dict[int, dict], target_date: date
+) -> dict:
+    """Availability for all contracts on one date from a prebuilt contract index."""
     contract_results = []
     grand_total_points = 0
     grand_committed = 0
     grand_available = 0
 
     for c in contracts:
-        # Filter balances and reservations for this contract
-        c_balances = [b for b in point_balances if b["contract_id"] == c["id"]]
-        c_reservations = [r for r in reservations if r["contract_id"] == c["id"]]
+        entry = get_contract_entry(index, c["id"])
 
         result = get_contract_availability(
             contract_id=c["id"],
             use_year_month=c["use_year_month"],
             annual_points=c["annual_points"],
-            point_balances=c_balances,
-            reservations=c_reservations,
+            point_balances=entry["balances"],
+            reservations=entry["reservations"],
             target_date=target_date,
+            contract_entry=entry,
         )
 
         # Enrich with contract metadata
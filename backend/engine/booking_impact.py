@@ -2,6 +2,7 @@ from datetime import date
 
 from backend.data.point_charts import calculate_stay_cost
 from backend.engine.availability import get_contract_availability
+from backend.engine.contract_index import build_contract_index, get_contract_entry
 
 
 def compute_booking_impact(
@@ -31,8 +32,9 @@ def compute_booking_impact(
         If point chart data is not available, returns dict with "error" key.
     """
     # Filter to only this contract's data
-    contract_balances = [b for b in point_balances if b["contract_id"] == contract["id"]]
-    contract_reservations = [r for r in reservations if r["contract_id"] == contract["id"]]
+    entry = get_contract_entry(build_contract_index(point_balances, reservations), contract["id"])
+    contract_balances = entry["balances"]
+    contract_reservations = entry["reservations"]
 
     # "Before" state
     before = get_contract_availability(
@@ -42,6 +44,7 @@ def compute_booking_impact(
         point_balances=contract_balances,
         reservations=contract_reservations,
         target_date=proposed_check_in,
+        contract_entry=entry,
     )
 
     # Calculate stay cost (nightly breakdown)
@@ -1,7 +1,15 @@
-from datetime import date
+from datetime import date, timedelta
+from functools import lru_cache
 
 from dateutil.relativedelta import relativedelta
 
+from backend.data.point_charts import calculate_stay_total, load_compiled_chart
+from backend.data.resorts import get_resorts_by_slug
+from backend.engine.eligibility import get_eligible_resorts
+
+HOME_RESORT_WINDOW_MONTHS = 11
+ANY_RESORT_WINDOW_MONTHS = 7
+
 
 def _dvc_subtract_months(check_in: date, months: int) -> date:
     """
@@ -47,3 +55,184 @@ def compute_booking_windows(check_in: date, is_home_resort: bool) -> dict:
         "days_until_any_window": (any_resort_window_date - today).days,
         "is_home_resort": is_home_resort,
     }
+
+
+@lru_cache(maxsize=16)
+def get_window_open_table(year: int) -> tuple[tuple[date, date], ...]:
+    """
+    Home resort and any-resort window open dates for every check-in day of a year.
+
+    Entry i is for the check-in on day i of the year (January 1st is 0), so a
+    lookup is one index instead of two _dvc_subtract_months() calls.
+    """
+    start = date(year, 1, 1).toordinal()
+    num_days = date(year, 12, 31).toordinal() - start + 1
+    table = []
+    for ordinal in range(start, start + num_days):
+        check_in = date.fromordinal(ordinal)
+        table.append(
+            (
+                _dvc_subtract_months(check_in, HOME_RESORT_WINDOW_MONTHS),
+                _dvc_subtract_months(check_in, ANY_RESORT_WINDOW_MONTHS),
+            )
+        )
+    return tuple(table)
+
+
+def get_window_open_dates(check_in: date) -> tuple[date, date]:
+    """(home resort window, any-resort window) open dates for a check-in, from the table."""
+    return get_window_open_table(check_in.year)[check_in.timetuple().tm_yday - 1]
+
+
+@lru_cache(maxsize=16)
+def get_window_reverse_table(year: int) -> dict[date, tuple[tuple[date, ...], tuple[date, ...]]]:
+    """
+    Check-in dates of a year keyed by the date their windows open.
+
+    Built from get_window_open_table(). Values are (check-ins whose home resort
+    window opens that day, check-ins whose any-resort window opens that day);
+    the roll-forward rule can put several check-ins on the 1st of a month.
+    """
+    home: dict[date, list[date]] = {}
+    any_resort: dict[date, list[date]] = {}
+    first = date(year, 1, 1)
+    for day, (home_window, any_window) in enumerate(get_window_open_table(year)):
+        check_in = first + timedelta(days=day)
+        home.setdefault(home_window, []).append(check_in)
+        any_resort.setdefault(any_window, []).append(check_in)
+    return {
+        open_date: (tuple(home.get(open_date, ())), tuple(any_resort.get(open_date, ())))
+        for open_date in home.keys() | any_resort.keys()
+    }
+
+
+def get_check_ins_opening_on(open_date: date) -> tuple[list[date], list[date]]:
+    """
+    (home resort, any-resort) check-in dates whose windows open on open_date.
+
+    Windows open 7 to 11 months ahead, so the check-ins fall in open_date's
+    year or the next; each is one lookup in that year's reverse table.
+    """
+    home: list[date] = []
+    any_resort: list[date] = []
+    for year in (open_date.year, open_date.year + 1):
+        home_check_ins, any_check_ins = get_window_reverse_table(year).get(open_date, ((), ()))
+        home.extend(home_check_ins)
+        any_resort.extend(any_check_ins)
+    return home, any_resort
+
+
+def find_stays_opening_on(contracts: list[dict], open_date: date, nights: int) -> dict:
+    """
+    Stays that become bookable on open_date, priced for each resort that can book them.
+
+    Home resort (11-month) check-ins are listed at each contract's home
+    resort; any-resort (7-month) check-ins at every resort a contract is
+    eligible for. Resorts without chart data for the stay are left out.
+
+    Returns:
+        Dict with date, nights, home_resort_check_ins, any_resort_check_ins
+        and stays (window_type, check_in, check_out, resort, resort_name,
+        contract_ids that can book it, and rooms priced by total_points).
+    """
+    home_check_ins, any_check_ins = get_check_ins_opening_on(open_date)
+    resorts_by_slug = get_resorts_by_slug()
+
+    # resort -> contracts that can book it, per window
+    home_resorts: dict[str, list[int]] = {}
+    any_resorts: dict[str, list[int]] = {}
+    for contract in contracts:
+        home_resorts.setdefault(contract["home_resort"], []).append(contract["id"])
+        for slug in get_eligible_resorts(contract["home_resort"], contract["purchase_type"]):
+            any_resorts.setdefault(slug, []).append(contract["id"])
+
+    stays = []
+    for window_type, check_ins, resorts in (
+        ("home_resort", home_check_ins, home_resorts),
+        ("any_resort", any_check_ins, any_resorts),
+    ):
+        for check_in in check_ins:
+            check_out = check_in + timedelta(days=nights)
+            for slug in sorted(resorts):
+                compiled = load_compiled_chart(slug, check_in.year)
+                if compiled is None:
+                    continue
+                rooms = []
+                for room_key in compiled["room_keys"]:
+                    total_points = calculate_stay_total(slug, room_key, check_in, check_out)
+                    if total_points is not None:
+                        rooms.append({"room_key": room_key, "total_points": total_points})
+                if not rooms:
+                    continue
+                rooms.sort(key=lambda r: (r["total_points"], r["room_key"]))
+                resort = resorts_by_slug.get(slug)
+                stays.append(
+                    {
+                        "window_type": window_type,
+                        "check_in": check_in.isoformat(),
+                        "check_out": check_out.isoformat(),
+                        "resort": slug,
+                        "resort_name": resort["name"] if resort else slug,
+                        "contract_ids": resorts[slug],
+                        "rooms": rooms,
+                    }
+                )
+
+    return {
+        "date": open_date.isoformat(),
+        "nights": nights,
+        "home_resort_check_ins": [d.isoformat() for d in home_check_ins],
+        "any_resort_check_ins": [d.isoformat() for d in any_check_ins],
+        "stays": stays,
+    }
+
+
+def build_booking_window_calendar(
+    contracts: list[dict],
+    reservations: list[dict],
+    resorts_by_slug: dict[str, dict],
+    start: date,
+    end: date,
+    today: date,
+) -> list[dict]:
+    """
+    Every booking window opening between start and end (inclusive) for the reservations.
+
+    Home resort (11-month) windows are listed for reservations at the
+    contract's home resort; any-resort (7-month) windows for all of them.
+
+    Returns:
+        Window dicts sorted by window date, then check-in and contract
+    """
+    contracts_by_id = {c["id"]: c for c in contracts}
+    windows = []
+    for res in reservations:
+        contract = contracts_by_id.get(res["contract_id"])
+        # A window opens before check-in, so earlier check-ins can't have one in range
+        if contract is None or res["check_in"] <= start:
+            continue
+
+        home_window, any_window = get_window_open_dates(res["check_in"])
+        is_home_resort = contract["home_resort"] == res["resort"]
+        resort = resorts_by_slug.get(res["resort"])
+        for window_type, window_date in (("home_resort", home_window), ("any_resort", any_window)):
+            if window_type == "home_resort" and not is_home_resort:
+                continue
+            if not start <= window_date <= end:
+                continue
+            windows.append(
+                {
+                    "reservation_id": res["id"],
+                    "contract_id": contract["id"],
+                    "contract_name": contract["name"] or f"Contract #{contract['id']}",
+                    "resort": res["resort"],
+                    "resort_name": resort["name"] if resort else res["resort"],
+                    "check_in": res["check_in"].isoformat(),
+                    "window_type": window_type,
+                    "window_date": window_date.isoformat(),
+                    "days_until_open": (window_date - today).days,
+                }
+            )
+
+    windows.sort(key=lambda w: (w["window_date"], w["check_in"], w["contract_id"]))
+    return windows
@@ -0,0 +1,76 @@
+"""Per-contract index over point balances and reservations.
+
+Engines that loop over contracts group the flat balance and reservation
+lists once with build_contract_index() instead of re-filtering both lists
+inside the loop, which keeps them linear in the number of rows.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+
+def _check_in_date(reservation: dict) -> date:
+    check_in = reservation["check_in"]
+    return check_in if isinstance(check_in, date) else date.fromisoformat(check_in)
+
+
+def _empty_entry() -> dict:
+    return {
+        "balances": [],
+        "reservations": [],
+        "check_in_ordinals": [],
+        "cumulative_points": [0],
+    }
+
+
+def build_contract_index(point_balances: list[dict], reservations: list[dict]) -> dict[int, dict]:
+    """
+    Bucket balances and reservations by contract in one pass over each list.
+
+    Args:
+        point_balances: List of dicts with contract_id, use_year, allocation_type, points
+        reservations: List of dicts with contract_id, check_in (date or ISO string),
+                      points_cost, status
+
+    Returns:
+        Dict of contract_id -> entry with keys:
+            balances: the contract's balance dicts
+            reservations: the contract's reservation dicts sorted by check_in
+            check_in_ordinals: sorted check_in ordinals of non-cancelled reservations
+            cumulative_points: running points_cost total aligned with check_in_ordinals,
+                where entry i is the cost of the first i reservations
+        Input dicts are shared, not copied.
+    """
+    index: dict[int, dict] = {}
+    for b in point_balances:
+        index.setdefault(b["contract_id"], _empty_entry())["balances"].append(b)
+    for r in reservations:
+        index.setdefault(r["contract_id"], _empty_entry())["reservations"].append(r)
+
+    for entry in index.values():
+        entry["reservations"].sort(key=_check_in_date)
+        for r in entry["reservations"]:
+            if r.get("status", "confirmed") == "cancelled":
+                continue
+            entry["check_in_ordinals"].append(_check_in_date(r).toordinal())
+            entry["cumulative_points"].append(entry["cumulative_points"][-1] + r["points_cost"])
+    return index
+
+
+def get_contract_entry(index: dict[int, dict], contract_id: int) -> dict:
+    """Return a contract's entry from the index (empty lists if it has no rows)."""
+    return index.get(contract_id) or _empty_entry()
+
+
+def get_committed_points(entry: dict, start: date, end: date) -> tuple[int, int]:
+    """
+    Sum non-cancelled reservations with check_in in [start, end] using two bisects.
+
+    Returns:
+        Tuple of (committed points, number of reservations).
+    """
+    lo = bisect_left(entry["check_in_ordinals"], start.toordinal())
+    hi = bisect_right(entry["check_in_ordinals"], end.toordinal())
+    if hi <= lo:
+        return 0, 0
+    return entry["cumulative_points"][hi] - entry["cumulative_points"][lo], hi - lo
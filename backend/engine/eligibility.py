@@ -1,10 +1,23 @@
 """Booking eligibility resolver -- determines which resorts a contract can book."""
 
-from backend.data.resorts import (
-    get_original_resort_slugs,
-    get_resort_slugs,
-    get_restricted_resort_slugs,
-)
+from functools import lru_cache
+
+from backend.data.resorts import get_resort_registry
+
+
+@lru_cache
+def _eligible_resorts(home_resort: str, purchase_type: str) -> tuple[str, ...]:
+    registry = get_resort_registry()
+    if purchase_type == "direct":
+        return registry.slugs  # all resorts
+
+    # Resale contract
+    if home_resort in registry.restricted:
+        # Post-2019 resort resale: home resort only
+        return (home_resort,)
+    else:
+        # Original 14 resort resale: can book any of the original 14
+        return registry.original_slugs
 
 
 def get_eligible_resorts(home_resort: str, purchase_type: str) -> list[str]:
@@ -16,15 +29,16 @@ def get_eligible_resorts(home_resort: str, purchase_type: str) -> list[str]:
     - Resale at original 14 resort: can book at any of the original 14
     - Resale at restricted resort (Riviera, DLH, Cabins FW): can ONLY book home resort
     """
-    if purchase_type == "direct":
-        return get_resort_slugs()  # all resorts
+    return list(_eligible_resorts(home_resort, purchase_type))
 
-    # Resale contract
-    restricted = get_restricted_resort_slugs()
 
-    if home_resort in restricted:
-        # Post-2019 resort resale: home resort only
-        return [home_resort]
-    else:
-        # Original 14 resort resale: can book any of the original 14
-        return get_original_resort_slugs()
+@lru_cache
+def get_eligible_resort_set(home_resort: str, purchase_type: str) -> frozenset[str]:
+    """Same resorts as get_eligible_resorts(), as a memoized frozenset for membership checks."""
+    return frozenset(_eligible_resorts(home_resort, purchase_type))
+
+
+def clear_eligibility_cache() -> None:
+    """Forget memoized results, e.g. after a new resort registry is published."""
+    _eligible_resorts.cache_clear()
+    get_eligible_resort_set.cache_clear()
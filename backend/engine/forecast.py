@@ -0,0 +1,272 @@
+"""Multi-year point-flow forecast -- where each contract's points go over N use years.
+
+Each contract is simulated forward from the use year active on as_of:
+annual allocation, reservations, banking unused current points at the
+banking deadline, borrowing from next year's allocation when a reservation
+runs short, and expiration at use year end.
+
+The simulation is one sweep over the contract's events sorted by date
+(allocations, reservations, banking deadlines, expirations and month ends),
+so cost grows with the number of events, not months x reservations.
+"""
+
+from calendar import monthrange
+from datetime import date
+from functools import lru_cache
+
+from backend.engine.contract_index import build_contract_index, get_contract_entry
+from backend.engine.use_year import (
+    get_banking_deadline,
+    get_current_use_year,
+    get_use_year_end,
+    get_use_year_start,
+)
+
+ALLOCATION_TYPES = ("current", "banked", "borrowed", "holding")
+
+# Points that can't be banked are spent first
+_SPEND_ORDER = ("holding", "borrowed", "banked", "current")
+
+# Same-day events run in this order. Use years end on a month's last day, so
+# that month's snapshot still shows the points that are about to expire.
+_ALLOCATE, _RESERVE, _BANK, _MONTH_END, _EXPIRE = range(5)
+
+_FLOWS = ("allocated", "used", "banked", "borrowed", "expired", "shortfall")
+
+
+def _month_ends(start: date, end: date) -> list[date]:
+    """Last day of every month from start's month through end's month."""
+    ends = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        ends.append(date(year, month, monthrange(year, month)[1]))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return ends
+
+
+@lru_cache(maxsize=1024)
+def _calendar_events(
+    uym: int, first_uy: int, last_uy: int, as_of: date
+) -> tuple[date, date, tuple[tuple[date, int, int], ...]]:
+    """
+    Forecast start and end, and the events that don't depend on reservations.
+
+    Allocations, banking deadlines, expirations and month ends only depend on
+    the use year month and the horizon, so they're built once and reused.
+    """
+    events = []
+    for uy in range(first_uy, last_uy + 1):
+        events.append((get_use_year_start(uym, uy), _ALLOCATE, uy))
+        deadline = get_banking_deadline(uym, uy)
+        # Banking before as_of already happened (or didn't) and is in the balances
+        if deadline >= as_of:
+            events.append((deadline, _BANK, uy))
+        events.append((get_use_year_end(uym, uy), _EXPIRE, uy))
+    forecast_end = get_use_year_end(uym, last_uy)
+    for month_end in _month_ends(date(as_of.year, as_of.month, 1), forecast_end):
+        events.append((month_end, _MONTH_END, 0))
+    return get_use_year_start(uym, first_uy), forecast_end, tuple(sorted(events))
+
+
+def _initial_pools(
+    contract: dict, balances: list[dict], first_uy: int, last_uy: int
+) -> dict[int, dict[str, int]]:
+    """
+    Starting points per use year.
+
+    Entered balances are used where they exist. Later use years without a
+    current row get the annual allocation, less anything already borrowed
+    from them into the year before.
+    """
+    pools = {uy: dict.fromkeys(ALLOCATION_TYPES, 0) for uy in range(first_uy, last_uy + 2)}
+    has_current = set()
+    for b in balances:
+        if b["use_year"] in pools:
+            pools[b["use_year"]][b["allocation_type"]] += b["points"]
+            if b["allocation_type"] == "current":
+                has_current.add(b["use_year"])
+    for uy in range(first_uy + 1, last_uy + 2):
+        if uy not in has_current:
+            pools[uy]["current"] = max(0, contract["annual_points"] - pools[uy - 1]["borrowed"])
+    return pools
+
+
+def forecast_contract(
+    contract: dict,
+    point_balances: list[dict],
+    reservations: list[dict],
+    as_of: date,
+    years: int,
+    borrowing_limit_pct: int = 100,
+) -> dict:
+    """
+    Simulate one contract forward `years` use years from as_of.
+
+    Args:
+        contract: dict with id, name, home_resort, use_year_month, annual_points
+        point_balances: the contract's balance dicts (use_year, allocation_type, points)
+        reservations: the contract's reservation dicts (check_in, points_cost, status)
+        as_of: date the forecast starts from
+        years: number of use years to cover, starting with the one active on as_of
+        borrowing_limit_pct: share of annual points that may be borrowed into a use year
+
+    Returns:
+        Dict with contract metadata, months (the active use year's end-of-month
+        balances by allocation type, their sum as available, and that month's
+        flows: allocated, used, banked, borrowed, expired, shortfall), totals of
+        each flow, and shortfalls (reservations that could not be fully covered).
+    """
+    uym = contract["use_year_month"]
+    first_uy = get_current_use_year(uym, as_of=as_of)
+    last_uy = first_uy + years - 1
+    forecast_start, forecast_end, calendar = _calendar_events(uym, first_uy, last_uy, as_of)
+    report_start = date(as_of.year, as_of.month, 1)
+    borrow_limit = contract["annual_points"] * borrowing_limit_pct // 100
+
+    pools = _initial_pools(contract, point_balances, first_uy, last_uy)
+    allocations = {uy: pools[uy]["current"] for uy in pools}
+    borrowed_into = {uy: pools[uy]["borrowed"] for uy in pools}
+    # Points still committed to reservations later in each use year
+    pending = dict.fromkeys(pools, 0)
+
+    events = list(calendar)
+    for i, r in enumerate(reservations):
+        check_in = r["check_in"]
+        if isinstance(check_in, str):
+            check_in = date.fromisoformat(check_in)
+        if r.get("status", "confirmed") == "cancelled":
+            continue
+        if forecast_start <= check_in <= forecast_end:
+            events.append((check_in, _RESERVE, i))
+            pending[get_current_use_year(uym, as_of=check_in)] += r["points_cost"]
+    events.sort()
+
+    flows = dict.fromkeys(_FLOWS, 0)
+    totals = dict.fromkeys(_FLOWS, 0)
+    months = []
+    shortfalls = []
+
+    def _record(event_date: date, flow: str, points: int) -> None:
+        if event_date >= report_start:
+            flows[flow] += points
+            totals[flow] += points
+
+    for event_date, kind, ref in events:
+        if kind == _ALLOCATE:
+            if ref > first_uy:
+                _record(event_date, "allocated", allocations[ref])
+
+        elif kind == _RESERVE:
+            r = reservations[ref]
+            uy = get_current_use_year(uym, as_of=event_date)
+            pool = pools[uy]
+            cost = r["points_cost"]
+            pending[uy] -= cost
+            needed = cost
+            for alloc in _SPEND_ORDER:
+                take = min(needed, pool[alloc])
+                pool[alloc] -= take
+                needed -= take
+            if needed:
+                # Borrow from next year's allocation, within the limit
+                borrow = min(needed, borrow_limit - borrowed_into[uy], pools[uy + 1]["current"])
+                if borrow > 0:
+                    pools[uy + 1]["current"] -= borrow
+                    borrowed_into[uy] += borrow
+                    needed -= borrow
+                    _record(event_date, "borrowed", borrow)
+            _record(event_date, "used", cost - needed)
+            if needed:
+                _record(event_date, "shortfall", needed)
+                shortfalls.append(
+                    {
+                        "check_in": event_date.isoformat(),
+                        "use_year": uy,
+                        "points_cost": cost,
+                        "points_short": needed,
+                    }
+                )
+
+        elif kind == _BANK:
+            pool = pools[ref]
+            # Keep enough for reservations still to come in this use year
+            non_bankable = pool["holding"] + pool["borrowed"] + pool["banked"]
+            keep = max(0, pending[ref] - non_bankable)
+            bank = max(0, pool["current"] - keep)
+            if bank:
+                pool["current"] -= bank
+                pools[ref + 1]["banked"] += bank
+                _record(event_date, "banked", bank)
+
+        elif kind == _MONTH_END:
+            uy = get_current_use_year(uym, as_of=event_date)
+            pool = pools[uy]
+            months.append(
+                {
+                    "month": f"{event_date.year:04d}-{event_date.month:02d}",
+                    "use_year": uy,
+                    "balances": dict(pool),
+                    "available": sum(pool.values()),
+                    "flows": flows,
+                }
+            )
+            flows = dict.fromkeys(_FLOWS, 0)
+
+        else:  # _EXPIRE, right after the snapshot of the month it falls in
+            expired = sum(pools[ref].values())
+            pools[ref] = dict.fromkeys(ALLOCATION_TYPES, 0)
+            if event_date >= report_start:
+                months[-1]["flows"]["expired"] += expired
+                totals["expired"] += expired
+
+    return {
+        "contract_id": contract["id"],
+        "contract_name": contract.get("name") or contract.get("home_resort"),
+        "use_year_month": uym,
+        "annual_points": contract["annual_points"],
+        "first_use_year": first_uy,
+        "last_use_year": last_uy,
+        "months": months,
+        "totals": totals,
+        "shortfalls": shortfalls,
+    }
+
+
+def forecast_points(
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    as_of: date,
+    years: int,
+    borrowing_limit_pct: int = 100,
+) -> dict:
+    """
+    Forecast every contract forward `years` use years.
+
+    Pure function -- no DB access.
+
+    Returns:
+        Dict with as_of, years, per-contract forecasts (see forecast_contract())
+        and a summary of each flow summed across contracts.
+    """
+    index = build_contract_index(point_balances, reservations)
+    results = []
+    for contract in contracts:
+        entry = get_contract_entry(index, contract["id"])
+        results.append(
+            forecast_contract(
+                contract,
+                entry["balances"],
+                entry["reservations"],
+                as_of,
+                years,
+                borrowing_limit_pct,
+            )
+        )
+
+    return {
+        "as_of": as_of.isoformat(),
+        "years": years,
+        "contracts": results,
+        "summary": {flow: sum(c["totals"][flow] for c in results) for flow in _FLOWS},
+    }
@@ -0,0 +1,559 @@
+"""Scenario optimizer -- picks which contract pays for each wanted stay.
+
+Each stay draws on one contract's use year (the one its check-in falls in),
+or with splits enabled on several contracts. Points in a (contract, use year)
+bucket are "at risk" if they cannot be banked: banked, borrowed and holding
+points always, and current points too once the banking deadline has passed.
+Paying for stays with at-risk points first is what keeps points from expiring.
+
+The assignment is found with branch-and-bound, seeded with a greedy
+"spend at-risk points first" assignment and pruned by max-flow bounds (stays
+split freely) on placeable stays and usable at-risk points. Without splits,
+each bucket's usable at-risk points are further capped by the largest sum of
+remaining stay costs it can actually hold, so at-risk points no combination
+of stays can reach count as already expiring. Solutions are compared
+lexicographically on:
+
+1. most stays placed
+2. fewest points left expiring
+3. fewest split stays
+
+With every stay placed, the points used are fixed, so fewest expiring points
+is the same as most points left to bank. The search stops once time_limit
+seconds have passed and returns the best assignment found, flagged as not
+proven optimal.
+"""
+
+import time
+from datetime import date
+
+from backend.data.point_charts import calculate_stay_total
+from backend.engine.availability import get_contract_availability
+from backend.engine.contract_index import build_contract_index, get_contract_entry
+from backend.engine.eligibility import get_eligible_resort_set
+from backend.engine.use_year import get_current_use_year
+
+# Wall-clock budget for the search, in seconds
+DEFAULT_TIME_LIMIT = 0.8
+
+# Search nodes between clock checks
+_CLOCK_INTERVAL = 64
+
+
+def _build_buckets(contracts, index, stays, today):
+    """One bucket per (contract, use year) that some stay could draw on."""
+    buckets: list[dict] = []
+    bucket_ids: dict[tuple[int, int], int] = {}
+    for s, stay in enumerate(stays):
+        for contract in contracts:
+            eligible = get_eligible_resort_set(contract["home_resort"], contract["purchase_type"])
+            if stay["resort"] not in eligible:
+                continue
+            use_year = get_current_use_year(contract["use_year_month"], as_of=stay["check_in"])
+            key = (contract["id"], use_year)
+            if key not in bucket_ids:
+                entry = get_contract_entry(index, contract["id"])
+                availability = get_contract_availability(
+                    contract_id=contract["id"],
+                    use_year_month=contract["use_year_month"],
+                    annual_points=contract["annual_points"],
+                    point_balances=entry["balances"],
+                    reservations=entry["reservations"],
+                    target_date=stay["check_in"],
+                    contract_entry=entry,
+                )
+                available = availability["available_points"]
+                if today > date.fromisoformat(availability["banking_deadline"]):
+                    at_risk = available
+                else:
+                    bankable = availability["balances"].get("current", 0)
+                    at_risk = min(available, max(0, available - bankable))
+                bucket_ids[key] = len(buckets)
+                buckets.append(
+                    {
+                        "contract_id": contract["id"],
+                        "contract_name": contract.get("name") or contract.get("home_resort"),
+                        "use_year": use_year,
+                        "available_points": available,
+                        "points_at_risk": at_risk,
+                        "stay_mask": 0,
+                    }
+                )
+            b = bucket_ids[key]
+            buckets[b]["stay_mask"] |= 1 << s
+            stay["buckets"].append(b)
+    return buckets
+
+
+def _connected_stays(stays: list[dict], num_buckets: int) -> list[list[int]]:
+    """Group stay indexes that are linked through shared buckets (union-find)."""
+    parent = list(range(len(stays) + num_buckets))
+
+    def _find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for s, stay in enumerate(stays):
+        for b in stay["buckets"]:
+            parent[_find(s)] = _find(len(stays) + b)
+
+    groups: dict[int, list[int]] = {}
+    for s in range(len(stays)):
+        groups.setdefault(_find(s), []).append(s)
+    return list(groups.values())
+
+
+def _max_transfer(demands: list[tuple[int, list[int]]], caps: dict[int, int]) -> int:
+    """
+    Most points the demands can place into the capped buckets they link to.
+
+    Bipartite max flow with augmenting paths. Demands may split freely, so this
+    is a relaxation used to bound the search.
+    """
+    left = [amount for amount, _ in demands]
+    flow: list[dict[int, int]] = [{} for _ in demands]
+    cap_left = {b: c for b, c in caps.items() if c > 0}
+    linked: dict[int, list[int]] = {}
+    total = 0
+    # Greedy first fill; augmenting paths only fix up what it leaves behind
+    for d, (_, bucket_ids) in enumerate(demands):
+        for b in bucket_ids:
+            linked.setdefault(b, []).append(d)
+            room = cap_left.get(b, 0)
+            if room and left[d]:
+                pushed = min(room, left[d])
+                flow[d][b] = pushed
+                left[d] -= pushed
+                total += pushed
+                if room == pushed:
+                    del cap_left[b]
+                else:
+                    cap_left[b] = room - pushed
+
+    while cap_left and any(left):
+        # Breadth-first search from demands with points left to a bucket with room
+        reached_bucket: dict[int, int] = {}
+        reached_demand: dict[int, int | None] = {d: None for d in range(len(demands)) if left[d]}
+        queue = list(reached_demand)
+        found = None
+        for d in queue:
+            if found is not None:
+                break
+            for b in demands[d][1]:
+                if b in reached_bucket:
+                    continue
+                reached_bucket[b] = d
+                if cap_left.get(b):
+                    found = b
+                    break
+                for d2 in linked[b]:
+                    if d2 not in reached_demand and flow[d2].get(b):
+                        reached_demand[d2] = b
+                        queue.append(d2)
+        if found is None:
+            break
+
+        # Bottleneck along the path, then push
+        amount = cap_left[found]
+        b = found
+        while True:
+            d = reached_bucket[b]
+            prev = reached_demand[d]
+            if prev is None:
+                amount = min(amount, left[d])
+                break
+            amount = min(amount, flow[d][prev])
+            b = prev
+        b = found
+        cap_left[b] -= amount
+        if not cap_left[b]:
+            del cap_left[b]
+        while True:
+            d = reached_bucket[b]
+            flow[d][b] = flow[d].get(b, 0) + amount
+            prev = reached_demand[d]
+            if prev is None:
+                left[d] -= amount
+                break
+            flow[d][prev] -= amount
+            b = prev
+        total += amount
+    return total
+
+
+def _fillable(costs: list[int], limit: int) -> int:
+    """Largest sum of a subset of costs that is at most limit (bitset subset sum)."""
+    mask = (1 << (limit + 1)) - 1
+    reachable = 1
+    for cost in costs:
+        reachable = (reachable | (reachable << cost)) & mask
+    return reachable.bit_length() - 1
+
+
+def _solve_group(
+    stays: list[dict],
+    buckets: list[dict],
+    group: list[int],
+    allow_splits: bool,
+    deadline: float,
+) -> tuple[dict[int, list[tuple[int, int]] | None], int, bool]:
+    """
+    Branch-and-bound over one group of stays.
+
+    Returns:
+        Tuple of (stay index -> list of (bucket, points) or None, nodes explored,
+        whether the deadline stopped the search early).
+    """
+
+    # Stays that fit whole in the fewest buckets first, expensive ones first
+    # among those: they have the fewest places to go
+    def _places(s):
+        cost = stays[s]["points_cost"]
+        return sum(buckets[b]["available_points"] >= cost for b in stays[s]["buckets"])
+
+    order = sorted(group, key=lambda s: (_places(s), -stays[s]["points_cost"]))
+    # Bit mask of stays still to place from depth d onwards
+    remaining_from = [0] * (len(order) + 1)
+    for d in range(len(order) - 1, -1, -1):
+        remaining_from[d] = remaining_from[d + 1] | (1 << order[d])
+
+    group_buckets = sorted({b for s in group for b in stays[s]["buckets"]})
+    capacity = {b: buckets[b]["available_points"] for b in group_buckets}
+    at_risk = {b: buckets[b]["points_at_risk"] for b in group_buckets}
+    used = dict.fromkeys(group_buckets, 0)
+    choice: dict[int, list[tuple[int, int]] | None] = dict.fromkeys(group)
+
+    seen: dict[tuple, tuple[int, int]] = {}
+    stats = {"nodes": 0, "limit_hit": False}
+
+    def _candidates(stay, depth, splitting):
+        cost = stay["points_cost"]
+        singles = []
+        shapes = set()
+        for b in stay["buckets"]:
+            free = capacity[b] - used[b]
+            if free < cost:
+                continue
+            risk = max(0, at_risk[b] - used[b])
+            # Buckets in the same state that serve the same stays are interchangeable
+            shape = (buckets[b]["stay_mask"] & remaining_from[depth], free, risk)
+            if shape in shapes:
+                continue
+            shapes.add(shape)
+            singles.append((-min(cost, risk), free, b))
+        singles.sort()
+        moves = [[(b, cost)] for _, _, b in singles]
+
+        if splitting:
+            # Split that drains at-risk points first, then puts the rest in as
+            # few buckets as possible (one that already has a part if it fits)
+            parts: dict[int, int] = {}
+            needed = cost
+            ranked = sorted(
+                stay["buckets"],
+                key=lambda b: (-max(0, at_risk[b] - used[b]), -(capacity[b] - used[b]), b),
+            )
+            for b in ranked:
+                take = min(needed, max(0, at_risk[b] - used[b]))
+                if take > 0:
+                    parts[b] = take
+                    needed -= take
+            if needed:
+                rest = sorted(
+                    stay["buckets"],
+                    key=lambda b: (b not in parts, -(capacity[b] - used[b] - parts.get(b, 0)), b),
+                )
+                for b in rest:
+                    take = min(needed, capacity[b] - used[b] - parts.get(b, 0))
+                    if take > 0:
+                        parts[b] = parts.get(b, 0) + take
+                        needed -= take
+                    if needed == 0:
+                        break
+            if needed == 0 and len(parts) > 1:
+                moves.append(sorted(parts.items(), key=lambda part: -part[1]))
+        return moves
+
+    def _bound(depth, placed, expiring, splits, splitting):
+        """Optimistic (placed, expiring, splits) for any completion of this node.
+
+        splitting: whether the completion may still split stays
+        """
+        placeable = []
+        demands = []
+        savings = []
+        for s in order[depth:]:
+            stay = stays[s]
+            cost = stay["points_cost"]
+            frees = [capacity[b] - used[b] for b in stay["buckets"]]
+            room = sum(frees) if splitting else max(frees, default=0)
+            if room < cost:
+                continue
+            placeable.append(cost)
+            demands.append((cost, stay["buckets"]))
+            risks = [max(0, at_risk[b] - used[b]) for b in stay["buckets"]]
+            # Without splits a stay saves at most what its best single bucket has at risk
+            savings.append((min(cost, sum(risks) if splitting else max(risks)), stay["buckets"]))
+
+        free = {b: capacity[b] - used[b] for b in group_buckets}
+        risk_points = {b: max(0, at_risk[b] - used[b]) for b in group_buckets}
+        if not splitting:
+            # Whole stays only: a bucket can take at most the largest sum of
+            # stays that fits in it, so free and at-risk points beyond that
+            # can't be used (those at-risk points expire regardless)
+            linked: dict[int, list[int]] = {}
+            for cost, bucket_ids in demands:
+                for b in bucket_ids:
+                    if cost <= free[b]:
+                        linked.setdefault(b, []).append(cost)
+            fillable = {
+                b: _fillable(costs, free[b]) if sum(costs) > free[b] else sum(costs)
+                for b, costs in linked.items()
+            }
+            free = fillable
+            risk_points = {b: min(risk_points[b], fits) for b, fits in fillable.items()}
+
+        # Placing k stays needs at least the k cheapest costs in free points
+        free_points = _max_transfer(demands, free)
+        could_place = 0
+        for cost in sorted(placeable):
+            if cost > free_points:
+                break
+            free_points -= cost
+            could_place += 1
+        if -(placed + could_place) > best["key"][0]:
+            return (-(placed + could_place), expiring, splits)
+
+        # At-risk points the remaining stays could use up
+        could_save = min(sum(amount for amount, _ in savings), sum(risk_points.values()))
+        if (-(placed + could_place), expiring - could_save, splits) < best["key"]:
+            could_save = _max_transfer(savings, risk_points)
+        return (-(placed + could_place), expiring - could_save, splits)
+
+    def _search(depth, placed, expiring, splits):
+        stats["nodes"] += 1
+        if stats["nodes"] % _CLOCK_INTERVAL == 1 and time.perf_counter() > deadline:
+            stats["limit_hit"] = True
+        if stats["limit_hit"]:
+            return
+
+        if depth == len(order):
+            key = (-placed, expiring, splits)
+            if key < best["key"]:
+                best["key"] = key
+                best["choice"] = dict(choice)
+            return
+
+        bound = _bound(depth, placed, expiring, splits, allow_splits)
+        if bound >= best["key"]:
+            return
+        splitting = allow_splits
+        if splitting and (*bound[:2], splits + 1) >= best["key"]:
+            # Another split can't beat the best any more; only whole stays can
+            if _bound(depth, placed, expiring, splits, False) >= best["key"]:
+                return
+            splitting = False
+
+        # Buckets are interchangeable if they serve the same remaining stays
+        # with the same free and at-risk points, so the state ignores their labels
+        state = (
+            depth,
+            tuple(
+                sorted(
+                    (
+                        buckets[b]["stay_mask"] & remaining_from[depth],
+                        capacity[b] - used[b],
+                        max(0, at_risk[b] - used[b]),
+                    )
+                    for b in group_buckets
+                )
+            ),
+        )
+        prefix = (-placed, splits)
+        if state in seen and seen[state] <= prefix:
+            return
+        seen[state] = prefix
+
+        s = order[depth]
+        for parts in _candidates(stays[s], depth, splitting):
+            saved = 0
+            for b, pts in parts:
+                saved += min(pts, max(0, at_risk[b] - used[b]))
+                used[b] += pts
+            choice[s] = parts
+            _search(depth + 1, placed + 1, expiring - saved, splits + (len(parts) > 1))
+            choice[s] = None
+            for b, pts in parts:
+                used[b] -= pts
+            if stats["limit_hit"]:
+                return
+
+        # Leave the stay unplaced
+        _search(depth + 1, placed, expiring, splits)
+
+    # Greedy incumbent: each stay, in search order, takes the move that
+    # spends the most at-risk points
+    expiring = sum(at_risk.values())
+    placed = splits = 0
+    for depth, s in enumerate(order):
+        moves = _candidates(stays[s], depth, allow_splits)
+        if not moves:
+            continue
+        choice[s] = moves[0]
+        for b, pts in moves[0]:
+            expiring -= min(pts, max(0, at_risk[b] - used[b]))
+            used[b] += pts
+        placed += 1
+        splits += len(moves[0]) > 1
+    best = {"key": (-placed, expiring, splits), "choice": dict(choice)}
+    used = dict.fromkeys(group_buckets, 0)
+    choice = dict.fromkeys(group)
+
+    _search(0, 0, sum(at_risk.values()), 0)
+    return best["choice"], stats["nodes"], stats["limit_hit"]
+
+
+def optimize_stay_assignments(
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    stays: list[dict],
+    today: date,
+    allow_splits: bool = False,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+) -> dict:
+    """
+    Assign each wanted stay to the contract(s) that should pay for it.
+
+    Pure function -- no DB access.
+
+    Args:
+        contracts: list of dicts with id, name, home_resort, use_year_month,
+                   annual_points, purchase_type
+        point_balances: list of dicts with contract_id, use_year, allocation_type, points
+        reservations: list of dicts with contract_id, check_in, points_cost, status
+        stays: list of dicts with resort, room_key, check_in, check_out
+        today: date used to decide whether banking deadlines have passed
+        allow_splits: also try paying for a stay from several contracts, draining
+                      at-risk points first
+        time_limit: seconds to search before returning the best solution
+                    found so far (reported with optimal=False)
+
+    Returns:
+        Dict with assignments (one per priced stay, in input order), use_years
+        (per contract use year a stay could draw on: available, at risk, used,
+        expiring), summary and errors for stays that could not be priced.
+    """
+    errors = []
+    priced = []
+    for i, stay in enumerate(stays):
+        points_cost = calculate_stay_total(
+            stay["resort"], stay["room_key"], stay["check_in"], stay["check_out"]
+        )
+        if points_cost is None:
+            errors.append(
+                {
+                    "stay_index": i,
+                    "resort": stay["resort"],
+                    "room_key": stay["room_key"],
+                    "error": "Point chart data not available",
+                }
+            )
+            continue
+        priced.append(
+            {
+                "stay_index": i,
+                "resort": stay["resort"],
+                "room_key": stay["room_key"],
+                "check_in": stay["check_in"],
+                "check_out": stay["check_out"],
+                "points_cost": points_cost,
+                "num_nights": (stay["check_out"] - stay["check_in"]).days,
+                "buckets": [],
+            }
+        )
+
+    index = build_contract_index(point_balances, reservations)
+    buckets = _build_buckets(contracts, index, priced, today)
+
+    expiring_start = sum(b["points_at_risk"] for b in buckets)
+
+    # Stays that share no bucket don't affect each other, so each connected
+    # group is searched on its own. Small groups go first and leave their
+    # unused time to the larger ones.
+    groups = sorted(_connected_stays(priced, len(buckets)), key=len)
+    choice: list[list[tuple[int, int]] | None] = [None] * len(priced)
+    nodes = 0
+    limit_hit = False
+    start = time.perf_counter()
+    for g, group in enumerate(groups):
+        now = time.perf_counter()
+        deadline = now + (start + time_limit - now) / (len(groups) - g)
+        group_choice, group_nodes, group_limit_hit = _solve_group(
+            priced, buckets, group, allow_splits, deadline
+        )
+        for s, parts in group_choice.items():
+            choice[s] = parts
+        nodes += group_nodes
+        limit_hit = limit_hit or group_limit_hit
+
+    # Replay the best solution to report per-bucket usage
+    final_used = [0] * len(buckets)
+    assignments = []
+    for s, stay in enumerate(priced):
+        parts = choice[s] or []
+        for b, pts in parts:
+            final_used[b] += pts
+        assignments.append(
+            {
+                "stay_index": stay["stay_index"],
+                "resort": stay["resort"],
+                "room_key": stay["room_key"],
+                "check_in": stay["check_in"],
+                "check_out": stay["check_out"],
+                "points_cost": stay["points_cost"],
+                "num_nights": stay["num_nights"],
+                "assigned": bool(parts),
+                "allocations": [
+                    {
+                        "contract_id": buckets[b]["contract_id"],
+                        "contract_name": buckets[b]["contract_name"],
+                        "use_year": buckets[b]["use_year"],
+                        "points": pts,
+                    }
+                    for b, pts in parts
+                ],
+            }
+        )
+
+    use_years = [
+        {
+            "contract_id": b["contract_id"],
+            "contract_name": b["contract_name"],
+            "use_year": b["use_year"],
+            "available_points": b["available_points"],
+            "points_at_risk": b["points_at_risk"],
+            "points_used": final_used[i],
+            "points_expiring": max(0, b["points_at_risk"] - final_used[i]),
+        }
+        for i, b in enumerate(buckets)
+    ]
+    points_expiring = sum(u["points_expiring"] for u in use_years)
+
+    return {
+        "assignments": assignments,
+        "use_years": use_years,
+        "summary": {
+            "num_stays": len(stays),
+            "stays_assigned": sum(a["assigned"] for a in assignments),
+            "split_stays": sum(len(a["allocations"]) > 1 for a in assignments),
+            "points_assigned": sum(final_used),
+            "points_expiring_before": expiring_start,
+            "points_expiring_after": points_expiring,
+            "optimal": not limit_hit,
+            "nodes_explored": nodes,
+        },
+        "errors": errors,
+    }
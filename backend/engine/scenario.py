@@ -1,7 +1,8 @@
 from datetime import date
 
-from backend.data.point_charts import calculate_stay_cost
+from backend.data.point_charts import calculate_stay_total
 from backend.engine.availability import get_contract_availability
+from backend.engine.contract_index import build_contract_index, get_contract_entry
 
 
 def compute_scenario_impact(
@@ -18,8 +19,8 @@ def compute_scenario_impact(
     - baseline: availability with only real reservations
     - scenario: availability with real + all hypothetical reservations
 
-    Hypothetical bookings are resolved to point costs using calculate_stay_cost(),
-    then injected as additional reservations into the availability engine.
+    Hypothetical bookings are resolved to point costs using calculate_stay_total(),
+    then added to the baseline's committed points for its use year.
 
     Pure function -- no DB access.
 
@@ -37,13 +38,8 @@ def compute_scenario_impact(
     resolved_hypotheticals = []
     errors = []
     for hb in hypothetical_bookings:
-        cost = calculate_stay_cost(
-            hb["resort"],
-            hb["room_key"],
-            hb["check_in"],
-            hb["check_out"],
-        )
-        if cost is None:
+        resolved = resolve_hypothetical_booking(hb)
+        if resolved is None:
             errors.append(
                 {
                     "resort": hb["resort"],
@@ -52,80 +48,106 @@ def compute_scenario_impact(
                 }
             )
             continue
-        resolved_hypotheticals.append(
-            {
-                "contract_id": hb["contract_id"],
-                "check_in": hb["check_in"],
-                "check_out": hb["check_out"],
-                "points_cost": cost["total_points"],
-                "resort": hb["resort"],
-                "room_key": hb["room_key"],
-                "status": "confirmed",
-                "num_nights": cost["num_nights"],
-            }
-        )
+        resolved_hypotheticals.append(resolved)
 
     # 2. Compute baseline and scenario for each contract
+    index = build_contract_index(point_balances, reservations)
+    hypotheticals_by_contract: dict[int, list[dict]] = {}
+    for h in resolved_hypotheticals:
+        hypotheticals_by_contract.setdefault(h["contract_id"], []).append(h)
+
     contract_results = []
     for contract in contracts:
         cid = contract["id"]
-        c_balances = [b for b in point_balances if b["contract_id"] == cid]
-        c_real_reservations = [r for r in reservations if r["contract_id"] == cid]
-        c_hypotheticals = [h for h in resolved_hypotheticals if h["contract_id"] == cid]
-
+        entry = get_contract_entry(index, cid)
+        c_hypotheticals = hypotheticals_by_contract.get(cid, [])
         baseline = get_contract_availability(
             contract_id=cid,
             use_year_month=contract["use_year_month"],
             annual_points=contract["annual_points"],
-            point_balances=c_balances,
-            reservations=c_real_reservations,
-            target_date=target_date,
-        )
-
-        # Scenario = real reservations + resolved hypotheticals
-        scenario_reservations = c_real_reservations + [
-            {
-                "check_in": h["check_in"],
-                "points_cost": h["points_cost"],
-                "status": "confirmed",
-                "contract_id": cid,
-            }
-            for h in c_hypotheticals
-        ]
-
-        scenario = get_contract_availability(
-            contract_id=cid,
-            use_year_month=contract["use_year_month"],
-            annual_points=contract["annual_points"],
-            point_balances=c_balances,
-            reservations=scenario_reservations,
+            point_balances=entry["balances"],
+            reservations=entry["reservations"],
             target_date=target_date,
+            contract_entry=entry,
         )
-
-        contract_results.append(
-            {
-                "contract_id": cid,
-                "contract_name": contract.get("name") or contract.get("home_resort"),
-                "home_resort": contract.get("home_resort"),
-                "baseline": baseline,
-                "scenario": scenario,
-                "hypothetical_bookings": c_hypotheticals,
-            }
-        )
-
-    # 3. Compute grand totals
-    baseline_total = sum(c["baseline"]["available_points"] for c in contract_results)
-    scenario_total = sum(c["scenario"]["available_points"] for c in contract_results)
+        contract_results.append(contract_scenario_result(contract, baseline, c_hypotheticals))
 
     return {
         "target_date": target_date.isoformat(),
         "contracts": contract_results,
-        "summary": {
-            "baseline_available": baseline_total,
-            "scenario_available": scenario_total,
-            "total_impact": baseline_total - scenario_total,
-            "num_hypothetical_bookings": len(resolved_hypotheticals),
-        },
+        "summary": summarize_contract_results(contract_results, len(resolved_hypotheticals)),
         "resolved_bookings": resolved_hypotheticals,
         "errors": errors,
     }
+
+
+def resolve_hypothetical_booking(booking: dict) -> dict | None:
+    """
+    Price a hypothetical booking with calculate_stay_total().
+
+    Returns:
+        The booking as a confirmed reservation dict with points_cost and
+        num_nights, or None if there is no chart data for the stay.
+    """
+    points_cost = calculate_stay_total(
+        booking["resort"],
+        booking["room_key"],
+        booking["check_in"],
+        booking["check_out"],
+    )
+    if points_cost is None:
+        return None
+    return {
+        "contract_id": booking["contract_id"],
+        "check_in": booking["check_in"],
+        "check_out": booking["check_out"],
+        "points_cost": points_cost,
+        "resort": booking["resort"],
+        "room_key": booking["room_key"],
+        "status": "confirmed",
+        "num_nights": (booking["check_out"] - booking["check_in"]).days,
+    }
+
+
+def apply_hypotheticals(baseline: dict, hypotheticals: list[dict]) -> dict:
+    """
+    Scenario availability: baseline plus hypotheticals in the baseline's use year.
+
+    Equivalent to re-running get_contract_availability() with the hypotheticals
+    added as reservations, without rescanning the real ones.
+    """
+    uy_start = date.fromisoformat(baseline["use_year_start"])
+    uy_end = date.fromisoformat(baseline["use_year_end"])
+    in_use_year = [h for h in hypotheticals if uy_start <= h["check_in"] <= uy_end]
+    committed_points = baseline["committed_points"] + sum(h["points_cost"] for h in in_use_year)
+    return {
+        **baseline,
+        "balances": dict(baseline["balances"]),
+        "committed_points": committed_points,
+        "committed_reservation_count": baseline["committed_reservation_count"] + len(in_use_year),
+        "available_points": max(0, baseline["total_points"] - committed_points),
+    }
+
+
+def contract_scenario_result(contract: dict, baseline: dict, hypotheticals: list[dict]) -> dict:
+    """Baseline vs scenario for one contract, in the compute_scenario_impact() shape."""
+    return {
+        "contract_id": contract["id"],
+        "contract_name": contract.get("name") or contract.get("home_resort"),
+        "home_resort": contract.get("home_resort"),
+        "baseline": baseline,
+        "scenario": apply_hypotheticals(baseline, hypotheticals),
+        "hypothetical_bookings": hypotheticals,
+    }
+
+
+def summarize_contract_results(contract_results: list[dict], num_hypotheticals: int) -> dict:
+    """Grand totals across per-contract scenario results."""
+    baseline_total = sum(c["baseline"]["available_points"] for c in contract_results)
+    scenario_total = sum(c["scenario"]["available_points"] for c in contract_results)
+    return {
+        "baseline_available": baseline_total,
+        "scenario_available": scenario_total,
+        "total_impact": baseline_total - scenario_total,
+        "num_hypothetical_bookings": num_hypotheticals,
+    }
@@ -0,0 +1,161 @@
+"""Scenario sessions -- a what-if scenario kept between edits.
+
+A session holds the priced hypothetical bookings and each contract's baseline
+availability. Adding, updating or removing one booking only recomputes the
+scenario for the contract(s) that booking touches, on top of the cached
+baseline, instead of re-evaluating the whole plan.
+
+Functions here work on a plain session dict and never touch the database;
+the scenarios router keeps sessions in memory.
+"""
+
+from datetime import date
+
+from backend.engine.availability import get_contract_availability
+from backend.engine.contract_index import build_contract_index, get_contract_entry
+from backend.engine.scenario import (
+    contract_scenario_result,
+    resolve_hypothetical_booking,
+    summarize_contract_results,
+)
+
+
+def create_session(
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    target_date: date,
+    portfolio_version: int,
+) -> dict:
+    """
+    Start an empty scenario session.
+
+    Returns:
+        Session dict with target_date, portfolio_version, contracts (contract_id ->
+        contract, cached baseline and current result), bookings (booking_id ->
+        booking input and priced reservation) and next_booking_id.
+    """
+    session = {"bookings": {}, "next_booking_id": 1}
+    rebase_session(session, contracts, point_balances, reservations, target_date, portfolio_version)
+    return session
+
+
+def rebase_session(
+    session: dict,
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    target_date: date,
+    portfolio_version: int,
+) -> None:
+    """Recompute every baseline from fresh portfolio data, keeping the bookings."""
+    index = build_contract_index(point_balances, reservations)
+    session["target_date"] = target_date
+    session["portfolio_version"] = portfolio_version
+    session["contracts"] = {}
+    for contract in contracts:
+        entry = get_contract_entry(index, contract["id"])
+        baseline = get_contract_availability(
+            contract_id=contract["id"],
+            use_year_month=contract["use_year_month"],
+            annual_points=contract["annual_points"],
+            point_balances=entry["balances"],
+            reservations=entry["reservations"],
+            target_date=target_date,
+            contract_entry=entry,
+        )
+        session["contracts"][contract["id"]] = {
+            "contract": contract,
+            "baseline": baseline,
+            "result": None,
+        }
+    for contract_id in session["contracts"]:
+        _refresh_contract(session, contract_id)
+
+
+def _refresh_contract(session: dict, contract_id: int) -> None:
+    """Recompute one contract's scenario from its cached baseline."""
+    state = session["contracts"].get(contract_id)
+    if state is None:
+        return
+    hypotheticals = [
+        b["resolved"]
+        for b in session["bookings"].values()
+        if b["resolved"] is not None and b["booking"]["contract_id"] == contract_id
+    ]
+    state["result"] = contract_scenario_result(state["contract"], state["baseline"], hypotheticals)
+
+
+def add_booking(session: dict, booking: dict) -> int:
+    """Price and add a hypothetical booking. Returns its booking_id."""
+    booking_id = session["next_booking_id"]
+    session["next_booking_id"] += 1
+    session["bookings"][booking_id] = {
+        "booking": booking,
+        "resolved": resolve_hypothetical_booking(booking),
+    }
+    _refresh_contract(session, booking["contract_id"])
+    return booking_id
+
+
+def update_booking(session: dict, booking_id: int, booking: dict) -> None:
+    """Replace an existing booking, refreshing its old and new contract."""
+    old_contract_id = session["bookings"][booking_id]["booking"]["contract_id"]
+    session["bookings"][booking_id] = {
+        "booking": booking,
+        "resolved": resolve_hypothetical_booking(booking),
+    }
+    _refresh_contract(session, old_contract_id)
+    if booking["contract_id"] != old_contract_id:
+        _refresh_contract(session, booking["contract_id"])
+
+
+def remove_booking(session: dict, booking_id: int) -> None:
+    """Remove a booking and refresh its contract."""
+    removed = session["bookings"].pop(booking_id)
+    _refresh_contract(session, removed["booking"]["contract_id"])
+
+
+def reprice_session(session: dict) -> None:
+    """Re-price every booking from the current point charts and refresh all contracts."""
+    for b in session["bookings"].values():
+        b["resolved"] = resolve_hypothetical_booking(b["booking"])
+    for contract_id in session["contracts"]:
+        _refresh_contract(session, contract_id)
+
+
+def session_result(session: dict) -> dict:
+    """
+    Current scenario in the compute_scenario_impact() shape.
+
+    resolved_bookings and errors carry the booking_id of each booking. Bookings
+    without chart data, or whose contract no longer exists, are reported as errors.
+    """
+    resolved = []
+    errors = []
+    for booking_id, b in session["bookings"].items():
+        booking = b["booking"]
+        if b["resolved"] is None:
+            issue = "Point chart data not available"
+        elif booking["contract_id"] not in session["contracts"]:
+            issue = f"Contract {booking['contract_id']} not found"
+        else:
+            resolved.append({**b["resolved"], "booking_id": booking_id})
+            continue
+        errors.append(
+            {
+                "booking_id": booking_id,
+                "resort": booking["resort"],
+                "room_key": booking["room_key"],
+                "error": issue,
+            }
+        )
+
+    contract_results = [state["result"] for state in session["contracts"].values()]
+    return {
+        "target_date": session["target_date"].isoformat(),
+        "contracts": contract_results,
+        "summary": summarize_contract_results(contract_results, len(resolved)),
+        "resolved_bookings": resolved,
+        "errors": errors,
+    }
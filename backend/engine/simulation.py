@@ -0,0 +1,425 @@
+"""Monte Carlo trip-plan simulation -- how often a travel pattern runs short or wastes points.
+
+A pattern is a list of recurring trips: a month, a number of nights, a room
+and the resorts to choose from. Each sample draws a concrete plan over the
+horizon (a random check-in day in each trip's month, a random resort), prices
+it from the point charts, hands every stay to an eligible contract and runs
+the forecast engine to see which points run short and which expire.
+
+Samples are independent, so they are split into fixed-size chunks, each with
+its own seed, and fanned out over one process pool shared by every request
+(started by the app lifespan, or on first use). Results don't depend on the
+number of workers. Workers don't receive charts: each opens the chart catalog
+itself, mapping the same charts.bin as the server, and reopens it when a
+chunk comes from a newer catalog (after an admin reload). The lifespan writes
+charts.bin first if it is missing or stale; a catalog without one (e.g. a
+reload after editing charts) has every worker parse the chart JSON once.
+A pool a dead worker broke is replaced, and the chunks retried, once.
+"""
+
+import multiprocessing
+import random
+import threading
+from calendar import monthrange
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from itertools import repeat
+from pathlib import Path
+
+from backend.data.point_charts import (
+    ChartCatalog,
+    get_chart_catalog,
+    get_compiled_point_cost,
+    open_chart_catalog,
+    publish_chart_catalog,
+    read_chart_artifact,
+)
+from backend.engine.contract_index import build_contract_index, get_contract_entry
+from backend.engine.eligibility import get_eligible_resort_set
+from backend.engine.forecast import forecast_contract
+from backend.engine.use_year import get_current_use_year
+
+# Samples per chunk; each chunk is one unit of work for the pool
+CHUNK_SIZE = 250
+
+# Shared by every simulation in this process; see start_simulation_pool()
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+# Chart source and charts loaded from it, per worker process
+_worker_source: tuple[str | None, int] | None = None
+_worker_charts: dict | None = None
+
+
+def load_simulation_charts(catalog: ChartCatalog | None = None) -> dict[str, dict[int, dict]]:
+    """Compiled charts of catalog (default the published one), by resort slug and year."""
+    catalog = catalog or get_chart_catalog()
+    charts: dict[str, dict[int, dict]] = {}
+    for (resort, year), compiled in catalog.compiled.items():
+        charts.setdefault(resort, {})[year] = compiled
+    return charts
+
+
+def _chart_source(catalog: ChartCatalog) -> tuple[str | None, int]:
+    """What a worker needs to open the same charts: artifact path (None: chart JSON), version."""
+    return (str(catalog.artifact) if catalog.artifact else None, catalog.version)
+
+
+def _load_worker_charts(source: tuple[str | None, int]) -> dict:
+    """Open the chart catalog named by source in this worker, once per source."""
+    global _worker_source, _worker_charts
+    if source != _worker_source:
+        artifact = source[0]
+        catalog = None
+        if artifact is not None:
+            path = Path(artifact)
+            catalog = read_chart_artifact(path.parent, path)
+        publish_chart_catalog(catalog or open_chart_catalog())
+        _worker_source = source
+        _worker_charts = load_simulation_charts()
+    return _worker_charts
+
+
+def _init_worker(source: tuple[str | None, int]) -> None:
+    _load_worker_charts(source)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """forkserver where available, else spawn: never fork a threaded server."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def start_simulation_pool(
+    workers: int | None = None, catalog: ChartCatalog | None = None
+) -> ProcessPoolExecutor:
+    """
+    Start the process pool simulations fan out to, if it isn't running yet.
+
+    Called from the app lifespan. Each worker maps the chart artifact of
+    catalog (default the published one) when it starts.
+
+    Args:
+        workers: number of processes (default one per CPU)
+        catalog: chart catalog the workers open first
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool(workers, catalog)
+        return _pool
+
+
+def _new_pool(workers: int | None, catalog: ChartCatalog | None) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_pool_context(),
+        initializer=_init_worker,
+        initargs=(_chart_source(catalog or get_chart_catalog()),),
+    )
+
+
+def _replace_broken_pool(
+    broken: ProcessPoolExecutor, workers: int | None, catalog: ChartCatalog | None
+) -> ProcessPoolExecutor:
+    """Swap in a new pool for one a dead worker broke, unless another thread already did."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken or _pool is None:
+            _pool = _new_pool(workers, catalog)
+        pool = _pool
+    broken.shutdown(wait=False, cancel_futures=True)
+    return pool
+
+
+def shutdown_simulation_pool() -> None:
+    """Stop the simulation pool. Called when the app shuts down."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def price_projected_stay(
+    resort_charts: dict[int, dict], room_key: str, check_in: date, nights: int
+) -> int | None:
+    """
+    Point cost of a stay, priced from the nearest chart year when its own is missing.
+
+    Each night takes its season from the chart's same calendar date (Feb 29
+    falls back to Feb 28) and its weekday/weekend rate from the real date, so
+    years that have a chart price exactly like calculate_stay_total().
+    Returns None if any night has no cost.
+    """
+    total = 0
+    ordinal = check_in.toordinal()
+    for night_ordinal in range(ordinal, ordinal + nights):
+        night = date.fromordinal(night_ordinal)
+        chart_date = night
+        compiled = resort_charts.get(night.year)
+        if compiled is None:
+            # Nearest year, earlier one on a tie
+            year = min(resort_charts, key=lambda y: (abs(y - night.year), y))
+            compiled = resort_charts[year]
+            chart_date = date(year, night.month, min(night.day, monthrange(year, night.month)[1]))
+
+        cost = get_compiled_point_cost(
+            compiled, room_key, chart_date, weekend=night.weekday() in (4, 5)
+        )
+        if cost is None:
+            return None
+        total += cost
+    return total
+
+
+def trip_resorts(trip: dict, charts: dict[str, dict[int, dict]]) -> list[str]:
+    """Resorts a trip can land at: its candidates (default all) with charts listing the room."""
+    candidates = trip.get("resorts") or sorted(charts)
+    return [
+        slug
+        for slug in candidates
+        if any(trip["room_key"] in c["room_index"] for c in charts.get(slug, {}).values())
+    ]
+
+
+def _distribution(values: list[int]) -> dict:
+    """Mean, nearest-rank percentiles and max of per-sample values."""
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def pct(q: int) -> int:
+        return ordered[max(0, -(-q * n // 100) - 1)]
+
+    return {
+        "mean": round(sum(ordered) / n, 1),
+        "p50": pct(50),
+        "p90": pct(90),
+        "p95": pct(95),
+        "max": ordered[-1],
+    }
+
+
+def _simulate_chunk(job: dict, charts: dict, chunk_index: int, size: int) -> dict:
+    """Run `size` samples seeded from (seed, chunk_index)."""
+    rng = random.Random(f"{job['seed']}:{chunk_index}")
+    as_of = job["as_of"]
+    window_end = date(as_of.year + job["years"], as_of.month, 1)
+    end_month = f"{window_end.year:04d}-{window_end.month:02d}"
+    contracts = job["contracts"]
+
+    # Use year of a check-in only depends on its month
+    use_years: dict[tuple[int, int, int], int] = {}
+
+    def use_year_of(contract: dict, check_in: date) -> int:
+        key = (contract["use_year_month"], check_in.year, check_in.month)
+        if key not in use_years:
+            use_years[key] = get_current_use_year(key[0], as_of=check_in)
+        return use_years[key]
+
+    expired = {c["id"]: [] for c in contracts}
+    shortfall = {c["id"]: [] for c in contracts}
+    stats = {"trips": 0, "points": 0, "unpriced": 0, "unassigned": 0}
+
+    for _ in range(size):
+        load = dict(job["committed"])
+        planned = {c["id"]: [] for c in contracts}
+        for trip in job["trips"]:
+            for year in range(as_of.year, window_end.year + 1):
+                day = rng.randint(1, monthrange(year, trip["month"])[1])
+                check_in = date(year, trip["month"], day)
+                if not as_of <= check_in < window_end:
+                    continue
+                stats["trips"] += 1
+                if not trip["candidate_resorts"]:
+                    stats["unpriced"] += 1
+                    continue
+                resort = rng.choice(trip["candidate_resorts"])
+                cost = price_projected_stay(
+                    charts[resort], trip["room_key"], check_in, trip["nights"]
+                )
+                if cost is None:
+                    stats["unpriced"] += 1
+                    continue
+                # Least-loaded eligible contract for that use year, relative to its size
+                best = None
+                for c in contracts:
+                    if resort not in job["eligible"][c["id"]]:
+                        continue
+                    if trip.get("contract_id") not in (None, c["id"]):
+                        continue
+                    key = (c["id"], use_year_of(c, check_in))
+                    rank = (load.get(key, 0) / max(c["annual_points"], 1), c["id"])
+                    if best is None or rank < best[0]:
+                        best = (rank, c, key)
+                if best is None:
+                    stats["unassigned"] += 1
+                    continue
+
+                _, contract, key = best
+                load[key] = load.get(key, 0) + cost
+                planned[contract["id"]].append({"check_in": check_in, "points_cost": cost})
+                stats["points"] += cost
+
+        for contract in contracts:
+            cid = contract["id"]
+            # One extra use year so every sampled stay is inside the forecast
+            forecast = forecast_contract(
+                contract,
+                job["balances"][cid],
+                job["reservations"][cid] + planned[cid],
+                as_of,
+                job["years"] + 1,
+                job["borrowing_limit_pct"],
+            )
+            window = [m["flows"] for m in forecast["months"] if m["month"] < end_month]
+            expired[cid].append(sum(f["expired"] for f in window))
+            shortfall[cid].append(sum(f["shortfall"] for f in window))
+
+    return {"expired": expired, "shortfall": shortfall, **stats}
+
+
+def _run_chunk(job: dict, chunk_index: int, size: int) -> dict:
+    return _simulate_chunk(job, _load_worker_charts(job["chart_source"]), chunk_index, size)
+
+
+def simulate_trip_plans(
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    trips: list[dict],
+    as_of: date,
+    years: int,
+    samples: int = 1000,
+    seed: int | None = None,
+    borrowing_limit_pct: int = 100,
+    workers: int | None = None,
+    catalog: ChartCatalog | None = None,
+) -> dict:
+    """
+    Simulate `samples` random plans of a recurring trip pattern over `years` years.
+
+    Every trip recurs once a year in its month, for check-ins from as_of up to
+    the same month `years` years later. A stay goes to the trip's contract_id,
+    or else the eligible contract with the fewest points already booked in that
+    use year relative to its annual points.
+
+    Args:
+        contracts: contract dicts (id, name, home_resort, use_year_month,
+            annual_points, purchase_type)
+        point_balances: balance dicts (contract_id, use_year, allocation_type, points)
+        reservations: existing reservation dicts (contract_id, check_in, points_cost)
+        trips: dicts with month, nights, room_key, and optional resorts (candidate
+            resort slugs, default any with chart data) and contract_id
+        as_of: date the simulation starts from
+        years: length of the horizon in years
+        samples: number of plans to draw
+        seed: random seed; one is picked (and returned) when omitted
+        borrowing_limit_pct: share of annual points that may be borrowed into a use year
+        workers: 1 runs in-process; otherwise chunks go to the shared pool,
+            started with this many processes (default one per CPU) if
+            start_simulation_pool() hasn't been called
+        catalog: chart catalog to price from (default the published one)
+
+    Returns:
+        Dict with as_of, years, samples, seed, per-contract distributions of
+        expired and shortfall points (plus the share of samples with a
+        shortfall), the same for the portfolio as a whole, and per-plan trip
+        counts: trips, points, unpriced (no chart data) and unassigned (no
+        eligible contract).
+
+    Raises:
+        BrokenProcessPool: a worker died again after the pool was replaced
+    """
+    catalog = catalog or get_chart_catalog()
+    charts = load_simulation_charts(catalog)
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    index = build_contract_index(point_balances, reservations)
+    committed: dict[tuple[int, int], int] = {}
+    job_balances = {}
+    job_reservations = {}
+    for contract in contracts:
+        entry = get_contract_entry(index, contract["id"])
+        job_balances[contract["id"]] = entry["balances"]
+        job_reservations[contract["id"]] = entry["reservations"]
+        for r in entry["reservations"]:
+            check_in = r["check_in"]
+            if isinstance(check_in, str):
+                check_in = date.fromisoformat(check_in)
+            key = (contract["id"], get_current_use_year(contract["use_year_month"], as_of=check_in))
+            committed[key] = committed.get(key, 0) + r["points_cost"]
+
+    job = {
+        "as_of": as_of,
+        "years": years,
+        "seed": seed,
+        "borrowing_limit_pct": borrowing_limit_pct,
+        "contracts": contracts,
+        "balances": job_balances,
+        "reservations": job_reservations,
+        "committed": committed,
+        "eligible": {
+            c["id"]: get_eligible_resort_set(c["home_resort"], c["purchase_type"])
+            for c in contracts
+        },
+        "trips": [{**trip, "candidate_resorts": trip_resorts(trip, charts)} for trip in trips],
+        "chart_source": _chart_source(catalog),
+    }
+
+    sizes = [min(CHUNK_SIZE, samples - start) for start in range(0, samples, CHUNK_SIZE)]
+    if workers == 1 or len(sizes) == 1:
+        chunks = [_simulate_chunk(job, charts, i, size) for i, size in enumerate(sizes)]
+    else:
+        pool = start_simulation_pool(workers, catalog)
+        try:
+            chunks = list(pool.map(_run_chunk, repeat(job), range(len(sizes)), sizes))
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory); the pool stays broken for good
+            pool = _replace_broken_pool(pool, workers, catalog)
+            chunks = list(pool.map(_run_chunk, repeat(job), range(len(sizes)), sizes))
+
+    contract_results = []
+    for contract in contracts:
+        cid = contract["id"]
+        expired = [v for chunk in chunks for v in chunk["expired"][cid]]
+        shortfall = [v for chunk in chunks for v in chunk["shortfall"][cid]]
+        contract_results.append(
+            {
+                "contract_id": cid,
+                "contract_name": contract.get("name") or contract.get("home_resort"),
+                "expired": _distribution(expired),
+                "shortfall": _distribution(shortfall),
+                "shortfall_probability": round(sum(v > 0 for v in shortfall) / samples, 3),
+            }
+        )
+
+    # Portfolio totals per sample
+    expired_totals = [0] * samples
+    shortfall_totals = [0] * samples
+    for chunk_start, chunk in zip(range(0, samples, CHUNK_SIZE), chunks, strict=True):
+        for cid in chunk["expired"]:
+            for i, (e, s) in enumerate(
+                zip(chunk["expired"][cid], chunk["shortfall"][cid], strict=True)
+            ):
+                expired_totals[chunk_start + i] += e
+                shortfall_totals[chunk_start + i] += s
+
+    return {
+        "as_of": as_of.isoformat(),
+        "years": years,
+        "samples": samples,
+        "seed": seed,
+        "contracts": contract_results,
+        "summary": {
+            "expired": _distribution(expired_totals),
+            "shortfall": _distribution(shortfall_totals),
+            "shortfall_probability": round(sum(v > 0 for v in shortfall_totals) / samples, 3),
+            **{
+                f"{stat}_per_plan": round(sum(c[stat] for c in chunks) / samples, 1)
+                for stat in ("trips", "points", "unpriced", "unassigned")
+            },
+        },
+    }
@@ -1,15 +1,19 @@
 """Trip Explorer engine -- answers 'what can I afford?' for given dates."""
 
-from datetime import date
+from bisect import bisect_right
+from datetime import date, timedelta
 
 from backend.data.point_charts import (
-    calculate_stay_cost,
+    calculate_stay_total,
     get_available_charts,
-    load_point_chart,
+    get_nightly_costs,
+    load_compiled_chart,
 )
 from backend.data.resorts import load_resorts
 from backend.engine.availability import get_contract_availability
+from backend.engine.contract_index import build_contract_index, get_contract_entry
 from backend.engine.eligibility import get_eligible_resorts
+from backend.engine.use_year import get_current_use_year
 
 
 def find_affordable_options(
@@ -45,6 +49,24 @@ def find_affordable_options(
     resort_list = load_resorts()
     resort_name_map = {r["slug"]: r["name"] for r in resort_list}
 
+    # Price every (resort, room) pair once per request. Each resort's rooms are
+    # ordered by (total_points, room_key) so the affordable set for any budget
+    # is a prefix found with one bisect, instead of re-pricing per contract.
+    priced: dict[str, tuple[list[int], list[str]]] = {}
+    for resort_slug in sorted(resorts_with_charts):
+        compiled = load_compiled_chart(resort_slug, check_in.year)
+        if compiled is None:
+            continue
+        rooms = []
+        for room_key in compiled["room_keys"]:
+            total_points = calculate_stay_total(resort_slug, room_key, check_in, check_out)
+            if total_points is not None:
+                rooms.append((total_points, room_key))
+        rooms.sort()
+        priced[resort_slug] = ([cost for cost, _ in rooms], [key for _, key in rooms])
+
+    index = build_contract_index(point_balances, reservations)
+
     results = []
     resorts_checked: set[str] = set()
     resorts_skipped: set[str] = set()
@@ -52,18 +74,17 @@ def find_affordable_options(
     for contract in contracts:
         contract_id = contract["id"]
 
-        # Filter balances and reservations for this contract
-        c_balances = [b for b in point_balances if b["contract_id"] == contract_id]
-        c_reservations = [r for r in reservations if r["contract_id"] == contract_id]
+        entry = get_contract_entry(index, contract_id)
 
         # Calculate availability using check_in date (NOT today)
         availability = get_contract_availability(
             contract_id=contract_id,
             use_year_month=contract["use_year_month"],
             annual_points=contract["annual_points"],
-            point_balances=c_balances,
-            reservations=c_reservations,
+            point_balances=entry["balances"],
+            reservations=entry["reservations"],
             target_date=check_in,
+            contract_entry=entry,
         )
 
         available_points = availability["available_points"]
@@ -82,39 +103,33 @@ def find_affordable_options(
 
             resorts_checked.add(resort_slug)
 
-            # Load the point chart for this resort
-            chart = load_point_chart(resort_slug, check_in.year)
-            if chart is None:
+            if resort_slug not in priced:
                 resorts_skipped.add(resort_slug)
                 continue
 
-            # Collect all unique room keys across all seasons
-            room_keys: set[str] = set()
-            for season in chart["seasons"]:
-                room_keys.update(season["rooms"].keys())
-
-            # Check each room type
-            for room_key in sorted(room_keys):
-                cost_result = calculate_stay_cost(resort_slug, room_key, check_in, check_out)
-                if cost_result is not None and cost_result["total_points"] <= available_points:
-                    results.append(
-                        {
-                            "contract_id": contract_id,
-                            "contract_name": contract_name,
-                            "available_points": available_points,
-                            "resort": resort_slug,
-                            "resort_name": resort_name_map.get(resort_slug, resort_slug),
-                            "room_key": room_key,
-                            "total_points": cost_result["total_points"],
-                            "num_nights": cost_result["num_nights"],
-                            "points_remaining": available_points - cost_result["total_points"],
-                            "nightly_avg": round(
-                                cost_result["total_points"] / cost_result["num_nights"]
-                            ),
-                        }
-                    )
-
-    # Sort by total_points ascending (cheapest first)
+            costs, room_keys = priced[resort_slug]
+            affordable = bisect_right(costs, available_points)
+            resort_name = resort_name_map.get(resort_slug, resort_slug)
+            for total_points, room_key in zip(
+                costs[:affordable], room_keys[:affordable], strict=True
+            ):
+                results.append(
+                    {
+                        "contract_id": contract_id,
+                        "contract_name": contract_name,
+                        "available_points": available_points,
+                        "resort": resort_slug,
+                        "resort_name": resort_name,
+                        "room_key": room_key,
+                        "total_points": total_points,
+                        "num_nights": num_nights,
+                        "points_remaining": available_points - total_points,
+                        "nightly_avg": round(total_points / num_nights),
+                    }
+                )
+
+    # Sort by total_points ascending (cheapest first); stable, so ties keep
+    # contract, resort and room key order
     results.sort(key=lambda r: r["total_points"])
 
     return {
@@ -126,3 +141,172 @@ def find_affordable_options(
         "resorts_skipped": sorted(resorts_skipped),
         "total_options": len(results),
     }
+
+
+def _window_totals(nightly_costs: list[int | None], num_nights: int) -> list[int | None]:
+    """Sliding-window sum of num_nights consecutive nights.
+
+    Entry i is the total for a stay starting on night i, or None if any
+    night in that stay has no cost.
+    """
+    totals: list[int | None] = []
+    running = 0
+    missing = 0
+    for i, cost in enumerate(nightly_costs):
+        running += cost or 0
+        missing += cost is None
+        if i >= num_nights:
+            dropped = nightly_costs[i - num_nights]
+            running -= dropped or 0
+            missing -= dropped is None
+        if i >= num_nights - 1:
+            totals.append(running if missing == 0 else None)
+    return totals
+
+
+def find_flexible_options(
+    contracts: list[dict],
+    point_balances: list[dict],
+    reservations: list[dict],
+    earliest_check_in: date,
+    latest_check_out: date,
+    num_nights: int,
+    limit: int = 50,
+) -> dict:
+    """
+    Find the cheapest affordable stays of num_nights anywhere in a date window.
+
+    Every start date from earliest_check_in up to latest_check_out - num_nights
+    is considered. Each (resort, room) is priced once for the whole window with
+    a sliding-window sum over its per-night costs. For each contract/resort/room
+    the cheapest affordable start date is kept (earliest on ties).
+
+    Pure function: takes data as arguments, no database access.
+
+    Args:
+        contracts: List of contract dicts (id, name, home_resort, use_year_month,
+                   annual_points, purchase_type)
+        point_balances: List of balance dicts (contract_id, use_year, allocation_type, points)
+        reservations: List of reservation dicts (contract_id, check_in, points_cost, status)
+        earliest_check_in: First allowed check-in date
+        latest_check_out: Last allowed check-out date
+        num_nights: Length of the stay
+        limit: Maximum number of options to return
+
+    Returns:
+        Dict with options (cheapest first, each with its own check_in/check_out,
+        at most limit), plus the same metadata as find_affordable_options();
+        total_options counts every match, not just those returned.
+    """
+    last_check_in = latest_check_out - timedelta(days=num_nights)
+    start_dates = [
+        earliest_check_in + timedelta(days=i)
+        for i in range((last_check_in - earliest_check_in).days + 1)
+    ]
+
+    # Resorts that have chart data for any year the window touches
+    window_years = set(range(earliest_check_in.year, latest_check_out.year + 1))
+    resorts_with_charts = {c["resort"] for c in get_available_charts() if c["year"] in window_years}
+
+    resort_name_map = {r["slug"]: r["name"] for r in load_resorts()}
+
+    # Window totals per (resort, room), computed once for all contracts
+    window_totals: dict[str, list[tuple[str, list[int | None]]]] = {}
+    for resort_slug in sorted(resorts_with_charts):
+        room_keys: set[str] = set()
+        for year in window_years:
+            compiled = load_compiled_chart(resort_slug, year)
+            if compiled is not None:
+                room_keys.update(compiled["room_keys"])
+        window_totals[resort_slug] = [
+            (
+                room_key,
+                _window_totals(
+                    get_nightly_costs(resort_slug, room_key, earliest_check_in, latest_check_out),
+                    num_nights,
+                ),
+            )
+            for room_key in sorted(room_keys)
+        ]
+
+    index = build_contract_index(point_balances, reservations)
+
+    results = []
+    resorts_checked: set[str] = set()
+    resorts_skipped: set[str] = set()
+
+    for contract in contracts:
+        contract_id = contract["id"]
+        entry = get_contract_entry(index, contract_id)
+
+        # Available points only change when the check-in moves into another use year
+        available_by_uy: dict[int, int] = {}
+        budgets = []
+        for start in start_dates:
+            use_year = get_current_use_year(contract["use_year_month"], as_of=start)
+            if use_year not in available_by_uy:
+                available_by_uy[use_year] = get_contract_availability(
+                    contract_id=contract_id,
+                    use_year_month=contract["use_year_month"],
+                    annual_points=contract["annual_points"],
+                    point_balances=entry["balances"],
+                    reservations=entry["reservations"],
+                    target_date=start,
+                    contract_entry=entry,
+                )["available_points"]
+            budgets.append(available_by_uy[use_year])
+
+        if max(budgets, default=0) <= 0:
+            continue
+
+        contract_name = contract.get("name") or contract.get("home_resort", "Unknown")
+        eligible = get_eligible_resorts(contract["home_resort"], contract["purchase_type"])
+
+        for resort_slug in eligible:
+            if resort_slug not in resorts_with_charts:
+                resorts_skipped.add(resort_slug)
+                continue
+
+            resorts_checked.add(resort_slug)
+
+            for room_key, totals in window_totals[resort_slug]:
+                best = None
+                for i, total_points in enumerate(totals):
+                    if total_points is None or total_points > budgets[i]:
+                        continue
+                    if best is None or total_points < totals[best]:
+                        best = i
+                if best is None:
+                    continue
+
+                total_points = totals[best]
+                check_in = start_dates[best]
+                results.append(
+                    {
+                        "contract_id": contract_id,
+                        "contract_name": contract_name,
+                        "available_points": budgets[best],
+                        "resort": resort_slug,
+                        "resort_name": resort_name_map.get(resort_slug, resort_slug),
+                        "room_key": room_key,
+                        "check_in": check_in.isoformat(),
+                        "check_out": (check_in + timedelta(days=num_nights)).isoformat(),
+                        "total_points": total_points,
+                        "num_nights": num_nights,
+                        "points_remaining": budgets[best] - total_points,
+                        "nightly_avg": round(total_points / num_nights),
+                    }
+                )
+
+    # Cheapest first, earliest check-in on ties (stable for the rest)
+    results.sort(key=lambda r: (r["total_points"], r["check_in"]))
+
+    return {
+        "earliest_check_in": earliest_check_in.isoformat(),
+        "latest_check_out": latest_check_out.isoformat(),
+        "num_nights": num_nights,
+        "options": results[:limit],
+        "resorts_checked": sorted(resorts_checked),
+        "resorts_skipped": sorted(resorts_skipped),
+        "total_options": len(results),
+    }
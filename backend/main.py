@@ -6,6 +6,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from backend.api.admin import router as admin_router
 from backend.api.availability import router as availability_router
 from backend.api.booking_windows import router as booking_windows_router
 from backend.api.contracts import router as contracts_router
@@ -16,6 +17,8 @@ from backend.api.errors import (
     handle_pydantic_validation,
     handle_unhandled,
 )
+from backend.api.exports import router as exports_router
+from backend.api.forecast import router as forecast_router
 from backend.api.point_charts import router as point_charts_router
 from backend.api.points import router as points_router
 from backend.api.reservations import router as reservations_router
@@ -23,8 +26,10 @@ from backend.api.scenarios import router as scenarios_router
 from backend.api.settings import router as settings_router
 from backend.api.trip_explorer import router as trip_explorer_router
 from backend.config import get_settings
-from backend.data.resorts import load_resorts
+from backend.data.point_charts import load_chart_catalog
+from backend.data.resorts import load_resort_registry, load_resorts
 from backend.db.database import Base, engine
+from backend.engine.simulation import shutdown_simulation_pool, start_simulation_pool
 from backend.spa import SPAStaticFiles
 
 settings = get_settings()
@@ -35,7 +40,17 @@ async def lifespan(app: FastAPI):
     # Create tables on startup (dev convenience; production uses Alembic)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Index resorts and parse, compile and check every point chart before the
+    # first request needs them
+    load_resort_registry()
+    # One simulation pool for the process; its workers map the same charts,
+    # so write charts.bin first if it is missing or stale
+    pooled = settings.simulation_workers != 1
+    catalog = load_chart_catalog(write_artifact=pooled)
+    if pooled:
+        start_simulation_pool(settings.simulation_workers or None, catalog)
     yield
+    shutdown_simulation_pool()
 
 
 app = FastAPI(title="DVC Dashboard API", version="0.1.0", lifespan=lifespan)
@@ -52,6 +67,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor for the next page of reservation listings
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(contracts_router)
@@ -63,6 +80,9 @@ app.include_router(trip_explorer_router)
 app.include_router(settings_router)
 app.include_router(booking_windows_router)
 app.include_router(scenarios_router)
+app.include_router(forecast_router)
+app.include_router(admin_router)
+app.include_router(exports_router)
 
 
 @app.get("/api/health")
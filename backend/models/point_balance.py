@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from backend.db.database import Base
@@ -16,6 +16,16 @@ class PointAllocationType(enum.StrEnum):
 
 class PointBalance(Base):
     __tablename__ = "point_balances"
+    __table_args__ = (
+        # One row per contract + use year + allocation type; also serves contract_id lookups
+        Index(
+            "uq_point_balances_contract_use_year_type",
+            "contract_id",
+            "use_year",
+            "allocation_type",
+            unique=True,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from backend.db.database import Base
@@ -15,6 +15,14 @@ class ReservationStatus(enum.StrEnum):
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        # Per-contract listings and availability, ordered by check-in
+        Index("ix_reservations_contract_id_check_in", "contract_id", "check_in"),
+        # Status-filtered listings ordered by check-in
+        Index("ix_reservations_status_check_in", "status", "check_in"),
+        # Upcoming (check_in >= today) scans and global check-in ordering
+        Index("ix_reservations_check_in", "check_in"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
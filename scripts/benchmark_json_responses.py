@@ -0,0 +1,102 @@
+"""Compare JSON serialization cost of a 1,000-option trip explorer response.
+
+Builds a real find_affordable_options() result from the shipped charts and
+enough synthetic contracts to reach 1,000 options. It then times the
+default FastAPI path (jsonable_encoder, then JSONResponse) against
+FastJSONResponse with orjson (if installed) and with the stdlib fallback.
+
+Usage:
+    python scripts/benchmark_json_responses.py [--options 1000] [--runs 500]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.api import responses
+from backend.api.responses import FastJSONResponse
+from backend.engine.trip_explorer import find_affordable_options
+
+CHECK_IN = date(2026, 7, 6)
+CHECK_OUT = date(2026, 7, 9)
+
+
+def build_response(num_options: int) -> dict:
+    """A trip explorer result trimmed to num_options options."""
+    contracts = []
+    balances = []
+    result: dict = {"options": []}
+    while len(result["options"]) < num_options:
+        cid = len(contracts) + 1
+        contracts.append(
+            {
+                "id": cid,
+                "name": f"Contract {cid}",
+                "home_resort": "polynesian",
+                "use_year_month": 6,
+                "annual_points": 2000,
+                "purchase_type": "direct",
+            }
+        )
+        balances.append(
+            {"contract_id": cid, "use_year": 2026, "allocation_type": "current", "points": 2000}
+        )
+        result = find_affordable_options(contracts, balances, [], CHECK_IN, CHECK_OUT)
+    result["options"] = result["options"][:num_options]
+    result["total_options"] = num_options
+    return result
+
+
+def measure(render, content: dict, runs: int) -> tuple[float, float, int]:
+    """p50 and p99 in milliseconds, and the body size."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        body = render(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    cuts = statistics.quantiles(timings, n=100)
+    return cuts[49], cuts[98], len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--options", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    content = build_response(args.options)
+    orjson = responses.orjson
+
+    def fast_stdlib(c: dict) -> bytes:
+        responses.orjson = None
+        try:
+            return FastJSONResponse(c).body
+        finally:
+            responses.orjson = orjson
+
+    paths = [
+        ("jsonable_encoder + JSONResponse", lambda c: JSONResponse(jsonable_encoder(c)).body),
+        ("FastJSONResponse (stdlib json)", fast_stdlib),
+    ]
+    if orjson is not None:
+        paths.append(("FastJSONResponse (orjson)", lambda c: FastJSONResponse(c).body))
+    else:
+        print("orjson is not installed; only the stdlib fallback is measured\n")
+
+    print(f"{len(content['options'])} options, {args.runs} runs\n")
+    print(f"{'path':<34} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>9}")
+    for name, render in paths:
+        p50, p99, size = measure(render, content, args.runs)
+        print(f"{name:<34} {p50:>8.2f} {p99:>8.2f} {size:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Compare SQLite query plans and timings for hot queries with and without indexes.
+
+Seeds a throwaway database with 100k reservations, then runs the queries the
+reservations, availability, points and booking-windows routers issue, first
+without the indexes from migration 5f3b2c8e91d4 and then with them.
+
+Usage:
+    python scripts/benchmark_query_plans.py [--reservations 100000] [--contracts 50]
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.db.database import Base
+from backend.models import PointBalance, Reservation
+
+TODAY = date(2026, 6, 1).isoformat()
+
+QUERIES = [
+    (
+        "reservations by contract (list_contract_reservations)",
+        "SELECT * FROM reservations WHERE contract_id = :cid ORDER BY check_in",
+    ),
+    (
+        "active reservations by contract (preview)",
+        "SELECT * FROM reservations WHERE contract_id = :cid AND status != 'cancelled'",
+    ),
+    (
+        "reservations by status (list_reservations?status=)",
+        "SELECT * FROM reservations WHERE status = 'pending' ORDER BY check_in",
+    ),
+    (
+        "upcoming active reservations (booking windows)",
+        "SELECT * FROM reservations WHERE status != 'cancelled' AND check_in >= :today",
+    ),
+    (
+        "balances by contract (get_contract_points)",
+        "SELECT * FROM point_balances WHERE contract_id = :cid ORDER BY use_year, allocation_type",
+    ),
+]
+
+
+def seed(path: Path, num_contracts: int, num_reservations: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO contracts (id, name, home_resort, use_year_month, annual_points, purchase_type)"
+        " VALUES (?, ?, 'polynesian', 6, 160, 'direct')",
+        [(cid, f"Contract {cid}") for cid in range(1, num_contracts + 1)],
+    )
+    conn.executemany(
+        "INSERT INTO point_balances (contract_id, use_year, allocation_type, points)"
+        " VALUES (?, ?, ?, 160)",
+        [
+            (cid, year, alloc)
+            for cid in range(1, num_contracts + 1)
+            for year in range(2010, 2036)
+            for alloc in ("current", "banked")
+        ],
+    )
+    first_day = date(2000, 1, 1)
+    rows = []
+    for _ in range(num_reservations):
+        check_in = first_day + timedelta(days=rng.randrange(365 * 28))
+        rows.append(
+            (
+                rng.randint(1, num_contracts),
+                check_in.isoformat(),
+                (check_in + timedelta(days=rng.randint(1, 7))).isoformat(),
+                rng.randint(10, 300),
+                rng.choices(["confirmed", "pending", "cancelled"], weights=[85, 5, 10])[0],
+            )
+        )
+    conn.executemany(
+        "INSERT INTO reservations (contract_id, resort, room_key, check_in, check_out,"
+        " points_cost, status) VALUES (?, 'polynesian', 'deluxe_studio_standard', ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def index_names() -> list[str]:
+    return [
+        index.name
+        for table in (PointBalance.__table__, Reservation.__table__)
+        for index in table.indexes
+    ]
+
+
+def measure(conn: sqlite3.Connection, sql: str, runs: int) -> tuple[str, float]:
+    params = {"cid": 7, "today": TODAY}
+    plan = "; ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return plan, statistics.median(timings)
+
+
+def run(conn: sqlite3.Connection, runs: int) -> list[tuple[str, float]]:
+    conn.execute("ANALYZE")
+    return [measure(conn, sql, runs) for _, sql in QUERIES]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reservations", type=int, default=100_000)
+    parser.add_argument("--contracts", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "benchmark.db"
+        seed(path, args.contracts, args.reservations)
+        conn = sqlite3.connect(path)
+
+        # Schema from the models includes the indexes; drop them for the baseline
+        placeholders = ",".join("?" * len(index_names()))
+        saved = conn.execute(
+            f"SELECT sql FROM sqlite_master WHERE type = 'index' AND name IN ({placeholders})",
+            index_names(),
+        ).fetchall()
+        for name in index_names():
+            conn.execute(f"DROP INDEX {name}")
+        before = run(conn, args.runs)
+
+        for (sql,) in saved:
+            conn.execute(sql)
+        after = run(conn, args.runs)
+        conn.close()
+
+    print(
+        f"{args.reservations} reservations, {args.contracts} contracts, median of {args.runs} runs\n"
+    )
+    for (label, _), (plan_before, ms_before), (plan_after, ms_after) in zip(
+        QUERIES, before, after, strict=True
+    ):
+        print(label)
+        print(f"  before: {ms_before:8.2f} ms  {plan_before}")
+        print(f"  after:  {ms_after:8.2f} ms  {plan_after}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compile every point chart into the binary artifact the server memory-maps at startup.
+
+Parses, compiles and coverage-checks data/point_charts/*.json exactly like the
+server does, then writes data/point_charts/charts.bin (see
+write_chart_artifact for the layout). With a current artifact, startup and
+POST /api/admin/charts/reload map it instead of parsing and compiling JSON,
+and every uvicorn worker shares the same pages. An artifact older than any
+chart file is ignored, so after editing charts either re-run this or let the
+server fall back to JSON.
+
+Usage:
+    python scripts/build_chart_artifact.py [--charts-dir data/point_charts] [--check]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.data.point_charts import (
+    ARTIFACT_NAME,
+    CHARTS_DIR,
+    build_chart_catalog,
+    read_chart_artifact,
+    write_chart_artifact,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts-dir", type=Path, default=CHARTS_DIR)
+    parser.add_argument(
+        "--check", action="store_true", help="exit 1 if the artifact is missing or stale"
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        if read_chart_artifact(args.charts_dir) is None:
+            print(f"{args.charts_dir / ARTIFACT_NAME} is missing or out of date")
+            return 1
+        print(f"{args.charts_dir / ARTIFACT_NAME} is up to date")
+        return 0
+
+    catalog = build_chart_catalog(args.charts_dir)
+    path = write_chart_artifact(catalog, args.charts_dir)
+    print(f"Wrote {path} ({path.stat().st_size:,} bytes, {len(catalog.entries)} charts)")
+    for name, reason in catalog.skipped.items():
+        print(f"  skipped {name}: {reason}")
+    for (resort, year), problems in catalog.problems.items():
+        for problem in problems:
+            print(f"  {resort}_{year}: {problem}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
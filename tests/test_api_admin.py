@@ -0,0 +1,116 @@
+import json
+import shutil
+
+import pytest
+
+from backend.data import point_charts, resorts
+from backend.data.point_charts import get_chart_catalog, publish_chart_catalog
+from backend.data.resorts import get_resort_registry, publish_resort_registry
+
+STAY = {
+    "resort": "polynesian",
+    "room_key": "deluxe_studio_standard",
+    "check_in": "2026-01-05",
+    "check_out": "2026-01-07",
+}
+
+
+@pytest.fixture
+def chart_dir(tmp_path, monkeypatch):
+    """A copy of the shipped charts that reloads read from; the original catalog is restored."""
+    catalog = get_chart_catalog()
+    registry = get_resort_registry()
+    for path in point_charts.CHARTS_DIR.glob("*.json"):
+        shutil.copy(path, tmp_path / path.name)
+    monkeypatch.setattr(point_charts, "CHARTS_DIR", tmp_path)
+    yield tmp_path
+    publish_chart_catalog(catalog)
+    publish_resort_registry(registry)
+
+
+def _set_studio_weekday_points(chart_dir, points):
+    path = chart_dir / "polynesian_2026.json"
+    chart = json.loads(path.read_text())
+    for season in chart["seasons"]:
+        season["rooms"]["deluxe_studio_standard"]["weekday"] = points
+    path.write_text(json.dumps(chart))
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_in_new_chart_data(client, chart_dir):
+    before = await client.post("/api/point-charts/calculate", json=STAY)
+    old_version = get_chart_catalog().version
+
+    _set_studio_weekday_points(chart_dir, 99)
+    resp = await client.post("/api/admin/charts/reload")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["version"] > old_version
+    assert data["resorts"] == 17
+    assert {c["resort"] for c in data["charts"]} == {"polynesian", "riviera"}
+    assert data["problems"] == {}
+    assert data["skipped"] == {}
+
+    after = await client.post("/api/point-charts/calculate", json=STAY)
+    assert before.json()["total_points"] != after.json()["total_points"]
+    assert after.json()["total_points"] == 99 * 2
+
+
+@pytest.mark.asyncio
+async def test_reload_reports_bad_and_gappy_charts(client, chart_dir):
+    (chart_dir / "broken_2026.json").write_text("{")
+    path = chart_dir / "riviera_2026.json"
+    chart = json.loads(path.read_text())
+    chart["seasons"] = chart["seasons"][1:]
+    path.write_text(json.dumps(chart))
+
+    resp = await client.post("/api/admin/charts/reload")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert list(data["skipped"]) == ["broken_2026.json"]
+    assert data["problems"]["riviera_2026"][0].startswith("gap ")
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_data_when_resorts_unreadable(client, chart_dir, tmp_path, monkeypatch):
+    bad = tmp_path / "resorts.json"
+    bad.write_text("not json")
+    monkeypatch.setattr(resorts, "RESORTS_FILE", bad)
+    catalog = get_chart_catalog()
+
+    resp = await client.post("/api/admin/charts/reload")
+
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "resorts.json"
+    assert get_chart_catalog() is catalog
+
+
+@pytest.mark.asyncio
+async def test_reload_reprices_scenario_sessions(client, chart_dir):
+    resp = await client.post(
+        "/api/contracts/",
+        json={
+            "home_resort": "polynesian",
+            "use_year_month": 6,
+            "annual_points": 200,
+            "purchase_type": "direct",
+        },
+    )
+    contract_id = resp.json()["id"]
+    booking = {
+        "contract_id": contract_id,
+        "resort": "polynesian",
+        "room_key": "deluxe_studio_standard",
+        "check_in": "2026-01-05",
+        "check_out": "2026-01-07",
+    }
+    resp = await client.post("/api/scenarios/sessions", json={"hypothetical_bookings": [booking]})
+    scenario_id = resp.json()["scenario_id"]
+
+    _set_studio_weekday_points(chart_dir, 99)
+    await client.post("/api/admin/charts/reload")
+
+    resp = await client.get(f"/api/scenarios/sessions/{scenario_id}")
+    assert resp.json()["resolved_bookings"][0]["points_cost"] == 99 * 2
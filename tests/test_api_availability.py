@@ -252,3 +252,57 @@ async def test_availability_missing_target_date_fields(client):
     assert body["error"]["type"] == "VALIDATION_ERROR"
     field_names = [f["field"] for f in body["error"]["fields"]]
     assert "target_date" in field_names
+
+
+# --- Batch availability tests ---
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_date_requests(client):
+    """Each batch result equals the single-date endpoint for that date."""
+    cid = await _create_contract(client, POLY_CONTRACT)
+    await _add_points(client, cid, 2025, "current", 160)
+    await _add_points(client, cid, 2026, "current", 160)
+    await _create_reservation(client, cid)
+
+    dates = ["2026-03-15", "2026-06-01", "2026-12-31"]
+    resp = await client.get("/api/availability/batch", params={"dates": dates})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["dates"] == dates
+    assert len(data["results"]) == 3
+
+    for target_date, batch_result in zip(dates, data["results"], strict=True):
+        single = await client.get(f"/api/availability?target_date={target_date}")
+        assert batch_result == single.json()
+
+
+@pytest.mark.asyncio
+async def test_batch_range_with_step(client):
+    """start/end/step_days expands to an inclusive date range."""
+    resp = await client.get("/api/availability/batch?start=2026-01-01&end=2026-01-31&step_days=10")
+    assert resp.status_code == 200
+    assert resp.json()["dates"] == ["2026-01-01", "2026-01-11", "2026-01-21", "2026-01-31"]
+
+
+@pytest.mark.asyncio
+async def test_batch_requires_dates_or_range(client):
+    """No dates and no range -> 422."""
+    resp = await client.get("/api/availability/batch")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["type"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_batch_range_too_long(client):
+    """A range producing more than 366 dates -> 422."""
+    resp = await client.get("/api/availability/batch?start=2026-01-01&end=2027-12-31")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "end"
+
+
+@pytest.mark.asyncio
+async def test_batch_year_out_of_range(client):
+    """Dates outside 2020-2040 -> 422."""
+    resp = await client.get("/api/availability/batch?dates=2019-12-31")
+    assert resp.status_code == 422
@@ -214,3 +214,93 @@ async def test_already_open_windows_excluded(client):
     assert resp.status_code == 200
     # Both 11-month and 7-month windows have already opened for a 3-month-out check-in
     assert resp.json() == []
+
+
+# --- Calendar ---
+
+
+@pytest.mark.asyncio
+async def test_calendar_lists_windows_in_horizon(client):
+    """Home and any-resort windows for a home-resort stay, oldest first."""
+    cid = await _create_contract(client)
+    await _create_reservation(client, cid, check_in="2027-03-15", check_out="2027-03-18")
+    await _create_reservation(
+        client, cid, resort="grand_floridian", check_in="2027-01-10", check_out="2027-01-12"
+    )
+
+    resp = await client.get("/api/booking-windows/calendar?start=2026-04-01&days=365")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["start"] == "2026-04-01"
+    assert data["end"] == "2027-03-31"
+    assert data["total"] == 3
+    assert [(w["window_type"], w["window_date"]) for w in data["windows"]] == [
+        ("home_resort", "2026-04-15"),
+        ("any_resort", "2026-06-10"),
+        ("any_resort", "2026-08-15"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_calendar_pagination(client):
+    cid = await _create_contract(client)
+    for day in range(1, 6):
+        await _create_reservation(
+            client, cid, check_in=f"2027-03-{day:02d}", check_out=f"2027-03-{day + 1:02d}"
+        )
+
+    resp = await client.get("/api/booking-windows/calendar?start=2026-04-01&offset=3&limit=4")
+    data = resp.json()
+    assert data["total"] == 10
+    assert data["offset"] == 3
+    assert len(data["windows"]) == 4
+    assert data["windows"][0]["window_date"] == "2026-04-04"
+
+
+@pytest.mark.asyncio
+async def test_calendar_horizon_out_of_range(client):
+    resp = await client.get("/api/booking-windows/calendar?days=800")
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_calendar_start_out_of_range(client):
+    """A start near date.max must not overflow the horizon arithmetic."""
+    resp = await client.get("/api/booking-windows/calendar?start=9999-12-01&days=60")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"] == [
+        {"field": "start", "issue": "Year must be between 2020 and 2040"}
+    ]
+
+
+# --- Stays opening on a date ---
+
+
+@pytest.mark.asyncio
+async def test_stays_opening_on_date(client):
+    """Direct contract: 7-month check-ins are priced at every resort with charts."""
+    await _create_contract(client, purchase_type="direct")
+
+    resp = await client.get("/api/booking-windows/opening?date=2026-03-01&nights=3")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["any_resort_check_ins"] == ["2026-09-29", "2026-09-30", "2026-10-01"]
+    assert data["home_resort_check_ins"] == ["2027-01-29", "2027-01-30", "2027-01-31", "2027-02-01"]
+    assert {(s["check_in"], s["resort"]) for s in data["stays"]} == {
+        (day, resort)
+        for day in data["any_resort_check_ins"]
+        for resort in ("polynesian", "riviera")
+    }
+
+
+@pytest.mark.asyncio
+async def test_stays_opening_no_contracts(client):
+    resp = await client.get("/api/booking-windows/opening?date=2026-03-01")
+    assert resp.status_code == 200
+    assert resp.json()["stays"] == []
+
+
+@pytest.mark.asyncio
+async def test_stays_opening_date_out_of_range(client):
+    resp = await client.get("/api/booking-windows/opening?date=2050-01-01")
+    assert resp.status_code == 422
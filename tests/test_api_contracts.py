@@ -62,6 +62,27 @@ async def test_list_contracts(client):
     assert "point_balances" in contract
 
 
+@pytest.mark.asyncio
+async def test_list_contracts_groups_balances(client):
+    """Each contract lists its own balances, serialized like the create responses."""
+    first = (await client.post("/api/contracts/", json=VALID_CONTRACT)).json()
+    second = (await client.post("/api/contracts/", json={**VALID_CONTRACT, "name": "Two"})).json()
+    balances = []
+    for use_year in (2025, 2026):
+        resp = await client.post(
+            f"/api/contracts/{second['id']}/points",
+            json={"use_year": use_year, "allocation_type": "current", "points": 160},
+        )
+        balances.append(resp.json())
+
+    data = (await client.get("/api/contracts/")).json()
+    assert [c["id"] for c in data] == [first["id"], second["id"]]
+    assert data[0]["point_balances"] == []
+    assert data[0]["created_at"] == first["created_at"]
+    assert data[1]["point_balances"] == balances
+    assert data[1] == (await client.get(f"/api/contracts/{second['id']}")).json()
+
+
 @pytest.mark.asyncio
 async def test_get_contract_by_id(client):
     """GET /api/contracts/{id} -> returns contract with details."""
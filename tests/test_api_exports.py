@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+
+import pytest
+
+from backend.api import exports
+
+CONTRACT = {
+    "home_resort": "polynesian",
+    "use_year_month": 6,
+    "annual_points": 160,
+    "purchase_type": "direct",
+    "name": "Poly Contract",
+}
+
+
+async def _seed(client, reservations=3):
+    resp = await client.post("/api/contracts/", json=CONTRACT)
+    contract_id = resp.json()["id"]
+    await client.post(
+        f"/api/contracts/{contract_id}/points",
+        json={"use_year": 2025, "allocation_type": "current", "points": 160},
+    )
+    for i in range(reservations):
+        resp = await client.post(
+            f"/api/contracts/{contract_id}/reservations",
+            json={
+                "resort": "polynesian",
+                "room_key": "deluxe_studio_standard",
+                "check_in": f"2026-03-{10 + i:02d}",
+                "check_out": f"2026-03-{11 + i:02d}",
+                "points_cost": 10,
+                "notes": 'late, "quiet" room' if i == 0 else None,
+            },
+        )
+        assert resp.status_code == 201
+    return contract_id
+
+
+@pytest.mark.asyncio
+async def test_export_reservations_ndjson_in_batches(client, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    contract_id = await _seed(client, reservations=5)
+
+    resp = await client.get("/api/export/reservations")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["check_in"] for r in rows] == [f"2026-03-{d}" for d in range(10, 15)]
+    assert rows[0]["contract_id"] == contract_id
+    assert rows[0]["notes"] == 'late, "quiet" room'
+    assert rows[1]["notes"] is None
+
+
+@pytest.mark.asyncio
+async def test_export_reservations_csv(client):
+    await _seed(client)
+    resp = await client.get("/api/export/reservations?format=csv&status=confirmed")
+    assert resp.headers["content-disposition"] == 'attachment; filename="reservations.csv"'
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 3
+    assert rows[0]["notes"] == 'late, "quiet" room'
+    assert rows[0]["points_cost"] == "10"
+
+
+@pytest.mark.asyncio
+async def test_export_empty_csv_has_header(client):
+    resp = await client.get("/api/export/points?format=csv")
+    assert resp.text.splitlines() == ["id,contract_id,use_year,allocation_type,points,updated_at"]
+
+
+@pytest.mark.asyncio
+async def test_export_availability(client):
+    await _seed(client)
+    resp = await client.get(
+        "/api/export/availability?start=2026-03-01&end=2026-03-31&step_days=10&format=csv"
+    )
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["date"] for r in rows] == ["2026-03-01", "2026-03-11", "2026-03-21", "2026-03-31"]
+    assert rows[0]["current"] == "160"
+    assert rows[0]["committed_points"] == "30"
+    assert rows[0]["available_points"] == "130"
+
+
+@pytest.mark.asyncio
+async def test_export_availability_bad_range(client):
+    resp = await client.get("/api/export/availability?start=2026-03-10&end=2026-03-01")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "end"
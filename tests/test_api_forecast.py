@@ -0,0 +1,143 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from backend.api import forecast
+
+CONTRACT = {
+    "home_resort": "polynesian",
+    "use_year_month": 12,
+    "annual_points": 200,
+    "purchase_type": "direct",
+    "name": "Poly Contract",
+}
+
+
+async def _create_contract(client):
+    resp = await client.post("/api/contracts/", json=CONTRACT)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_forecast_empty(client):
+    resp = await client.get("/api/forecast?as_of=2026-03-01")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["years"] == 5
+    assert data["contracts"] == []
+    assert data["summary"]["expired"] == 0
+
+
+@pytest.mark.asyncio
+async def test_forecast_contract(client):
+    contract_id = await _create_contract(client)
+    resp = await client.post(
+        f"/api/contracts/{contract_id}/points",
+        json={"use_year": 2025, "allocation_type": "current", "points": 200},
+    )
+    assert resp.status_code == 201
+
+    resp = await client.get("/api/forecast?as_of=2026-03-01&years=2")
+    assert resp.status_code == 200
+    forecast = resp.json()["contracts"][0]
+    assert forecast["contract_id"] == contract_id
+    assert len(forecast["months"]) == 21
+    assert forecast["totals"]["banked"] == 400
+
+
+@pytest.mark.asyncio
+async def test_forecast_uses_borrowing_limit_setting(client):
+    contract_id = await _create_contract(client)
+    await client.put("/api/settings/borrowing_limit_pct", json={"value": "50"})
+    resp = await client.post(
+        f"/api/contracts/{contract_id}/reservations",
+        json={
+            "resort": "polynesian",
+            "room_key": "deluxe_studio_standard",
+            "check_in": "2026-03-09",
+            "check_out": "2026-03-16",
+            "points_cost": 150,
+        },
+    )
+    assert resp.status_code == 201
+
+    resp = await client.get("/api/forecast?as_of=2026-03-01&years=1")
+    totals = resp.json()["contracts"][0]["totals"]
+    assert totals["borrowed"] == 100
+    assert totals["shortfall"] == 50
+
+
+@pytest.mark.asyncio
+async def test_forecast_years_out_of_range(client):
+    resp = await client.get("/api/forecast?years=11")
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_forecast_as_of_out_of_range(client):
+    resp = await client.get("/api/forecast?as_of=2050-01-01")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "as_of"
+
+
+# --- Trip-plan simulation ---
+
+TRIP = {"month": 7, "nights": 5, "room_key": "deluxe_studio_standard"}
+
+
+@pytest.mark.asyncio
+async def test_simulate_trip_pattern(client):
+    contract_id = await _create_contract(client)
+    resp = await client.post(
+        "/api/forecast/simulate",
+        json={"trips": [TRIP], "years": 2, "samples": 100, "seed": 5, "as_of": "2026-03-01"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["seed"] == 5
+    assert data["samples"] == 100
+    assert data["contracts"][0]["contract_id"] == contract_id
+    assert data["summary"]["trips_per_plan"] == 2
+    assert set(data["summary"]["expired"]) == {"mean", "p50", "p90", "p95", "max"}
+
+    again = await client.post(
+        "/api/forecast/simulate",
+        json={"trips": [TRIP], "years": 2, "samples": 100, "seed": 5, "as_of": "2026-03-01"},
+    )
+    assert again.json() == data
+
+
+@pytest.mark.asyncio
+async def test_simulate_validation_errors(client):
+    resp = await client.post(
+        "/api/forecast/simulate",
+        json={
+            "trips": [
+                {**TRIP, "contract_id": 999},
+                {**TRIP, "resorts": ["atlantis"]},
+                {**TRIP, "room_key": "penthouse"},
+            ],
+            "samples": 100,
+        },
+    )
+    assert resp.status_code == 422
+    fields = [f["field"] for f in resp.json()["error"]["fields"]]
+    assert fields == ["trips[0].contract_id", "trips[1].resorts", "trips[2].room_key"]
+
+
+@pytest.mark.asyncio
+async def test_simulate_samples_out_of_range(client):
+    resp = await client.post("/api/forecast/simulate", json={"trips": [TRIP], "samples": 10})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_simulate_broken_pool_is_503(client, monkeypatch):
+    def broken(**kwargs):
+        raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(forecast, "simulate_trip_plans", broken)
+    resp = await client.post("/api/forecast/simulate", json={"trips": [TRIP], "samples": 100})
+    assert resp.status_code == 503
+    assert resp.json()["error"]["type"] == "SERVICE_UNAVAILABLE"
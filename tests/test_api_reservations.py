@@ -1,5 +1,9 @@
+import json
+
 import pytest
 
+from backend.api.reservation_import import import_reservations, iter_import_rows
+
 VALID_CONTRACT = {
     "home_resort": "polynesian",
     "use_year_month": 6,
@@ -423,3 +427,196 @@ async def test_preview_nonexistent_contract(client):
     assert resp.status_code == 404
     body = resp.json()
     assert body["error"]["type"] == "NOT_FOUND"
+
+
+# --- Bulk import ---
+
+
+@pytest.mark.asyncio
+async def test_import_csv_reports_bad_rows_and_keeps_good_ones(client):
+    cid = await _create_contract(client)
+    body = (
+        "contract_id,resort,room_key,check_in,check_out,points_cost,notes\n"
+        f"{cid},polynesian,deluxe_studio_standard,2026-03-15,2026-03-20,85,\n"
+        f'{cid},polynesian,deluxe_studio_standard,2026-04-01,2026-04-03,30,"two\nlines"\n'
+        f"999,polynesian,deluxe_studio_standard,2026-05-01,2026-05-03,30,\n"
+        f"{cid},riviera,deluxe_studio_standard,2026-05-01,2026-05-03,30,\n"
+        f"{cid},polynesian,deluxe_studio_standard,2026-06-03,2026-06-01,30,\n"
+        f"{cid},polynesian\n"
+    )
+    resp = await client.post("/api/reservations/import?format=csv", content=body)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["rows"] == 6
+    assert report["imported"] == 2
+    assert [(e["line"], e["field"]) for e in report["errors"]] == [
+        (5, "contract_id"),
+        (6, "resort"),
+        (7, "check_out"),
+        (8, "row"),
+    ]
+
+    listed = (await client.get(f"/api/contracts/{cid}/reservations")).json()
+    assert [r["points_cost"] for r in listed] == [85, 30]
+    assert listed[1]["notes"] == "two\nlines"
+
+
+@pytest.mark.asyncio
+async def test_import_csv_stray_quote_stays_on_its_line(client):
+    """A quote inside an unquoted value doesn't swallow the following lines."""
+    cid = await _create_contract(client)
+    body = (
+        "contract_id,resort,room_key,check_in,check_out,points_cost,notes\n"
+        f'{cid},polynesian,deluxe_studio_standard,2026-03-15,2026-03-20,85,the 6" bed\n'
+        f'{cid},polynesian,deluxe_studio_standard,2026-04-01,2026-04-03,30,"bad"quote\n'
+        f"{cid},polynesian,deluxe_studio_standard,2026-05-01,2026-05-03,30,\n"
+    )
+    report = (await client.post("/api/reservations/import", content=body)).json()
+    assert report["rows"] == 3
+    assert report["imported"] == 2
+    assert [(e["line"], e["field"]) for e in report["errors"]] == [(3, "row")]
+
+    listed = (await client.get(f"/api/contracts/{cid}/reservations")).json()
+    assert [r["notes"] for r in listed] == ['the 6" bed', None]
+
+
+@pytest.mark.asyncio
+async def test_import_lists_only_the_first_errors(db_session):
+    async def lines():
+        for i in range(7):
+            yield "[1]" if i % 2 else json.dumps({**VALID_RESERVATION, "contract_id": 999})
+
+    report = await import_reservations(
+        db_session, iter_import_rows(lines(), "ndjson"), chunk_size=3, max_errors=3
+    )
+    assert [(e["line"], e["field"]) for e in report["errors"]] == [
+        (1, "contract_id"),
+        (2, "row"),
+        (3, "contract_id"),
+    ]
+    assert report["error_count"] == 7
+    assert report["truncated"] is True
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_prices_from_charts(client):
+    cid = await _create_contract(client)
+    rows = [
+        {**VALID_RESERVATION, "contract_id": cid, "points_cost": None},
+        {**VALID_RESERVATION, "contract_id": cid, "room_key": "penthouse", "points_cost": None},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n[1]\n"
+
+    resp = await client.post("/api/reservations/import?format=ndjson&price=true", content=body)
+    report = resp.json()
+    assert report["imported"] == 1
+    assert report["priced"] == 1
+    assert [(e["line"], e["field"]) for e in report["errors"]] == [(2, "points_cost"), (3, "row")]
+
+    preview = await client.post(
+        "/api/reservations/preview", json={**VALID_RESERVATION, "contract_id": cid}
+    )
+    listed = (await client.get(f"/api/contracts/{cid}/reservations")).json()
+    assert listed[0]["points_cost"] == preview.json()["total_points"]
+
+
+@pytest.mark.asyncio
+async def test_import_dry_run_inserts_nothing(client):
+    cid = await _create_contract(client)
+    body = json.dumps({**VALID_RESERVATION, "contract_id": cid})
+    resp = await client.post("/api/reservations/import?format=ndjson&dry_run=true", content=body)
+    assert resp.json()["imported"] == 1
+    assert (await client.get("/api/reservations")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_import_csv_without_required_columns(client):
+    resp = await client.post("/api/reservations/import", content="resort,check_in\n")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "file"
+
+
+# --- Keyset pagination and projection ---
+
+
+async def _create_march_reservations(client, cid, days=(15, 15, 10, 20, 25)):
+    for day in days:
+        resp = await _create_reservation(
+            client, cid, check_in=f"2026-03-{day:02d}", check_out=f"2026-03-{day + 1:02d}"
+        )
+        assert resp.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_list_reservations_keyset_pages(client):
+    cid = await _create_contract(client)
+    await _create_march_reservations(client, cid)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = await client.get("/api/reservations", params=params)
+        assert resp.status_code == 200
+        seen.extend((r["check_in"], r["id"]) for r in resp.json())
+        pages += 1
+        cursor = resp.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == sorted(seen)
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_reservations_fields_and_date_range(client):
+    cid = await _create_contract(client)
+    await _create_march_reservations(client, cid)
+
+    resp = await client.get(
+        f"/api/contracts/{cid}/reservations",
+        params={
+            "fields": "check_out,points_cost",
+            "check_in_from": "2026-03-15",
+            "check_in_to": "2026-03-20",
+            "limit": 2,
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"check_out": "2026-03-16", "points_cost": 85},
+        {"check_out": "2026-03-16", "points_cost": 85},
+    ]
+    resp = await client.get(
+        f"/api/contracts/{cid}/reservations",
+        params={
+            "fields": "check_out",
+            "check_in_from": "2026-03-15",
+            "cursor": resp.headers["x-next-cursor"],
+        },
+    )
+    assert resp.json() == [{"check_out": "2026-03-21"}, {"check_out": "2026-03-26"}]
+    assert "x-next-cursor" not in resp.headers
+
+
+@pytest.mark.asyncio
+async def test_list_reservations_bad_fields_and_cursor(client):
+    resp = await client.get("/api/reservations?fields=id,secret")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "fields"
+
+    resp = await client.get("/api/reservations?cursor=not-a-cursor")
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "cursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fields", ["", ",", " , ,"])
+async def test_list_reservations_empty_fields(client, fields):
+    resp = await client.get("/api/reservations", params={"fields": fields})
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"] == [
+        {"field": "fields", "issue": "fields must name at least one column"}
+    ]
@@ -0,0 +1,50 @@
+import json
+from datetime import date, datetime
+
+import pytest
+
+from backend.api import responses
+from backend.api.responses import FastJSONResponse, dumps
+
+CONTENT = {
+    "check_in": date(2026, 7, 6),
+    "updated_at": datetime(2026, 7, 6, 12, 30, 5, 120),
+    "by_contract": {1: "Poly", 2: "Riviera"},
+    "resorts": frozenset({"riviera", "polynesian"}),
+    "options": ({"resort_name": "Disney's Polynesian Villas & Bungalows", "avg": 18.5},),
+    "missing": None,
+}
+EXPECTED = {
+    "check_in": "2026-07-06",
+    "updated_at": "2026-07-06T12:30:05.000120",
+    "by_contract": {"1": "Poly", "2": "Riviera"},
+    "resorts": ["polynesian", "riviera"],
+    "options": [{"resort_name": "Disney's Polynesian Villas & Bungalows", "avg": 18.5}],
+    "missing": None,
+}
+
+
+def test_dumps_engine_output():
+    assert json.loads(dumps(CONTENT)) == EXPECTED
+
+
+def test_dumps_without_orjson(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+    body = dumps(CONTENT)
+    assert json.loads(body) == EXPECTED
+    assert b", " not in body
+
+
+def test_dumps_rejects_unknown_types(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+@pytest.mark.asyncio
+async def test_hot_endpoint_returns_fast_json(client):
+    resp = await client.get("/api/trip-explorer?check_in=2026-07-06&check_out=2026-07-09")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json()["options"] == []
+    assert FastJSONResponse({"a": 1}).body == b'{"a":1}'
@@ -1,3 +1,5 @@
+from datetime import date, timedelta
+
 import pytest
 
 VALID_CONTRACT = {
@@ -275,3 +277,171 @@ async def test_evaluate_ineligible_resort_structured(client):
     assert body["error"]["type"] == "VALIDATION_ERROR"
     field_names = [f["field"] for f in body["error"]["fields"]]
     assert "hypothetical_bookings[0].resort" in field_names
+
+
+# --- Scenario optimizer endpoint tests ---
+
+WANTED_STAY = {
+    "resort": "polynesian",
+    "room_key": "deluxe_studio_standard",
+    "check_in": "2026-03-09",
+    "check_out": "2026-03-12",
+}
+
+
+@pytest.mark.asyncio
+async def test_optimize_assigns_stay_to_contract(client):
+    """POST /api/scenarios/optimize -> each stay gets an eligible contract."""
+    await _create_contract_with_balance(
+        client, home_resort="riviera", purchase_type="resale", name="Riviera Resale"
+    )
+    poly_id = await _create_contract_with_balance(client)
+
+    resp = await client.post("/api/scenarios/optimize", json={"stays": [WANTED_STAY]})
+    assert resp.status_code == 200
+    data = resp.json()
+
+    stay = data["assignments"][0]
+    assert stay["assigned"] is True
+    assert stay["points_cost"] == 66
+    assert stay["allocations"] == [
+        {"contract_id": poly_id, "contract_name": "Poly Direct", "use_year": 2025, "points": 66}
+    ]
+    assert data["summary"]["stays_assigned"] == 1
+    assert data["summary"]["optimal"] is True
+    assert [u["contract_id"] for u in data["use_years"]] == [poly_id]
+    assert data["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_optimize_no_contracts(client):
+    """With no contracts, stays come back unassigned."""
+    resp = await client.post("/api/scenarios/optimize", json={"stays": [WANTED_STAY]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["assignments"][0]["assigned"] is False
+    assert data["summary"]["stays_assigned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_optimize_too_many_stays(client):
+    """More than 12 stays -> 422."""
+    resp = await client.post("/api/scenarios/optimize", json={"stays": [WANTED_STAY] * 13})
+    assert resp.status_code == 422
+    assert resp.json()["error"]["type"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_optimize_checkout_before_checkin(client):
+    """A stay with check_out before check_in -> 422."""
+    stay = {**WANTED_STAY, "check_out": "2026-03-01"}
+    resp = await client.post("/api/scenarios/optimize", json={"stays": [stay]})
+    assert resp.status_code == 422
+
+
+# --- Scenario session endpoint tests ---
+
+
+def _hypothetical(contract_id, check_in="2026-11-09", check_out="2026-11-12"):
+    return {
+        "contract_id": contract_id,
+        "resort": "polynesian",
+        "room_key": "deluxe_studio_standard",
+        "check_in": check_in,
+        "check_out": check_out,
+    }
+
+
+@pytest.mark.asyncio
+async def test_session_edits_match_evaluate(client):
+    """Add, update and remove on a session give the same result as /evaluate."""
+    cid = await _create_contract_with_balance(client)
+
+    resp = await client.post(
+        "/api/scenarios/sessions", json={"hypothetical_bookings": [_hypothetical(cid)]}
+    )
+    assert resp.status_code == 201
+    scenario_id = resp.json()["scenario_id"]
+    first_id = resp.json()["resolved_bookings"][0]["booking_id"]
+
+    resp = await client.post(
+        f"/api/scenarios/sessions/{scenario_id}/bookings",
+        json=_hypothetical(cid, "2026-12-01", "2026-12-05"),
+    )
+    assert resp.status_code == 201
+    second_id = resp.json()["resolved_bookings"][1]["booking_id"]
+
+    resp = await client.put(
+        f"/api/scenarios/sessions/{scenario_id}/bookings/{second_id}",
+        json=_hypothetical(cid, "2026-12-02", "2026-12-04"),
+    )
+    assert resp.status_code == 200
+
+    resp = await client.delete(f"/api/scenarios/sessions/{scenario_id}/bookings/{first_id}")
+    assert resp.status_code == 200
+    session = resp.json()
+    assert [b["booking_id"] for b in session["resolved_bookings"]] == [second_id]
+
+    expected = await client.post(
+        "/api/scenarios/evaluate",
+        json={"hypothetical_bookings": [_hypothetical(cid, "2026-12-02", "2026-12-04")]},
+    )
+    assert session["contracts"] == expected.json()["contracts"]
+    assert session["summary"] == expected.json()["summary"]
+
+
+@pytest.mark.asyncio
+async def test_session_sees_portfolio_writes(client):
+    """A reservation added after the session started shows up in its baseline."""
+    cid = await _create_contract_with_balance(client)
+    resp = await client.post("/api/scenarios/sessions", json={})
+    scenario_id = resp.json()["scenario_id"]
+    assert resp.json()["resolved_bookings"] == []
+
+    today = date.today().isoformat()
+    resp = await client.post(
+        f"/api/contracts/{cid}/reservations",
+        json={
+            "resort": "polynesian",
+            "room_key": "deluxe_studio_standard",
+            "check_in": today,
+            "check_out": (date.today() + timedelta(days=2)).isoformat(),
+            "points_cost": 30,
+        },
+    )
+    assert resp.status_code == 201
+
+    resp = await client.get(f"/api/scenarios/sessions/{scenario_id}")
+    assert resp.status_code == 200
+    assert resp.json()["contracts"][0]["baseline_committed"] == 30
+
+
+@pytest.mark.asyncio
+async def test_session_validates_eligibility(client):
+    """Adding a booking for an ineligible resort -> 422 naming the field."""
+    cid = await _create_contract_with_balance(
+        client, home_resort="riviera", purchase_type="resale", name="Riviera Resale"
+    )
+    scenario_id = (await client.post("/api/scenarios/sessions", json={})).json()["scenario_id"]
+
+    resp = await client.post(
+        f"/api/scenarios/sessions/{scenario_id}/bookings", json=_hypothetical(cid)
+    )
+    assert resp.status_code == 422
+    assert resp.json()["error"]["fields"][0]["field"] == "resort"
+
+
+@pytest.mark.asyncio
+async def test_session_not_found(client):
+    """Unknown scenario or booking ids -> 404."""
+    resp = await client.get("/api/scenarios/sessions/nope")
+    assert resp.status_code == 404
+
+    scenario_id = (await client.post("/api/scenarios/sessions", json={})).json()["scenario_id"]
+    resp = await client.delete(f"/api/scenarios/sessions/{scenario_id}/bookings/99")
+    assert resp.status_code == 404
+
+    resp = await client.delete(f"/api/scenarios/sessions/{scenario_id}")
+    assert resp.status_code == 204
+    resp = await client.get(f"/api/scenarios/sessions/{scenario_id}")
+    assert resp.status_code == 404
@@ -91,3 +91,54 @@ async def test_trip_explorer_missing_dates(client):
     body = resp.json()
     assert body["error"]["type"] == "VALIDATION_ERROR"
     assert len(body["error"]["fields"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_trip_explorer_flexible_valid_window(client):
+    """GET /api/trip-explorer/flexible -> 200 with dated options."""
+    await _create_contract_with_balance(client)
+
+    resp = await client.get(
+        "/api/trip-explorer/flexible"
+        "?earliest_check_in=2026-01-05&latest_check_out=2026-01-20&num_nights=3"
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["num_nights"] == 3
+    assert data["total_options"] > 0
+    for option in data["options"]:
+        assert "2026-01-05" <= option["check_in"] <= "2026-01-17"
+        assert option["num_nights"] == 3
+
+
+@pytest.mark.asyncio
+async def test_trip_explorer_flexible_window_too_short(client):
+    """Window shorter than num_nights -> 422."""
+    resp = await client.get(
+        "/api/trip-explorer/flexible"
+        "?earliest_check_in=2026-01-05&latest_check_out=2026-01-07&num_nights=3"
+    )
+    assert resp.status_code == 422
+    body = resp.json()
+    assert body["error"]["type"] == "VALIDATION_ERROR"
+    assert body["error"]["fields"][0]["field"] == "latest_check_out"
+
+
+@pytest.mark.asyncio
+async def test_trip_explorer_flexible_window_too_long(client):
+    """Window longer than 90 days -> 422."""
+    resp = await client.get(
+        "/api/trip-explorer/flexible"
+        "?earliest_check_in=2026-01-01&latest_check_out=2026-06-01&num_nights=3"
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_trip_explorer_flexible_over_14_nights(client):
+    """num_nights above 14 -> 422."""
+    resp = await client.get(
+        "/api/trip-explorer/flexible"
+        "?earliest_check_in=2026-01-01&latest_check_out=2026-02-01&num_nights=15"
+    )
+    assert resp.status_code == 422
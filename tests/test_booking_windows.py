@@ -1,7 +1,16 @@
-from datetime import date
+from datetime import date, timedelta
 from unittest.mock import patch
 
-from backend.engine.booking_windows import _dvc_subtract_months, compute_booking_windows
+from backend.data.point_charts import calculate_stay_total
+from backend.engine.booking_windows import (
+    _dvc_subtract_months,
+    build_booking_window_calendar,
+    compute_booking_windows,
+    find_stays_opening_on,
+    get_check_ins_opening_on,
+    get_window_open_dates,
+    get_window_reverse_table,
+)
 
 # --- _dvc_subtract_months edge cases ---
 
@@ -99,3 +108,93 @@ def test_compute_booking_windows_not_home_resort():
     """is_home_resort=False is passed through."""
     result = compute_booking_windows(date(2026, 12, 15), is_home_resort=False)
     assert result["is_home_resort"] is False
+
+
+# --- Window open table and calendar ---
+
+
+def test_window_open_table_matches_dvc_rule():
+    """Every check-in of a normal and a leap year matches _dvc_subtract_months."""
+    for year in (2026, 2028):
+        check_in = date(year, 1, 1)
+        while check_in.year == year:
+            assert get_window_open_dates(check_in) == (
+                _dvc_subtract_months(check_in, 11),
+                _dvc_subtract_months(check_in, 7),
+            )
+            check_in += timedelta(days=1)
+
+
+def _calendar_reservation(id, contract_id, resort, check_in):
+    return {"id": id, "contract_id": contract_id, "resort": resort, "check_in": check_in}
+
+
+def test_booking_window_calendar():
+    """Windows in range, home windows only at the home resort, sorted by window date."""
+    contracts = [{"id": 1, "name": None, "home_resort": "polynesian"}]
+    reservations = [
+        _calendar_reservation(10, 1, "polynesian", date(2027, 3, 15)),  # 11mo Apr 15, 7mo Aug 15
+        _calendar_reservation(11, 1, "riviera", date(2027, 1, 10)),  # 7mo Jun 10
+        _calendar_reservation(12, 1, "polynesian", date(2026, 3, 1)),  # before start
+    ]
+    resorts = {"polynesian": {"name": "Polynesian Villas"}}
+
+    windows = build_booking_window_calendar(
+        contracts, reservations, resorts, date(2026, 4, 1), date(2026, 7, 31), date(2026, 3, 1)
+    )
+
+    assert [(w["reservation_id"], w["window_type"], w["window_date"]) for w in windows] == [
+        (10, "home_resort", "2026-04-15"),
+        (11, "any_resort", "2026-06-10"),
+    ]
+    assert windows[0]["contract_name"] == "Contract #1"
+    assert windows[0]["resort_name"] == "Polynesian Villas"
+    assert windows[0]["days_until_open"] == 45
+    assert windows[1]["resort_name"] == "riviera"
+
+
+# --- Reverse index: check-ins by window open date ---
+
+
+def test_reverse_table_inverts_open_table():
+    table = get_window_reverse_table(2027)
+    home_total = 0
+    any_total = 0
+    for open_date, (home_check_ins, any_check_ins) in table.items():
+        for check_in in home_check_ins:
+            assert get_window_open_dates(check_in)[0] == open_date
+        for check_in in any_check_ins:
+            assert get_window_open_dates(check_in)[1] == open_date
+        home_total += len(home_check_ins)
+        any_total += len(any_check_ins)
+    assert home_total == any_total == 365
+
+
+def test_roll_forward_opens_several_check_ins_on_the_first():
+    home, any_resort = get_check_ins_opening_on(date(2026, 3, 1))
+    assert home == [date(2027, 1, 29), date(2027, 1, 30), date(2027, 1, 31), date(2027, 2, 1)]
+    assert any_resort == [date(2026, 9, 29), date(2026, 9, 30), date(2026, 10, 1)]
+
+
+def test_stays_opening_priced_per_eligible_resort():
+    """Home windows only at each contract's home resort, priced from the charts."""
+    contracts = [
+        {"id": 1, "home_resort": "polynesian", "purchase_type": "direct"},
+        {"id": 2, "home_resort": "riviera", "purchase_type": "resale"},
+    ]
+
+    # Home check-ins are Jan 29 - Feb 1, 2026; any-resort ones (2025) have no charts
+    result = find_stays_opening_on(contracts, date(2025, 3, 1), nights=2)
+
+    assert {s["window_type"] for s in result["stays"]} == {"home_resort"}
+    assert [(s["check_in"], s["resort"], s["contract_ids"]) for s in result["stays"][:2]] == [
+        ("2026-01-29", "polynesian", [1]),
+        ("2026-01-29", "riviera", [2]),
+    ]
+    assert len(result["stays"]) == 8
+    rooms = result["stays"][0]["rooms"]
+    assert rooms == sorted(rooms, key=lambda r: (r["total_points"], r["room_key"]))
+    studio = next(r for r in rooms if r["room_key"] == "deluxe_studio_standard")
+    assert studio["total_points"] == calculate_stay_total(
+        "polynesian", "deluxe_studio_standard", date(2026, 1, 29), date(2026, 1, 31)
+    )
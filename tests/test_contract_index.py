@@ -0,0 +1,109 @@
+"""Tests for the per-contract balance/reservation index."""
+
+from datetime import date
+
+from backend.engine.availability import get_contract_availability
+from backend.engine.contract_index import (
+    build_contract_index,
+    get_committed_points,
+    get_contract_entry,
+)
+
+
+def test_groups_rows_by_contract():
+    """Balances and reservations land in their own contract's bucket."""
+    balances = [
+        {"contract_id": 1, "use_year": 2025, "allocation_type": "current", "points": 160},
+        {"contract_id": 2, "use_year": 2025, "allocation_type": "current", "points": 100},
+        {"contract_id": 1, "use_year": 2025, "allocation_type": "banked", "points": 40},
+    ]
+    reservations = [
+        {"contract_id": 2, "check_in": date(2026, 1, 5), "points_cost": 30, "status": "confirmed"},
+    ]
+    index = build_contract_index(balances, reservations)
+
+    assert [b["points"] for b in index[1]["balances"]] == [160, 40]
+    assert index[1]["reservations"] == []
+    assert [b["points"] for b in index[2]["balances"]] == [100]
+    assert index[2]["reservations"] == reservations
+
+
+def test_reservations_sorted_by_check_in():
+    """Each contract's reservations are ordered by check_in, mixing date and ISO string input."""
+    reservations = [
+        {"contract_id": 1, "check_in": "2026-03-01", "points_cost": 10, "status": "confirmed"},
+        {"contract_id": 1, "check_in": date(2025, 12, 1), "points_cost": 20, "status": "confirmed"},
+        {"contract_id": 1, "check_in": date(2026, 1, 15), "points_cost": 30, "status": "pending"},
+    ]
+    index = build_contract_index([], reservations)
+    assert [r["points_cost"] for r in index[1]["reservations"]] == [20, 30, 10]
+
+
+def test_missing_contract_gets_empty_entry():
+    """A contract with no rows gets empty balances and reservations."""
+    entry = get_contract_entry(build_contract_index([], []), 99)
+    assert entry["balances"] == []
+    assert entry["reservations"] == []
+    assert get_committed_points(entry, date(2026, 1, 1), date(2026, 12, 31)) == (0, 0)
+
+
+def _reservation(check_in, points_cost, status="confirmed"):
+    return {"contract_id": 1, "check_in": check_in, "points_cost": points_cost, "status": status}
+
+
+def test_committed_points_window_is_inclusive():
+    """Reservations on the first and last day of the window are counted."""
+    index = build_contract_index(
+        [],
+        [
+            _reservation(date(2025, 5, 31), 5),
+            _reservation(date(2025, 6, 1), 10),
+            _reservation(date(2025, 12, 25), 20),
+            _reservation(date(2026, 5, 31), 30),
+            _reservation(date(2026, 6, 1), 40),
+        ],
+    )
+    assert get_committed_points(index[1], date(2025, 6, 1), date(2026, 5, 31)) == (60, 3)
+
+
+def test_committed_points_skip_cancelled():
+    """Cancelled reservations are left out of the cumulative array."""
+    index = build_contract_index(
+        [],
+        [
+            _reservation(date(2025, 7, 1), 10),
+            _reservation(date(2025, 8, 1), 99, status="cancelled"),
+            _reservation(date(2025, 9, 1), 20, status="pending"),
+        ],
+    )
+    assert get_committed_points(index[1], date(2025, 6, 1), date(2026, 5, 31)) == (30, 2)
+
+
+def test_bisect_matches_linear_scan():
+    """Availability from the index equals the reservation scan for every month."""
+    balances = [
+        {"contract_id": 1, "use_year": y, "allocation_type": "current", "points": 160}
+        for y in range(2020, 2030)
+    ]
+    reservations = [
+        _reservation(
+            date(2020 + i // 12, i % 12 + 1, 10),
+            5 + i % 7,
+            "cancelled" if i % 9 == 0 else "confirmed",
+        )
+        for i in range(0, 120, 2)
+    ]
+    entry = get_contract_entry(build_contract_index(balances, reservations), 1)
+    for i in range(120):
+        target = date(2020 + i // 12, i % 12 + 1, 15)
+        kwargs = {
+            "contract_id": 1,
+            "use_year_month": 9,
+            "annual_points": 160,
+            "point_balances": balances,
+            "reservations": reservations,
+            "target_date": target,
+        }
+        assert get_contract_availability(
+            **kwargs, contract_entry=entry
+        ) == get_contract_availability(**kwargs)
@@ -0,0 +1,48 @@
+"""Tests for engine creation and the SQLite connection profile."""
+
+from sqlalchemy import text
+
+from backend.config import Settings
+from backend.db.database import create_engine
+
+
+async def _pragma(engine, name):
+    async with engine.connect() as conn:
+        return (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+
+
+async def test_file_database_gets_performance_profile(tmp_path):
+    """A file-backed database runs in WAL mode with the configured pragmas."""
+    settings = Settings(sqlite_cache_size_kib=32768, sqlite_mmap_size_mb=64)
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'dvc.db'}", settings)
+    try:
+        assert await _pragma(engine, "journal_mode") == "wal"
+        assert await _pragma(engine, "synchronous") == 1  # NORMAL
+        assert await _pragma(engine, "cache_size") == -32768
+        assert await _pragma(engine, "mmap_size") == 64 * 1024 * 1024
+        assert await _pragma(engine, "temp_store") == 2  # MEMORY
+        assert await _pragma(engine, "busy_timeout") == 5000
+        assert engine.pool.size() == settings.db_pool_size
+    finally:
+        await engine.dispose()
+
+
+async def test_profile_is_configurable(tmp_path):
+    """Settings override the defaults on every connection."""
+    settings = Settings(sqlite_journal_mode="delete", sqlite_synchronous="full")
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'dvc.db'}", settings)
+    try:
+        assert await _pragma(engine, "journal_mode") == "delete"
+        assert await _pragma(engine, "synchronous") == 2  # FULL
+    finally:
+        await engine.dispose()
+
+
+async def test_memory_database_skips_pool_sizing():
+    """In-memory databases keep their single shared connection."""
+    engine = create_engine("sqlite+aiosqlite:///:memory:", Settings())
+    try:
+        assert await _pragma(engine, "synchronous") == 1
+        assert not hasattr(engine.pool, "size")
+    finally:
+        await engine.dispose()
@@ -1,9 +1,17 @@
+import dataclasses
+
+import pytest
+
 from backend.data.resorts import (
+    build_resort_registry,
     get_original_resort_slugs,
+    get_resort_by_slug,
+    get_resort_registry,
     get_resort_slugs,
     get_restricted_resort_slugs,
+    is_resort_slug,
 )
-from backend.engine.eligibility import get_eligible_resorts
+from backend.engine.eligibility import get_eligible_resort_set, get_eligible_resorts
 
 
 def test_direct_purchase_gets_all_resorts():
@@ -62,3 +70,41 @@ def test_resale_at_original_excludes_restricted():
     assert result_set.isdisjoint(restricted), (
         f"Restricted resorts found in resale results: {result_set & restricted}"
     )
+
+
+def test_eligible_resort_set_matches_list():
+    for home_resort in ("polynesian", "riviera"):
+        for purchase_type in ("direct", "resale"):
+            eligible = get_eligible_resort_set(home_resort, purchase_type)
+            assert eligible == set(get_eligible_resorts(home_resort, purchase_type))
+            assert eligible is get_eligible_resort_set(home_resort, purchase_type)
+
+
+def test_eligible_resorts_returns_a_copy():
+    """Callers can't corrupt the memoized result."""
+    get_eligible_resorts("riviera", "resale").append("polynesian")
+    assert get_eligible_resorts("riviera", "resale") == ["riviera"]
+
+
+def test_resort_registry_lookups():
+    registry = get_resort_registry()
+    assert get_resort_by_slug("polynesian")["slug"] == "polynesian"
+    assert get_resort_by_slug("atlantis") is None
+    assert is_resort_slug("riviera") and not is_resort_slug("atlantis")
+    assert registry.restricted | registry.original == registry.slug_set
+    assert not registry.restricted & registry.original
+
+
+def test_resort_registry_is_frozen():
+    registry = build_resort_registry(
+        [
+            {"slug": "a", "restricted": False},
+            {"slug": "b", "restricted": True},
+        ]
+    )
+    assert registry.slugs == ("a", "b")
+    assert registry.restricted == {"b"}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        registry.slugs = ()
+    with pytest.raises(TypeError):
+        registry.by_slug["c"] = {}
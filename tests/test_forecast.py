@@ -0,0 +1,128 @@
+"""Tests for the multi-year point-flow forecast engine (pure function, no DB)."""
+
+from datetime import date
+
+from backend.engine.forecast import forecast_contract, forecast_points
+
+# Dec UY 2025 runs Dec 1, 2025 - Nov 30, 2026 with its banking deadline on
+# Jul 31, 2026. Jun UY 2025 ends May 31, 2026; its deadline (Jan 31, 2026) has passed.
+AS_OF = date(2026, 3, 1)
+
+
+def _contract(id=1, use_year_month=12, annual_points=200):
+    return {
+        "id": id,
+        "name": f"Contract {id}",
+        "home_resort": "polynesian",
+        "use_year_month": use_year_month,
+        "annual_points": annual_points,
+    }
+
+
+def _balance(points, use_year=2025, allocation_type="current", contract_id=1):
+    return {
+        "contract_id": contract_id,
+        "use_year": use_year,
+        "allocation_type": allocation_type,
+        "points": points,
+    }
+
+
+def _reservation(check_in, points_cost, contract_id=1, status="confirmed"):
+    return {
+        "contract_id": contract_id,
+        "check_in": check_in,
+        "points_cost": points_cost,
+        "status": status,
+    }
+
+
+def _month(result, month):
+    return next(m for m in result["months"] if m["month"] == month)
+
+
+def test_months_cover_as_of_through_last_use_year_end():
+    result = forecast_contract(_contract(), [_balance(200)], [], AS_OF, years=2)
+    assert result["first_use_year"] == 2025
+    assert result["last_use_year"] == 2026
+    assert result["months"][0]["month"] == "2026-03"
+    assert result["months"][-1]["month"] == "2027-11"
+    assert len(result["months"]) == 21
+
+
+def test_banking_keeps_points_for_later_reservations():
+    """At the deadline, unused current points are banked except what's still booked."""
+    result = forecast_contract(
+        _contract(), [_balance(200)], [_reservation(date(2026, 9, 10), 50)], AS_OF, years=2
+    )
+
+    july = _month(result, "2026-07")
+    assert july["flows"]["banked"] == 150
+    assert july["balances"]["current"] == 50
+    september = _month(result, "2026-09")
+    assert september["flows"]["used"] == 50
+    assert september["available"] == 0
+
+    december = _month(result, "2026-12")
+    assert december["use_year"] == 2026
+    assert december["balances"] == {"current": 200, "banked": 150, "borrowed": 0, "holding": 0}
+    assert december["flows"]["allocated"] == 200
+
+
+def test_banked_points_expire_at_use_year_end():
+    result = forecast_contract(_contract(), [_balance(200)], [], AS_OF, years=2)
+
+    # UY 2026's current points are banked into 2027; the banked 200 from 2025 expire
+    november = _month(result, "2027-11")
+    assert november["balances"]["banked"] == 200
+    assert november["flows"]["expired"] == 200
+    assert result["totals"]["banked"] == 400
+    assert result["totals"]["expired"] == 200
+
+
+def test_borrowing_within_limit_then_shortfall():
+    """Short reservations borrow from next year up to the limit; the rest is a shortfall."""
+    contract = _contract(use_year_month=6, annual_points=100)
+    reservations = [_reservation(date(2026, 3, 9), 66), _reservation(date(2026, 4, 10), 40)]
+
+    result = forecast_contract(
+        contract, [_balance(30)], reservations, AS_OF, years=2, borrowing_limit_pct=50
+    )
+
+    assert _month(result, "2026-03")["flows"]["borrowed"] == 36
+    april = _month(result, "2026-04")["flows"]
+    assert april["borrowed"] == 14
+    assert april["shortfall"] == 26
+    assert result["shortfalls"] == [
+        {"check_in": "2026-04-10", "use_year": 2025, "points_cost": 40, "points_short": 26}
+    ]
+    # UY 2026 starts with what wasn't borrowed ahead
+    assert _month(result, "2026-06")["balances"]["current"] == 50
+
+
+def test_entered_future_balances_are_used():
+    """A recorded current row for a later use year overrides the annual allocation."""
+    balances = [_balance(200), _balance(120, use_year=2026)]
+    result = forecast_contract(_contract(), balances, [], AS_OF, years=2)
+    assert _month(result, "2026-12")["flows"]["allocated"] == 120
+
+
+def test_cancelled_reservations_are_ignored():
+    reservations = [_reservation(date(2026, 9, 10), 50, status="cancelled")]
+    result = forecast_contract(_contract(), [_balance(200)], reservations, AS_OF, years=1)
+    assert result["totals"]["used"] == 0
+    assert result["totals"]["banked"] == 200
+
+
+def test_forecast_points_summarizes_contracts():
+    contracts = [_contract(1), _contract(2, use_year_month=6, annual_points=100)]
+    balances = [_balance(200, contract_id=1), _balance(30, contract_id=2)]
+    reservations = [_reservation(date(2026, 3, 9), 20, contract_id=2)]
+
+    result = forecast_points(contracts, balances, reservations, AS_OF, years=3)
+
+    assert result["as_of"] == "2026-03-01"
+    assert [c["contract_id"] for c in result["contracts"]] == [1, 2]
+    for flow, total in result["summary"].items():
+        assert total == sum(c["totals"][flow] for c in result["contracts"])
+    assert result["contracts"][1]["totals"]["used"] == 20
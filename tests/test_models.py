@@ -2,6 +2,7 @@ from datetime import date
 
 import pytest
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from backend.models.contract import Contract, PurchaseType, UseYearMonth
@@ -324,3 +325,37 @@ async def test_multiple_reservations_for_contract(db_session):
     )
     loaded_contract = result.scalar_one()
     assert len(loaded_contract.reservations) == 3
+
+
+@pytest.mark.asyncio
+async def test_point_balance_unique_per_contract_year_type(db_session):
+    """A second balance with the same contract, use year and type violates the unique index."""
+    contract = Contract(
+        home_resort="polynesian",
+        use_year_month=6,
+        annual_points=160,
+        purchase_type=PurchaseType.RESALE.value,
+    )
+    db_session.add(contract)
+    await db_session.commit()
+
+    for _ in range(2):
+        db_session.add(
+            PointBalance(
+                contract_id=contract.id,
+                use_year=2026,
+                allocation_type=PointAllocationType.CURRENT.value,
+                points=160,
+            )
+        )
+    with pytest.raises(IntegrityError):
+        await db_session.commit()
+    await db_session.rollback()
+
+
+def test_reservation_indexes_cover_hot_predicates():
+    """Reservations are indexed on contract_id, status and check_in."""
+    indexed = {tuple(c.name for c in ix.columns) for ix in Reservation.__table__.indexes}
+    assert ("contract_id", "check_in") in indexed
+    assert ("status", "check_in") in indexed
+    assert ("check_in",) in indexed
@@ -0,0 +1,281 @@
+"""Tests for the scenario optimizer engine (pure function, no DB)."""
+
+import itertools
+import random
+from datetime import date, timedelta
+
+from backend.data.point_charts import calculate_stay_total
+from backend.engine.eligibility import get_eligible_resorts
+from backend.engine.optimizer import optimize_stay_assignments
+from backend.engine.use_year import get_current_use_year
+
+# Banking deadline for June UY 2025 (Jan 31, 2026) has passed; for Dec UY 2025
+# (Jul 31, 2026) it has not.
+TODAY = date(2026, 3, 1)
+
+
+def _contract(id, use_year_month=6, home_resort="polynesian", purchase_type="direct"):
+    return {
+        "id": id,
+        "name": f"Contract {id}",
+        "home_resort": home_resort,
+        "use_year_month": use_year_month,
+        "annual_points": 200,
+        "purchase_type": purchase_type,
+    }
+
+
+def _balance(contract_id, points, use_year=2025, allocation_type="current"):
+    return {
+        "contract_id": contract_id,
+        "use_year": use_year,
+        "allocation_type": allocation_type,
+        "points": points,
+    }
+
+
+def _stay(check_in, nights=3, resort="polynesian", room_key="deluxe_studio_standard"):
+    return {
+        "resort": resort,
+        "room_key": room_key,
+        "check_in": check_in,
+        "check_out": check_in + timedelta(days=nights),
+    }
+
+
+def _key(summary):
+    return (-summary["stays_assigned"], summary["points_expiring_after"], summary["split_stays"])
+
+
+def test_uses_points_that_would_expire():
+    """A stay is paid from the contract whose points can no longer be banked."""
+    contracts = [_contract(1, use_year_month=12), _contract(2, use_year_month=6)]
+    balances = [_balance(1, 200), _balance(2, 200)]
+
+    result = optimize_stay_assignments(contracts, balances, [], [_stay(date(2026, 3, 9))], TODAY)
+
+    stay = result["assignments"][0]
+    assert stay["points_cost"] == 66
+    assert stay["allocations"] == [
+        {"contract_id": 2, "contract_name": "Contract 2", "use_year": 2025, "points": 66}
+    ]
+    assert result["summary"]["points_expiring_before"] == 200
+    assert result["summary"]["points_expiring_after"] == 134
+    assert result["summary"]["optimal"] is True
+
+
+def test_banked_points_are_at_risk_before_deadline():
+    """Banked points can't be banked again, so they are spent before current points."""
+    contracts = [_contract(1, use_year_month=12), _contract(2, use_year_month=12)]
+    balances = [
+        _balance(1, 200),
+        _balance(2, 100),
+        _balance(2, 80, allocation_type="banked"),
+    ]
+
+    result = optimize_stay_assignments(contracts, balances, [], [_stay(date(2026, 3, 9))], TODAY)
+
+    assert result["assignments"][0]["allocations"][0]["contract_id"] == 2
+    assert result["summary"]["points_expiring_after"] == 14
+
+
+def test_capacity_decides_who_pays_for_the_big_stay():
+    """Both stays fit only if the 88-point stay goes to the larger contract."""
+    contracts = [_contract(1), _contract(2)]
+    balances = [_balance(1, 70), _balance(2, 90)]
+    stays = [_stay(date(2026, 3, 9)), _stay(date(2026, 3, 16), nights=4)]
+
+    result = optimize_stay_assignments(contracts, balances, [], stays, TODAY)
+
+    paid_by = [a["allocations"][0]["contract_id"] for a in result["assignments"]]
+    assert paid_by == [1, 2]
+    assert result["summary"]["stays_assigned"] == 2
+
+
+def test_split_only_when_allowed():
+    """A stay bigger than any one contract is placed only with splits enabled."""
+    contracts = [_contract(1), _contract(2)]
+    balances = [_balance(1, 50), _balance(2, 50)]
+    stays = [_stay(date(2026, 3, 16), nights=4)]  # 88 points
+
+    whole = optimize_stay_assignments(contracts, balances, [], stays, TODAY)
+    assert whole["assignments"][0]["assigned"] is False
+    assert whole["summary"]["stays_assigned"] == 0
+
+    split = optimize_stay_assignments(contracts, balances, [], stays, TODAY, allow_splits=True)
+    allocations = split["assignments"][0]["allocations"]
+    assert len(allocations) == 2
+    assert sum(a["points"] for a in allocations) == 88
+    assert split["summary"]["split_stays"] == 1
+
+
+def test_respects_resort_eligibility():
+    """A Riviera resale contract can't pay for a Polynesian stay."""
+    contracts = [
+        _contract(1, home_resort="riviera", purchase_type="resale"),
+        _contract(2, use_year_month=12),
+    ]
+    balances = [_balance(1, 200), _balance(2, 200)]
+
+    result = optimize_stay_assignments(contracts, balances, [], [_stay(date(2026, 3, 9))], TODAY)
+
+    assert result["assignments"][0]["allocations"][0]["contract_id"] == 2
+    assert [u["contract_id"] for u in result["use_years"]] == [2]
+
+
+def test_unpriced_stays_are_reported():
+    """Stays without chart data come back as errors, not assignments."""
+    result = optimize_stay_assignments(
+        [_contract(1)],
+        [_balance(1, 200)],
+        [],
+        [_stay(date(2026, 3, 9)), _stay(date(2026, 3, 9), room_key="no_such_room")],
+        TODAY,
+    )
+    assert len(result["assignments"]) == 1
+    assert result["errors"][0]["stay_index"] == 1
+
+
+def test_time_limit_reports_not_optimal():
+    """Stopping early still returns the greedy result, flagged as not proven optimal."""
+    contracts = [_contract(i) for i in range(1, 4)]
+    balances = [_balance(i, 150) for i in range(1, 4)]
+    stays = [_stay(date(2026, 3, 2) + timedelta(days=3 * i)) for i in range(5)]
+
+    result = optimize_stay_assignments(contracts, balances, [], stays, TODAY, time_limit=0)
+
+    assert result["summary"]["optimal"] is False
+    assert len(result["assignments"]) == 5
+    assert result["summary"]["stays_assigned"] > 0
+
+
+def test_matches_exhaustive_search():
+    """On small random portfolios the optimizer finds the best lexicographic objective."""
+    rng = random.Random(7)
+    for _ in range(15):
+        contracts = [
+            _contract(
+                i,
+                use_year_month=rng.choice([2, 6, 12]),
+                home_resort=rng.choice(["polynesian", "riviera"]),
+                purchase_type=rng.choice(["direct", "resale"]),
+            )
+            for i in range(1, 5)
+        ]
+        balances = []
+        for c in contracts:
+            for use_year in (2025, 2026):
+                balances.append(_balance(c["id"], rng.choice([40, 80, 120]), use_year))
+                balances.append(_balance(c["id"], rng.choice([0, 30]), use_year, "banked"))
+        stays = [
+            _stay(
+                date(2026, 1, 5) + timedelta(days=rng.randint(0, 300)),
+                nights=rng.randint(2, 4),
+                resort=rng.choice(["polynesian", "riviera"]),
+            )
+            for _ in range(5)
+        ]
+
+        result = optimize_stay_assignments(contracts, balances, [], stays, TODAY)
+        assert result["summary"]["optimal"] is True
+
+        buckets = {(u["contract_id"], u["use_year"]): u for u in result["use_years"]}
+        options = []
+        for stay in stays:
+            cost = calculate_stay_total(
+                stay["resort"], stay["room_key"], stay["check_in"], stay["check_out"]
+            )
+            keys = [
+                (c["id"], get_current_use_year(c["use_year_month"], as_of=stay["check_in"]))
+                for c in contracts
+                if stay["resort"] in get_eligible_resorts(c["home_resort"], c["purchase_type"])
+            ]
+            options.append([(cost, k) for k in keys] + [None])
+
+        best = None
+        for combo in itertools.product(*options):
+            used = dict.fromkeys(buckets, 0)
+            for pick in combo:
+                if pick is not None:
+                    used[pick[1]] += pick[0]
+            if any(used[k] > buckets[k]["available_points"] for k in buckets):
+                continue
+            expiring = sum(max(0, buckets[k]["points_at_risk"] - used[k]) for k in buckets)
+            key = (-sum(p is not None for p in combo), expiring, 0)
+            best = key if best is None else min(best, key)
+
+        assert _key(result["summary"]) == best
+
+
+def _reference_key(contracts, stays, use_years):
+    """
+    Exact (placed, expiring) objective without splits, by dynamic programming
+    over use years: for each one, every set of stays that fits in it.
+    """
+    costs = [
+        calculate_stay_total(s["resort"], s["room_key"], s["check_in"], s["check_out"])
+        for s in stays
+    ]
+    best = {0: 0}  # mask of placed stays -> most at-risk points used
+    for u in use_years:
+        members = [
+            i
+            for i, stay in enumerate(stays)
+            for c in contracts
+            if c["id"] == u["contract_id"]
+            and stay["resort"] in get_eligible_resorts(c["home_resort"], c["purchase_type"])
+            and get_current_use_year(c["use_year_month"], as_of=stay["check_in"]) == u["use_year"]
+        ]
+        fits = [(0, 0)]
+        for i in members:
+            fits += [
+                (mask | 1 << i, total + costs[i])
+                for mask, total in fits
+                if total + costs[i] <= u["available_points"]
+            ]
+        following = {}
+        for mask, saved in best.items():
+            for subset, total in fits:
+                if not subset & mask:
+                    value = saved + min(total, u["points_at_risk"])
+                    if following.get(mask | subset, -1) < value:
+                        following[mask | subset] = value
+        best = following
+
+    at_risk = sum(u["points_at_risk"] for u in use_years)
+    return min((-bin(mask).count("1"), at_risk - saved, 0) for mask, saved in best.items())
+
+
+def test_twelve_stays_across_twelve_contracts_solve_to_optimality():
+    """The API's largest request is proven optimal within the default time limit."""
+    rng = random.Random(12)
+    for _ in range(3):
+        contracts = [
+            _contract(
+                i,
+                use_year_month=rng.choice([2, 3, 6, 8, 9, 10, 12]),
+                home_resort=rng.choice(["polynesian", "riviera", "boardwalk", "aulani"]),
+                purchase_type=rng.choice(["direct", "resale", "resale"]),
+            )
+            for i in range(1, 13)
+        ]
+        balances = []
+        for c in contracts:
+            for use_year in (2025, 2026):
+                balances.append(_balance(c["id"], rng.randint(60, 250), use_year))
+                if rng.random() < 0.5:
+                    balances.append(_balance(c["id"], rng.randint(10, 100), use_year, "banked"))
+        stays = [
+            _stay(
+                date(2026, 1, 2) + timedelta(days=rng.randint(0, 350)),
+                nights=rng.randint(2, 7),
+                resort=rng.choice(["polynesian", "riviera"]),
+                room_key=rng.choice(["deluxe_studio_standard", "one_bedroom_standard"]),
+            )
+            for _ in range(12)
+        ]
+
+        result = optimize_stay_assignments(contracts, balances, [], stays, TODAY)
+
+        assert result["summary"]["optimal"] is True
+        assert _key(result["summary"]) == _reference_key(contracts, stays, result["use_years"])
@@ -1,13 +1,34 @@
 """Tests for point chart data loader and cost calculations."""
 
+import json
+import logging
+import os
+import shutil
 from datetime import date, timedelta
+from types import MappingProxyType
+
+import pytest
 
 from backend.data.point_charts import (
+    ARTIFACT_NAME,
+    CHARTS_DIR,
+    build_chart_catalog,
     calculate_stay_cost,
+    calculate_stay_total,
+    check_chart_coverage,
+    compile_point_chart,
     get_available_charts,
+    get_chart_catalog,
+    get_compiled_point_cost,
     get_point_cost,
     get_season_for_date,
+    load_chart_catalog,
+    load_compiled_chart,
     load_point_chart,
+    open_chart_catalog,
+    publish_chart_catalog,
+    read_chart_artifact,
+    write_chart_artifact,
 )
 
 
@@ -121,6 +142,69 @@ class TestGetPointCost:
         assert preferred > standard
 
 
+class TestCompiledChart:
+    def _assert_matches_source(self, resort_slug: str):
+        chart = load_point_chart(resort_slug, 2026)
+        compiled = load_compiled_chart(resort_slug, 2026)
+        assert compiled is not None
+        current = date(2026, 1, 1)
+        while current <= date(2026, 12, 31):
+            for room_key in compiled["room_keys"]:
+                assert get_compiled_point_cost(compiled, room_key, current) == get_point_cost(
+                    chart, room_key, current
+                ), f"{resort_slug} {room_key} {current}"
+            current += timedelta(days=1)
+
+    def test_polynesian_matches_source_chart(self):
+        """Compiled lookups equal dict lookups for every room and day of 2026."""
+        self._assert_matches_source("polynesian")
+
+    def test_riviera_matches_source_chart(self):
+        """Compiled lookups equal dict lookups for every room and day of 2026."""
+        self._assert_matches_source("riviera")
+
+    def test_compiled_once_per_resort_year(self):
+        """load_compiled_chart returns the same cached object on repeat calls."""
+        assert load_compiled_chart("polynesian", 2026) is load_compiled_chart("polynesian", 2026)
+
+    def test_nonexistent_chart(self):
+        """load_compiled_chart returns None for missing chart."""
+        assert load_compiled_chart("nonexistent", 2026) is None
+
+    def test_dates_outside_chart_year(self):
+        """Dates outside the chart year have no cost."""
+        compiled = load_compiled_chart("polynesian", 2026)
+        assert (
+            get_compiled_point_cost(compiled, "deluxe_studio_standard", date(2025, 12, 31)) is None
+        )
+        assert get_compiled_point_cost(compiled, "deluxe_studio_standard", date(2027, 1, 1)) is None
+
+    def test_uncovered_day_and_missing_room(self):
+        """Days with no season and rooms missing from a season have no cost."""
+        chart = {
+            "resort": "test",
+            "year": 2026,
+            "seasons": [
+                {
+                    "name": "A",
+                    "date_ranges": [["2026-01-01", "2026-01-10"]],
+                    "rooms": {"studio": {"weekday": 10, "weekend": 12}},
+                },
+                {
+                    "name": "B",
+                    "date_ranges": [["2026-01-11", "2026-01-20"]],
+                    "rooms": {"villa": {"weekday": 20, "weekend": 25}},
+                },
+            ],
+        }
+        compiled = compile_point_chart(chart)
+        assert compiled["room_keys"] == ["studio", "villa"]
+        assert get_compiled_point_cost(compiled, "studio", date(2026, 1, 5)) == 10
+        assert get_compiled_point_cost(compiled, "studio", date(2026, 1, 15)) is None
+        assert get_compiled_point_cost(compiled, "villa", date(2026, 1, 16)) == 25
+        assert get_compiled_point_cost(compiled, "villa", date(2026, 2, 1)) is None
+
+
 class TestCalculateStayCost:
     def test_three_weekday_nights_adventure(self):
         """3 weekday nights in Adventure = 3 x 14 = 42."""
@@ -196,6 +280,55 @@ class TestCalculateStayCost:
         assert "points" in night
 
 
+class TestCalculateStayTotal:
+    def test_matches_stay_cost_for_every_check_in(self):
+        """Totals-only path equals calculate_stay_cost for every 1-14 night stay in 2026."""
+        for resort_slug in ("polynesian", "riviera"):
+            room_key = load_compiled_chart(resort_slug, 2026)["room_keys"][0]
+            check_in = date(2026, 1, 1)
+            while check_in <= date(2026, 12, 31):
+                for nights in (1, 4, 14):
+                    check_out = check_in + timedelta(days=nights)
+                    full = calculate_stay_cost(resort_slug, room_key, check_in, check_out)
+                    total = calculate_stay_total(resort_slug, room_key, check_in, check_out)
+                    assert total == (full["total_points"] if full else None)
+                check_in += timedelta(days=1)
+
+    def test_weekday_nights(self):
+        """3 weekday nights in Adventure = 42."""
+        total = calculate_stay_total(
+            "polynesian", "deluxe_studio_standard", date(2026, 1, 12), date(2026, 1, 15)
+        )
+        assert total == 42
+
+    def test_year_boundary_without_next_year_chart(self):
+        """Stay crossing into a year with no chart returns None."""
+        total = calculate_stay_total(
+            "polynesian", "deluxe_studio_standard", date(2026, 12, 30), date(2027, 1, 2)
+        )
+        assert total is None
+
+    def test_stay_ending_on_new_years_day(self):
+        """Checking out on Jan 1 only prices nights in the chart year."""
+        total = calculate_stay_total(
+            "polynesian", "deluxe_studio_standard", date(2026, 12, 30), date(2027, 1, 1)
+        )
+        full = calculate_stay_cost(
+            "polynesian", "deluxe_studio_standard", date(2026, 12, 30), date(2027, 1, 1)
+        )
+        assert total == full["total_points"]
+
+    def test_nonexistent_chart_and_room(self):
+        """Missing chart or room returns None."""
+        assert calculate_stay_total("nonexistent", "x", date(2026, 1, 1), date(2026, 1, 3)) is None
+        assert (
+            calculate_stay_total(
+                "polynesian", "nonexistent_room", date(2026, 1, 1), date(2026, 1, 3)
+            )
+            is None
+        )
+
+
 class TestDateCoverage:
     """Validate every day of 2026 is covered by exactly one season in each chart."""
 
@@ -249,3 +382,150 @@ class TestDateCoverage:
     def test_riviera_no_overlaps(self):
         """No date belongs to multiple seasons in the Riviera chart."""
         self._validate_no_overlaps("riviera")
+
+
+def _chart(resort="testresort", year=2026, seasons=None):
+    return {
+        "resort": resort,
+        "year": year,
+        "seasons": seasons
+        or [
+            {
+                "name": "All",
+                "date_ranges": [[f"{year}-01-01", f"{year}-12-31"]],
+                "rooms": {"studio": {"weekday": 10, "weekend": 12}},
+            }
+        ],
+    }
+
+
+class TestChartCatalog:
+    """Charts are parsed, compiled and checked once into an immutable catalog."""
+
+    def test_catalog_covers_shipped_charts(self):
+        catalog = get_chart_catalog()
+        assert ("polynesian", 2026) in catalog.compiled
+        assert catalog.problems == {}
+        assert load_compiled_chart("polynesian", 2026) is catalog.compiled[("polynesian", 2026)]
+        assert get_available_charts() == list(catalog.entries)
+
+    def test_catalog_is_read_only(self):
+        catalog = get_chart_catalog()
+        with pytest.raises(TypeError):
+            catalog.compiled[("x", 2026)] = {}
+        get_available_charts()[0]["year"] = 1999
+        assert get_available_charts()[0]["year"] != 1999
+
+    def test_coverage_gap_and_overlap(self):
+        rooms = {"studio": {"weekday": 10, "weekend": 12}}
+        chart = _chart(
+            seasons=[
+                {"name": "A", "date_ranges": [["2026-01-01", "2026-06-30"]], "rooms": rooms},
+                {"name": "B", "date_ranges": [["2026-06-29", "2026-12-20"]], "rooms": rooms},
+            ]
+        )
+        assert check_chart_coverage(chart) == [
+            "overlap 2026-06-29..2026-06-30 (A, B)",
+            "gap 2026-12-21..2026-12-31",
+        ]
+        assert check_chart_coverage(_chart()) == []
+
+    def test_build_skips_bad_files_and_logs_problems(self, tmp_path, caplog):
+        good = _chart()
+        gappy = _chart(resort="gappy")
+        gappy["seasons"][0]["date_ranges"] = [["2026-01-02", "2026-12-31"]]
+        (tmp_path / "testresort_2026.json").write_text(json.dumps(good))
+        (tmp_path / "gappy_2026.json").write_text(json.dumps(gappy))
+        (tmp_path / "mismatch_2027.json").write_text(json.dumps(_chart(resort="mismatch")))
+        (tmp_path / "broken_2026.json").write_text("{not json")
+        (tmp_path / "schema.json").write_text("{}")
+
+        with caplog.at_level(logging.WARNING, logger="backend.data.point_charts"):
+            catalog = build_chart_catalog(tmp_path)
+
+        assert [(e["resort"], e["year"]) for e in catalog.entries] == [
+            ("gappy", 2026),
+            ("testresort", 2026),
+        ]
+        assert catalog.problems == {("gappy", 2026): ("gap 2026-01-01..2026-01-01",)}
+        assert "broken_2026.json" in caplog.text
+        assert "mismatch_2027.json" in caplog.text
+
+
+class TestChartArtifact:
+    """The compiled binary artifact maps to the same catalog the JSON builds."""
+
+    @pytest.fixture
+    def charts_dir(self, tmp_path):
+        for path in CHARTS_DIR.glob("*.json"):
+            shutil.copy2(path, tmp_path / path.name)
+        write_chart_artifact(build_chart_catalog(tmp_path), tmp_path)
+        return tmp_path
+
+    def test_artifact_matches_json_catalog(self, charts_dir):
+        built = build_chart_catalog(charts_dir)
+        mapped = read_chart_artifact(charts_dir)
+
+        assert mapped.artifact == charts_dir / ARTIFACT_NAME
+        assert mapped.entries == built.entries
+        assert mapped.charts[("polynesian", 2026)] == built.charts[("polynesian", 2026)]
+        for key, compiled in built.compiled.items():
+            artifact_chart = mapped.compiled[key]
+            assert list(artifact_chart["day_season"]) == compiled["day_season"]
+            assert artifact_chart["weekend_costs"] == compiled["weekend_costs"]
+            assert [list(p) for p in artifact_chart["cumulative_points"]] == (
+                compiled["cumulative_points"]
+            )
+            assert get_compiled_point_cost(
+                artifact_chart, "deluxe_studio_standard", date(2026, 7, 3)
+            ) == get_compiled_point_cost(compiled, "deluxe_studio_standard", date(2026, 7, 3))
+
+    def test_edited_chart_makes_artifact_stale(self, charts_dir):
+        path = charts_dir / "polynesian_2026.json"
+        chart = json.loads(path.read_text())
+        chart["seasons"][0]["rooms"]["deluxe_studio_standard"]["weekday"] = 1
+        path.write_text(json.dumps(chart))
+        os.utime(path, ns=(0, 0))
+
+        assert read_chart_artifact(charts_dir) is None
+        catalog = open_chart_catalog(charts_dir)
+        assert catalog.artifact is None
+        assert (
+            catalog.charts[("polynesian", 2026)]["seasons"][0]["rooms"]["deluxe_studio_standard"][
+                "weekday"
+            ]
+            == 1
+        )
+
+    def test_mapped_catalog_is_one_snapshot(self, charts_dir):
+        mapped = read_chart_artifact(charts_dir)
+        (charts_dir / "polynesian_2026.json").write_text("not json")
+
+        # Raw charts come from the artifact, not from the (since edited) files
+        chart = mapped.charts[("polynesian", 2026)]
+        assert chart["resort"] == "polynesian"
+        assert isinstance(mapped.charts, MappingProxyType)
+
+    def test_new_chart_makes_artifact_stale(self, charts_dir):
+        (charts_dir / "testresort_2026.json").write_text(json.dumps(_chart()))
+        assert read_chart_artifact(charts_dir) is None
+
+    def test_load_writes_stale_artifact_when_asked(self, charts_dir):
+        (charts_dir / "testresort_2026.json").write_text(json.dumps(_chart()))
+        published = get_chart_catalog()
+        try:
+            assert load_chart_catalog(charts_dir).artifact is None
+            catalog = load_chart_catalog(charts_dir, write_artifact=True)
+        finally:
+            publish_chart_catalog(published)
+
+        assert catalog.artifact == charts_dir / ARTIFACT_NAME
+        assert ("testresort", 2026) in catalog.compiled
+        assert read_chart_artifact(charts_dir) is not None
+
+    def test_unreadable_artifact_is_ignored(self, charts_dir, caplog):
+        (charts_dir / ARTIFACT_NAME).write_bytes(b"DVCCHRT1garbage")
+        with caplog.at_level(logging.WARNING, logger="backend.data.point_charts"):
+            assert read_chart_artifact(charts_dir) is None
+        assert ARTIFACT_NAME in caplog.text
+        assert read_chart_artifact(charts_dir.parent / "missing") is None
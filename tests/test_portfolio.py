@@ -0,0 +1,114 @@
+"""Tests for the in-process portfolio snapshot cache."""
+
+from datetime import date
+
+import pytest
+
+from backend.db.portfolio import invalidate_portfolio, load_portfolio
+from backend.models.contract import Contract
+from backend.models.point_balance import PointBalance
+from backend.models.reservation import Reservation
+
+
+async def _seed(db_session):
+    contract = Contract(name="Poly", home_resort="polynesian", use_year_month=6, annual_points=160)
+    db_session.add(contract)
+    await db_session.flush()
+    db_session.add(
+        PointBalance(contract_id=contract.id, use_year=2025, allocation_type="current", points=160)
+    )
+    for status in ("confirmed", "cancelled"):
+        db_session.add(
+            Reservation(
+                contract_id=contract.id,
+                resort="polynesian",
+                room_key="deluxe_studio_standard",
+                check_in=date(2026, 3, 1),
+                check_out=date(2026, 3, 4),
+                points_cost=42,
+                status=status,
+            )
+        )
+    await db_session.commit()
+    invalidate_portfolio()
+    return contract
+
+
+@pytest.mark.asyncio
+async def test_snapshot_has_plain_records(db_session):
+    """Snapshot holds plain dicts and skips cancelled reservations."""
+    contract = await _seed(db_session)
+    portfolio = await load_portfolio(db_session)
+
+    assert [c["id"] for c in portfolio["contracts"]] == [contract.id]
+    assert portfolio["balances"][0]["points"] == 160
+    assert len(portfolio["reservations"]) == 1
+    assert portfolio["reservations"][0]["status"] == "confirmed"
+    assert portfolio["reservations"][0]["check_in"] == date(2026, 3, 1)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reused_until_invalidated(db_session):
+    """Repeat loads reuse the snapshot; invalidation forces a fresh read."""
+    contract = await _seed(db_session)
+    first = await load_portfolio(db_session)
+    assert await load_portfolio(db_session) is first
+
+    db_session.add(
+        PointBalance(contract_id=contract.id, use_year=2025, allocation_type="banked", points=20)
+    )
+    await db_session.commit()
+    # Without invalidation the cached snapshot is still served
+    assert len((await load_portfolio(db_session))["balances"]) == 1
+
+    invalidate_portfolio()
+    refreshed = await load_portfolio(db_session)
+    assert refreshed is not first
+    assert refreshed["version"] > first["version"]
+    assert len(refreshed["balances"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_api_writes_invalidate_snapshot(client):
+    """Contract, point and reservation writes show up in the next availability read."""
+    resp = await client.get("/api/availability?target_date=2026-03-15")
+    assert resp.json()["summary"]["total_contracts"] == 0
+
+    resp = await client.post(
+        "/api/contracts/",
+        json={
+            "home_resort": "polynesian",
+            "use_year_month": 6,
+            "annual_points": 160,
+            "purchase_type": "resale",
+        },
+    )
+    cid = resp.json()["id"]
+    resp = await client.get("/api/availability?target_date=2026-03-15")
+    assert resp.json()["summary"]["total_contracts"] == 1
+    assert resp.json()["summary"]["total_points"] == 0
+
+    await client.post(
+        f"/api/contracts/{cid}/points",
+        json={"use_year": 2025, "allocation_type": "current", "points": 160},
+    )
+    resp = await client.get("/api/availability?target_date=2026-03-15")
+    assert resp.json()["summary"]["total_points"] == 160
+
+    resp = await client.post(
+        f"/api/contracts/{cid}/reservations",
+        json={
+            "resort": "polynesian",
+            "room_key": "deluxe_studio_standard",
+            "check_in": "2026-03-15",
+            "check_out": "2026-03-18",
+            "points_cost": 50,
+        },
+    )
+    rid = resp.json()["id"]
+    resp = await client.get("/api/availability?target_date=2026-03-15")
+    assert resp.json()["summary"]["total_available"] == 110
+
+    await client.put(f"/api/reservations/{rid}", json={"status": "cancelled"})
+    resp = await client.get("/api/availability?target_date=2026-03-15")
+    assert resp.json()["summary"]["total_available"] == 160
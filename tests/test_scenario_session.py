@@ -0,0 +1,122 @@
+"""Tests for incremental scenario sessions (pure functions, no DB)."""
+
+from datetime import date
+
+from backend.engine.scenario import compute_scenario_impact
+from backend.engine.scenario_session import (
+    add_booking,
+    create_session,
+    rebase_session,
+    remove_booking,
+    session_result,
+    update_booking,
+)
+
+TARGET = date(2026, 1, 10)
+
+
+def _contract(id, home_resort="polynesian"):
+    return {
+        "id": id,
+        "use_year_month": 2,
+        "annual_points": 200,
+        "home_resort": home_resort,
+        "name": f"Contract {id}",
+    }
+
+
+def _booking(contract_id, check_in, nights=3, room_key="deluxe_studio_standard"):
+    return {
+        "contract_id": contract_id,
+        "resort": "polynesian",
+        "room_key": room_key,
+        "check_in": check_in,
+        "check_out": date(check_in.year, check_in.month, check_in.day + nights),
+    }
+
+
+CONTRACTS = [_contract(1), _contract(2)]
+BALANCES = [
+    {"contract_id": 1, "use_year": 2025, "allocation_type": "current", "points": 200},
+    {"contract_id": 2, "use_year": 2025, "allocation_type": "current", "points": 150},
+]
+RESERVATIONS = [
+    {"contract_id": 1, "check_in": date(2025, 6, 1), "points_cost": 40, "status": "confirmed"},
+]
+
+
+def _without_ids(result):
+    return {
+        **result,
+        "resolved_bookings": [
+            {k: v for k, v in rb.items() if k != "booking_id"} for rb in result["resolved_bookings"]
+        ],
+    }
+
+
+def test_edits_match_full_evaluation():
+    """After adds, an update and a remove, the session equals a fresh evaluation."""
+    session = create_session(CONTRACTS, BALANCES, RESERVATIONS, TARGET, portfolio_version=0)
+    first = add_booking(session, _booking(1, date(2026, 1, 12)))
+    second = add_booking(session, _booking(2, date(2026, 1, 5)))
+    third = add_booking(session, _booking(1, date(2026, 1, 19)))
+    update_booking(session, second, _booking(1, date(2026, 1, 6), nights=2))
+    remove_booking(session, first)
+
+    expected = compute_scenario_impact(
+        CONTRACTS,
+        BALANCES,
+        RESERVATIONS,
+        [_booking(1, date(2026, 1, 6), nights=2), _booking(1, date(2026, 1, 19))],
+        TARGET,
+    )
+    result = session_result(session)
+    assert [rb["booking_id"] for rb in result["resolved_bookings"]] == [second, third]
+    assert _without_ids(result) == expected
+
+
+def test_edit_recomputes_only_its_contract():
+    """Adding a booking leaves other contracts' cached results untouched."""
+    session = create_session(CONTRACTS, BALANCES, RESERVATIONS, TARGET, portfolio_version=0)
+    untouched = session["contracts"][2]["result"]
+
+    add_booking(session, _booking(1, date(2026, 1, 12)))
+
+    assert session["contracts"][2]["result"] is untouched
+    assert session["contracts"][1]["result"]["scenario"]["committed_points"] == 40 + 42
+
+
+def test_unpriced_booking_is_an_error():
+    """A booking without chart data is reported with its booking_id."""
+    session = create_session(CONTRACTS, BALANCES, [], TARGET, portfolio_version=0)
+    booking_id = add_booking(session, _booking(1, date(2026, 1, 12), room_key="no_such_room"))
+
+    result = session_result(session)
+    assert result["resolved_bookings"] == []
+    assert result["errors"][0]["booking_id"] == booking_id
+    assert result["summary"]["total_impact"] == 0
+
+
+def test_rebase_keeps_bookings():
+    """New portfolio data replaces baselines but keeps the plan."""
+    session = create_session(CONTRACTS, BALANCES, [], TARGET, portfolio_version=0)
+    add_booking(session, _booking(1, date(2026, 1, 12)))
+
+    rebase_session(session, CONTRACTS, BALANCES, RESERVATIONS, TARGET, portfolio_version=1)
+
+    result = session_result(session)
+    assert session["portfolio_version"] == 1
+    assert result["contracts"][0]["baseline"]["committed_points"] == 40
+    assert result["contracts"][0]["scenario"]["committed_points"] == 82
+
+
+def test_booking_for_deleted_contract_is_an_error():
+    """Bookings whose contract disappeared on rebase are reported, not counted."""
+    session = create_session(CONTRACTS, BALANCES, [], TARGET, portfolio_version=0)
+    add_booking(session, _booking(2, date(2026, 1, 12)))
+
+    rebase_session(session, CONTRACTS[:1], BALANCES, [], TARGET, portfolio_version=1)
+
+    result = session_result(session)
+    assert result["errors"][0]["error"] == "Contract 2 not found"
+    assert result["summary"]["num_hypothetical_bookings"] == 0
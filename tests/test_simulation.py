@@ -0,0 +1,175 @@
+"""Tests for the Monte Carlo trip-plan simulator (pure function, no DB)."""
+
+import os
+import shutil
+from datetime import date, timedelta
+
+from backend.data.point_charts import (
+    CHARTS_DIR,
+    build_chart_catalog,
+    calculate_stay_total,
+    read_chart_artifact,
+    write_chart_artifact,
+)
+from backend.engine import simulation
+from backend.engine.simulation import (
+    load_simulation_charts,
+    price_projected_stay,
+    simulate_trip_plans,
+    start_simulation_pool,
+)
+
+AS_OF = date(2026, 3, 1)
+
+
+def _contract(
+    id, home_resort="polynesian", purchase_type="direct", use_year_month=6, annual_points=200
+):
+    return {
+        "id": id,
+        "name": f"Contract {id}",
+        "home_resort": home_resort,
+        "use_year_month": use_year_month,
+        "annual_points": annual_points,
+        "purchase_type": purchase_type,
+    }
+
+
+def _balance(contract_id, points, use_year=2025):
+    return {
+        "contract_id": contract_id,
+        "use_year": use_year,
+        "allocation_type": "current",
+        "points": points,
+    }
+
+
+def _trip(month=7, nights=5, **overrides):
+    return {"month": month, "nights": nights, "room_key": "deluxe_studio_standard", **overrides}
+
+
+def test_chart_years_price_like_calculate_stay_total():
+    charts = load_simulation_charts()
+    for offset in range(0, 360, 17):
+        check_in = date(2026, 1, 1) + timedelta(days=offset)
+        expected = calculate_stay_total(
+            "polynesian", "deluxe_studio_standard", check_in, check_in + timedelta(days=4)
+        )
+        cost = price_projected_stay(charts["polynesian"], "deluxe_studio_standard", check_in, 4)
+        assert cost == expected
+
+
+def test_later_years_use_nearest_chart_seasons_with_real_weekdays():
+    """Jan 5-8, 2028 is Wed/Thu/Fri: 2026 Adventure season, one weekend night."""
+    charts = load_simulation_charts()
+    cost = price_projected_stay(charts["polynesian"], "deluxe_studio_standard", date(2028, 1, 5), 3)
+    assert cost == 14 + 14 + 19
+
+
+def test_same_result_for_any_number_of_workers():
+    args = ([_contract(1), _contract(2, use_year_month=12)], [_balance(1, 200)], [])
+    kwargs = {"trips": [_trip(), _trip(month=12, nights=3)], "as_of": AS_OF, "years": 3}
+
+    one = simulate_trip_plans(*args, **kwargs, samples=300, seed=11, workers=1)
+    two = simulate_trip_plans(*args, **kwargs, samples=300, seed=11, workers=2)
+
+    assert one == two
+    assert one["seed"] == 11
+    assert one["summary"]["trips_per_plan"] == 6
+
+
+def test_pool_workers_price_from_the_mapped_artifact(tmp_path):
+    """Workers map the catalog's charts.bin themselves and price like the parent."""
+    for path in CHARTS_DIR.glob("*.json"):
+        shutil.copy2(path, tmp_path / path.name)
+    write_chart_artifact(build_chart_catalog(tmp_path), tmp_path)
+    catalog = read_chart_artifact(tmp_path)
+    kwargs = {
+        "trips": [_trip(), _trip(month=12, nights=3)],
+        "as_of": AS_OF,
+        "years": 3,
+        "samples": 300,
+        "seed": 5,
+        "catalog": catalog,
+    }
+    args = ([_contract(1)], [_balance(1, 200)], [])
+
+    assert simulate_trip_plans(*args, **kwargs, workers=2) == simulate_trip_plans(
+        *args, **kwargs, workers=1
+    )
+
+
+def test_broken_pool_is_replaced():
+    """A worker dying breaks the pool for good; the next simulation starts a new one."""
+    args = ([_contract(1)], [_balance(1, 200)], [])
+    kwargs = {"trips": [_trip()], "as_of": AS_OF, "years": 3, "samples": 300, "seed": 7}
+    broken = start_simulation_pool(2)
+    broken.submit(os._exit, 1).exception()
+
+    result = simulate_trip_plans(*args, **kwargs, workers=2)
+
+    assert simulation._pool is not broken
+    assert result == simulate_trip_plans(*args, **kwargs, workers=1)
+
+
+def test_small_contract_always_runs_short():
+    """Without borrowing, whatever the 10-point allocation can't cover is a shortfall."""
+    result = simulate_trip_plans(
+        [_contract(1, annual_points=10)],
+        [],
+        [],
+        [_trip()],
+        AS_OF,
+        years=1,
+        samples=100,
+        seed=3,
+        borrowing_limit_pct=0,
+        workers=1,
+    )
+    contract = result["contracts"][0]
+    assert contract["shortfall_probability"] == 1.0
+    assert contract["shortfall"]["mean"] == result["summary"]["points_per_plan"] - 10
+    assert contract["expired"]["max"] == 0
+
+
+def test_unused_points_expire():
+    result = simulate_trip_plans(
+        [_contract(1)],
+        [_balance(1, 200)],
+        [],
+        [_trip(month=7)],
+        AS_OF,
+        years=1,
+        samples=100,
+        seed=3,
+        workers=1,
+    )
+    # UY 2025 points can no longer be banked and nothing is booked before May 31
+    assert result["contracts"][0]["expired"]["p50"] == 200
+
+
+def test_stays_go_to_eligible_contracts_only():
+    """A Riviera resale contract can't take Polynesian stays."""
+    contracts = [_contract(1, home_resort="riviera", purchase_type="resale")]
+    result = simulate_trip_plans(
+        contracts, [], [], [_trip(resorts=["polynesian"])], AS_OF, years=2, samples=100, workers=1
+    )
+    assert result["summary"]["unassigned_per_plan"] == 2
+    assert result["summary"]["points_per_plan"] == 0
+
+
+def test_trip_contract_id_pins_the_contract():
+    contracts = [_contract(1, annual_points=10), _contract(2, annual_points=10)]
+    result = simulate_trip_plans(
+        contracts,
+        [],
+        [],
+        [_trip(contract_id=2)],
+        AS_OF,
+        years=1,
+        samples=100,
+        borrowing_limit_pct=0,
+        workers=1,
+    )
+    assert result["contracts"][0]["shortfall"]["max"] == 0
+    assert result["contracts"][1]["shortfall_probability"] == 1.0
@@ -0,0 +1,182 @@
+"""Tests for the Trip Explorer engine (pure function, no DB)."""
+
+from datetime import date, timedelta
+
+from backend.data.point_charts import calculate_stay_cost, load_compiled_chart
+from backend.engine.trip_explorer import find_affordable_options, find_flexible_options
+
+
+def _contract(id, home_resort="polynesian", purchase_type="direct", use_year_month=6):
+    return {
+        "id": id,
+        "name": f"Contract {id}",
+        "home_resort": home_resort,
+        "use_year_month": use_year_month,
+        "annual_points": 200,
+        "purchase_type": purchase_type,
+    }
+
+
+def _balance(contract_id, points, use_year=2025):
+    return {
+        "contract_id": contract_id,
+        "use_year": use_year,
+        "allocation_type": "current",
+        "points": points,
+    }
+
+
+def _reference_options(contracts, budgets, check_in, check_out, eligible_by_contract):
+    """Price every contract/resort/room combination one at a time (the slow way)."""
+    options = []
+    for contract in contracts:
+        for resort in eligible_by_contract[contract["id"]]:
+            compiled = load_compiled_chart(resort, check_in.year)
+            if compiled is None:
+                continue
+            for room_key in compiled["room_keys"]:
+                cost = calculate_stay_cost(resort, room_key, check_in, check_out)
+                if cost is not None and cost["total_points"] <= budgets[contract["id"]]:
+                    options.append((contract["id"], resort, room_key, cost["total_points"]))
+    options.sort(key=lambda o: o[3])
+    return options
+
+
+def test_matches_per_contract_pricing():
+    """Pricing each room once gives the same options, in the same order, as pricing per contract."""
+    contracts = [
+        _contract(1),
+        _contract(2, home_resort="riviera", purchase_type="resale"),
+        _contract(3, purchase_type="resale"),
+    ]
+    budgets = {1: 120, 2: 300, 3: 60}
+    balances = [_balance(cid, pts) for cid, pts in budgets.items()]
+    check_in, check_out = date(2026, 1, 9), date(2026, 1, 13)
+
+    result = find_affordable_options(contracts, balances, [], check_in, check_out)
+
+    expected = _reference_options(
+        contracts,
+        budgets,
+        check_in,
+        check_out,
+        {1: ["polynesian", "riviera"], 2: ["riviera"], 3: ["polynesian"]},
+    )
+    actual = [
+        (o["contract_id"], o["resort"], o["room_key"], o["total_points"]) for o in result["options"]
+    ]
+    assert actual == expected
+    assert result["total_options"] == len(expected)
+
+
+def test_budget_is_inclusive():
+    """A room costing exactly the available points is affordable."""
+    # Jan 12-15, 2026 deluxe_studio_standard at Polynesian = 42
+    result = find_affordable_options(
+        [_contract(1)], [_balance(1, 42)], [], date(2026, 1, 12), date(2026, 1, 15)
+    )
+    keys = [(o["resort"], o["room_key"]) for o in result["options"]]
+    assert ("polynesian", "deluxe_studio_standard") in keys
+    assert all(o["total_points"] <= 42 for o in result["options"])
+    assert all(o["points_remaining"] >= 0 for o in result["options"])
+
+
+def test_options_sorted_cheapest_first():
+    """Options are ordered by total_points ascending."""
+    result = find_affordable_options(
+        [_contract(1)], [_balance(1, 1000)], [], date(2026, 7, 1), date(2026, 7, 4)
+    )
+    totals = [o["total_points"] for o in result["options"]]
+    assert totals == sorted(totals)
+    assert result["num_nights"] == 3
+    assert all(o["nightly_avg"] == round(o["total_points"] / 3) for o in result["options"])
+
+
+def test_resorts_without_charts_are_skipped():
+    """Eligible resorts without a chart for the year are reported as skipped."""
+    result = find_affordable_options(
+        [_contract(1)], [_balance(1, 200)], [], date(2026, 1, 12), date(2026, 1, 14)
+    )
+    assert result["resorts_checked"] == ["polynesian", "riviera"]
+    assert "aulani" in result["resorts_skipped"]
+
+
+# --- Flexible-date search ---
+
+
+def test_flexible_matches_fixed_date_search():
+    """Best start per contract/resort/room equals scanning each start date one at a time."""
+    contracts = [_contract(1), _contract(2, home_resort="riviera", purchase_type="resale")]
+    balances = [_balance(1, 90), _balance(2, 150)]
+    earliest, latest, nights = date(2026, 5, 25), date(2026, 6, 25), 4
+
+    result = find_flexible_options(contracts, balances, [], earliest, latest, nights, limit=500)
+
+    best: dict[tuple, tuple[int, str]] = {}
+    start = earliest
+    while start + timedelta(days=nights) <= latest:
+        fixed = find_affordable_options(
+            contracts, balances, [], start, start + timedelta(days=nights)
+        )
+        for o in fixed["options"]:
+            key = (o["contract_id"], o["resort"], o["room_key"])
+            candidate = (o["total_points"], start.isoformat())
+            if key not in best or candidate < best[key]:
+                best[key] = candidate
+        start += timedelta(days=1)
+
+    actual = {
+        (o["contract_id"], o["resort"], o["room_key"]): (o["total_points"], o["check_in"])
+        for o in result["options"]
+    }
+    assert actual == best
+    totals = [o["total_points"] for o in result["options"]]
+    assert totals == sorted(totals)
+
+
+def test_flexible_finds_cheaper_weekday_start():
+    """Shifting the stay off Friday/Saturday nights is found as the cheapest option."""
+    # Jan 2026 Adventure: deluxe_studio_standard is 14 weekday / 19 weekend
+    result = find_flexible_options(
+        [_contract(1, purchase_type="resale")],
+        [_balance(1, 200)],
+        [],
+        date(2026, 1, 9),  # Friday
+        date(2026, 1, 16),
+        3,
+    )
+    studio = next(
+        o
+        for o in result["options"]
+        if o["resort"] == "polynesian" and o["room_key"] == "deluxe_studio_standard"
+    )
+    assert studio["check_in"] == "2026-01-11"  # Sun-Tue nights, all weekday
+    assert studio["check_out"] == "2026-01-14"
+    assert studio["total_points"] == 42
+
+
+def test_flexible_uses_availability_of_each_use_year():
+    """Budget follows the use year of each candidate check-in date."""
+    # June UY: May 2026 check-ins draw on UY 2025, June check-ins on UY 2026
+    result = find_flexible_options(
+        [_contract(1, purchase_type="resale")],
+        [_balance(1, 0, use_year=2025), _balance(1, 200, use_year=2026)],
+        [],
+        date(2026, 5, 20),
+        date(2026, 6, 10),
+        2,
+    )
+    assert result["options"]
+    assert all(o["check_in"] >= "2026-06-01" for o in result["options"])
+
+
+def test_flexible_respects_limit():
+    """Options are capped at limit; total_options still counts every match."""
+    args = ([_contract(1)], [_balance(1, 500)], [], date(2026, 3, 1), date(2026, 3, 20), 3)
+    everything = find_flexible_options(*args, limit=1000)
+    result = find_flexible_options(*args, limit=5)
+
+    assert len(everything["options"]) > 5
+    assert len(result["options"]) == 5
+    assert result["options"] == everything["options"][:5]
+    assert result["total_options"] == everything["total_options"] == len(everything["options"])